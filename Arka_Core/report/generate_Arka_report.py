@@ -4,12 +4,141 @@ Arka Report Generator - Exact Replica
 Creates a PDF report matching the Arka (Secure Erase & Verification Engine) format
 """
 
+import sys, time, types
+
+# Start of the import phase reported by --timings
+IMPORT_STARTED = time.perf_counter()
+
+import os
+import argparse
+
+from report_assets import DEFAULT_IMAGE_DPI
+from report_cache import ReportCache, DEFAULT_MAX_BYTES, file_digest
+from report_digest import HashingWriter, verify_report, write_manifest
+
+# Source files whose contents determine the rendered PDF (part of the cache key)
+REPORT_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_SOURCES = [os.path.join(REPORT_DIR, name) for name in
+                     (os.path.basename(__file__), 'page_numbers.py', 'pdf_append.py', 'pdf_stream.py',
+                      'png_image.py', 'report_assets.py', 'report_input.py', 'report_qr.py', 'report_model.py', 'report_cache.py',
+                      'report_digest.py', 'report_export.py', 'text_layout.py')]
+
+def build_arg_parser():
+    """Command line options; defined ahead of the reportlab imports for the cache fast path"""
+    parser = argparse.ArgumentParser(description='Generate Arka Drive Analysis Report')
+    parser.add_argument('--output', '-o', default='Arka_Drive_Analysis_Report.pdf', help='Output PDF file path')
+    parser.add_argument('--cover', default='bg.png', help='Path to cover/watermark image (bg.png)')
+    parser.add_argument('--input', help='Path to JSON containing drive scan/report data')
+    parser.add_argument('--image-dpi', type=int, default=DEFAULT_IMAGE_DPI,
+                        help='Resolution the cover/watermark image is resampled to (cached as JPEG); '
+                        '0 embeds the image as it is')
+    parser.add_argument('--format', choices=['pdf', 'csv', 'jsonl', 'html'], default='pdf',
+                        help='csv/jsonl/html: stream the deletion log, largest files and sensitive files to '
+                        '--output instead of rendering the PDF (a .pdf extension is replaced)')
+    parser.add_argument('--summary-pdf', metavar='PATH',
+                        help='With --format csv/jsonl/html, also write a PDF with only the summary sections '
+                        'and the SHA-256 of the export')
+    parser.add_argument('--input-mode', choices=['stream', 'full'], default='stream',
+                        help='stream: read large file lists lazily from disk; full: load the whole JSON into memory')
+    parser.add_argument('--output-mode', choices=['stream', 'buffer'], default='stream',
+                        help='stream: write each page to the PDF as soon as it is finished; '
+                        'buffer: keep the whole document in memory until it is saved')
+    parser.add_argument('--object-streams', action='store_true',
+                        help='Write a PDF 1.5 file with compressed object streams and an xref stream '
+                        '(streamed output only)')
+    parser.add_argument('--timings', action='store_true',
+                        help='Report import, input load, layout and save durations against the import budget')
+    parser.add_argument('--cache', action='store_true',
+                        help='Render deterministically and reuse a cached PDF when input, assets and generator are '
+                        'unchanged; a reused PDF shows the generation time of the run that rendered it')
+    parser.add_argument('--cache-dir', help='Report cache directory (default: per-user cache directory)')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Size limit of the report cache; least recently used reports are evicted first')
+    parser.add_argument('--append-to', metavar='REPORT',
+                        help='Append the deletion session in --input to an existing report as an incremental update')
+    parser.add_argument('--batch', metavar='MANIFEST',
+                        help='Render every input/output pair listed in a JSON manifest across a worker pool')
+    parser.add_argument('--workers', type=int, help='Worker processes for --batch (default: CPU count)')
+    parser.add_argument('--batch-status', help='Where --batch writes its per-job status summary '
+                        '(default: <manifest>_status.json)')
+    parser.add_argument('--digest-manifest', metavar='PATH',
+                        help='SHA-256 manifest written next to the report, or checked by --verify '
+                        '(default: <report>.sha256.json)')
+    parser.add_argument('--verify', metavar='REPORT',
+                        help='Check REPORT against its SHA-256 manifest instead of generating a report')
+    return parser
+
+# Startup budget checked by --timings: time from the first line of this script
+# until the generator's imports are done, on the embedded python312
+IMPORT_BUDGET_SECONDS = 0.5
+
+def print_timings(timings):
+    """Print per-phase durations, flagging an import phase over budget"""
+    print("\nTimings:")
+    for phase, seconds in timings.items():
+        line = f"  {phase:<7}{seconds:8.3f}s"
+        if phase == 'import':
+            state = "OK" if seconds <= IMPORT_BUDGET_SECONDS else "OVER BUDGET"
+            line += f"  (budget {IMPORT_BUDGET_SECONDS:.3f}s, {state})"
+        print(line)
+    print(f"  {'total':<7}{sum(timings.values()):8.3f}s")
+
+def lookup_cached_report(args):
+    """Look up a --cache run in the report cache; returns (cache, key, hit)"""
+    if not args.cache or args.batch or args.append_to or args.format != 'pdf':
+        return None, None, False
+    import reportlab  # Only the package version, not the PDF machinery
+    input_path = args.input if args.input and os.path.exists(args.input) else None
+    cache = ReportCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    # Every option that changes the rendered bytes is part of the key (only a pdf --format gets here,
+    # and --summary-pdf goes with the other formats)
+    key = cache.key_for([input_path, args.cover], GENERATOR_SOURCES,
+                        extra=[reportlab.Version, args.output_mode, args.input_mode, args.object_streams,
+                               args.image_dpi])
+    return cache, key, cache.fetch(key, args.output)
+
+def print_report_digest(sha256, manifest):
+    """The lines main.js reads the report's digest and manifest from"""
+    print(f"SHA-256: {sha256}")
+    print(f"Manifest: {manifest}")
+
+def serve_cached_report(args, cache_key, sha256, timings):
+    """Report a cache hit (the cached PDF is already at args.output, hashed as it was copied)"""
+    input_sha256 = file_digest(args.input) if args.input and os.path.exists(args.input) else None
+    manifest = write_manifest(args.output, sha256, input_sha256, args.digest_manifest)
+    print(f"Unchanged input: reused cached report {cache_key[:16]}")
+    print(f"Output: {args.output}")
+    print_report_digest(sha256, manifest)
+    if args.timings:
+        print_timings(timings)
+
+def run_verify(args):
+    """--verify: check a report against its manifest; returns the exit status"""
+    ok, message = verify_report(args.verify, args.digest_manifest)
+    print(f"{'Verified' if ok else 'Verification FAILED'}: {args.verify} ({message})")
+    return 0 if ok else 1
+
+# A cache hit needs none of the rendering imports below, so it is served first
+CACHE_LOOKUP = None
+CACHE_LOOKUP_SECONDS = 0.0
+if __name__ == "__main__":
+    _args = build_arg_parser().parse_args()
+    if _args.verify:
+        sys.exit(run_verify(_args))
+    _lookup_started = time.perf_counter()
+    CACHE_LOOKUP = lookup_cached_report(_args)
+    CACHE_LOOKUP_SECONDS = time.perf_counter() - _lookup_started
+    if CACHE_LOOKUP[2]:
+        serve_cached_report(_args, CACHE_LOOKUP[1], CACHE_LOOKUP[2], {'startup': _lookup_started - IMPORT_STARTED,
+                                                     'cache': CACHE_LOOKUP_SECONDS})
+        sys.exit(0)
+
 # Ensure a stub PIL module exists before importing reportlab.
-# Some reportlab internals import PIL at module import time. In dev we may not have Pillow.
-import sys, types
-if 'PIL' not in sys.modules:
+# Some reportlab internals import PIL at module import time. In dev we may not have Pillow,
+# or only the bundled Windows build, whose package imports but whose Image module does not.
+if 'PIL.Image' not in sys.modules:
     try:
-        import PIL  # type: ignore
+        from PIL import Image  # type: ignore
     except Exception:
         pil_mod = types.ModuleType('PIL')
         pil_image_mod = types.ModuleType('PIL.Image')
@@ -18,20 +147,13 @@ if 'PIL' not in sys.modules:
         sys.modules['PIL'] = pil_mod
         sys.modules['PIL.Image'] = pil_image_mod
 
+# Only the canvas layer of reportlab is used; platypus is never imported
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch, cm
-from reportlab.lib.colors import Color, black, white, red
+from reportlab.pdfbase import pdfdoc, pdfmetrics
+from reportlab.lib.colors import Color, black, white
 from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import Paragraph
-# PIL is optional; for dev environments using embeddable Python, compiled wheels may be unavailable.
-# We fall back to a lightweight image-size reader that supports PNG/JPEG when PIL is missing.
-try:
-    from PIL import Image  # type: ignore
-except Exception:
-    Image = None  # type: ignore
+from reportlab import rl_config
 
 def get_image_size(path):
     """Return (width, height) for PNG/JPEG without PIL. Fallback to (None, None) on failure."""
@@ -86,10 +208,26 @@ def get_image_size(path):
     except Exception:
         pass
     return None, None
-import os
+import io
 import json
+import contextlib
 from datetime import datetime
-import argparse
+from collections import namedtuple
+from functools import lru_cache
+from itertools import islice
+
+from page_numbers import PageNumbering
+from pdf_append import AppendingCanvas
+from pdf_stream import StreamingCanvas
+from png_image import register_png_image
+from report_input import load_report_input
+from report_assets import load_pil_image, prepare_background
+from report_export import export_report
+from report_model import build_report_model, hr_bytes
+from report_qr import draw_qr_code
+from text_layout import fit_text, text_width, wrap_text
+
+IMPORT_FINISHED = time.perf_counter()
 
 # Spacing and layout constants
 PAGE_MARGIN_LEFT = 50
@@ -101,87 +239,174 @@ HEADER_HEIGHT = 48  # Header occupies top 48 pixels
 GAP_SECTION = 20
 
 # Enhanced table styling functions
-def draw_professional_cell(c, x, y, width, height, fill_color=None, border_color=black, border_width=0.5, text=None, 
-                          font="Helvetica", font_size=10, text_color=black, align="left", bold=False):
-    """Draw a professional table cell with enhanced styling"""
-    c.saveState()
-    
-    # Draw cell background
-    if fill_color:
-        c.setFillColor(fill_color)
-        c.rect(x, y, width, height, fill=1, stroke=0)
-    
-    # Draw cell border
-    c.setStrokeColor(border_color)
-    c.setLineWidth(border_width)
-    c.rect(x, y, width, height, fill=0, stroke=1)
-    
-    # Draw text if provided
-    if text:
-        c.setFillColor(text_color)
-        font_name = f"{font}-Bold" if bold else font
-        c.setFont(font_name, font_size)
-        
-        # Calculate text position based on alignment
-        text_width = c.stringWidth(text, font_name, font_size)
-        if align == "center":
-            text_x = x + (width - text_width) / 2
-        elif align == "right":
-            text_x = x + width - text_width - 5
-        else:  # left alignment
-            text_x = x + 5
-        
-        text_y = y + (height - font_size) / 2 + 2
-        c.drawString(text_x, text_y, text)
-    
-    c.restoreState()
+# A column of a batched table: header text, width and default text styling
+TableColumn = namedtuple('TableColumn', ['header', 'width', 'align', 'font', 'font_size', 'text_color', 'multiline', 'wrap'],
+                         defaults=('left', 'Helvetica', 9, black, False, 1))
+
+def get_gradient_shading(c, start_color, end_color):
+    """Return the resource name of a vertical axial shading for a colour pair.
+
+    The shading runs from start_color at y=0 to end_color at y=1 in its own
+    unit square, so one shading object per colour pair serves every header of
+    any size; it is registered with the document the first time it is needed.
+    """
+    start_rgb = [round(v, 4) for v in (start_color.red, start_color.green, start_color.blue)]
+    end_rgb = [round(v, 4) for v in (end_color.red, end_color.green, end_color.blue)]
+    name = "ArkaSh" + "".join("%02x" % int(v * 255) for v in start_rgb + end_rgb)
+    if name not in c._doc.idToObject:
+        shading = pdfdoc.PDFAxialShading(0, 0, 0, 1,
+                                         Function=pdfdoc.PDFExponentialFunction(N=1, C0=start_rgb, C1=end_rgb),
+                                         ColorSpace="DeviceRGB", Extend="[true true]")
+        c._doc.Reference(shading, name)
+    return name
 
 def draw_gradient_header(c, x, y, width, height, start_color, end_color):
     """Draw a gradient background for table headers"""
+    name = get_gradient_shading(c, start_color, end_color)
     c.saveState()
     
-    # Create gradient effect with multiple rectangles
-    steps = 20
-    step_height = height / steps
-    
-    for i in range(steps):
-        # Calculate interpolated color
-        ratio = i / (steps - 1)
-        r = start_color.red + (end_color.red - start_color.red) * ratio
-        g = start_color.green + (end_color.green - start_color.green) * ratio
-        b = start_color.blue + (end_color.blue - start_color.blue) * ratio
-        
-        c.setFillColor(Color(r, g, b))
-        rect_y = y + i * step_height
-        c.rect(x, rect_y, width, step_height, fill=1, stroke=0)
+    # Clip to the header box and stretch the unit-square shading over it
+    path = c.beginPath()
+    path.rect(x, y, width, height)
+    c.clipPath(path, stroke=0, fill=0)
+    c.transform(width, 0, 0, height, x, y)
+    c._shadingUsed[name] = name
+    c._code.append("/%s sh" % name)
     
     c.restoreState()
 
-def draw_multiline_cell_text(c, x, y, width, height, text, font="Helvetica", font_size=8, 
-                            text_color=black, line_spacing=12, padding=5):
-    """Draw multiline text in a table cell with proper formatting"""
-    c.saveState()
-    
-    c.setFillColor(text_color)
-    c.setFont(font, font_size)
-    
-    lines = text.split('\n')
-    start_y = y + height - padding - font_size
-    
-    for i, line in enumerate(lines):
-        line_y = start_y - (i * line_spacing)
-        if line_y > y + padding:  # Only draw if within cell bounds
-            # Truncate line if too long
-            max_width = width - (2 * padding)
-            while c.stringWidth(line, font, font_size) > max_width and len(line) > 3:
-                line = line[:-4] + "..."
-            
-            c.drawString(x + padding, line_y, line)
+def layout_cell_text(c, runs, x, y, width, height, text, column):
+    """Append positioned text runs (x, y, text, font, size, color) for one cell"""
+    font, font_size = column.font, column.font_size
+    if column.multiline:
+        # Top-aligned lines, dropping whatever does not fit in the cell
+        padding = 4
+        line_spacing = font_size + 3
+        max_width = width - (2 * padding)
+        start_y = y + height - padding - font_size
+        for i, line in enumerate(text.split('\n')):
+            line_y = start_y - (i * line_spacing)
+            if line_y <= y + padding:
+                break
+            runs.append((x + padding, line_y, fit_text(line, font, font_size, max_width),
+                         font, font_size, column.text_color))
+        return
+    
+    max_width = width - 10
+    if column.wrap > 1:
+        # Wrap long values (paths) at separators
+        lines = wrap_text(text, font, font_size, max_width, column.wrap)
+    else:
+        lines = [fit_text(text, font, font_size, max_width)]
+    # Lines are centred vertically as a block
+    line_spacing = font_size + 1
+    text_y = y + (height + (len(lines) - 1) * line_spacing - font_size) / 2 + 2
+    for line in lines:
+        # Calculate text position based on alignment
+        if column.align == "center":
+            text_x = x + (width - text_width(line, font, font_size)) / 2
+        elif column.align == "right":
+            text_x = x + width - text_width(line, font, font_size) - 5
+        else:  # left alignment
+            text_x = x + 5
+        runs.append((text_x, text_y, line, font, font_size, column.text_color))
+        text_y -= line_spacing
+
+def draw_text_runs(c, runs):
+    """Draw text runs in one text object, changing font and colour only when they change"""
+    if not runs:
+        return
+    text = c.beginText()
+    current_font = current_color = None
+    for x, y, line, font, font_size, color in runs:
+        if (font, font_size) != current_font:
+            text.setFont(font, font_size)
+            current_font = (font, font_size)
+        if color != current_color:
+            text.setFillColor(color)
+            current_color = color
+        text.setTextOrigin(x, y)
+        text.textLine(line)
+    c.drawText(text)
+
+def draw_table_grid(c, x, top, widths, row_count, row_height, border_color, border_width):
+    """Stroke the borders of row_count equally tall rows as one path"""
+    table_width = sum(widths)
+    bottom = top - row_count * row_height
+    path = c.beginPath()
+    for i in range(row_count + 1):
+        y = top - i * row_height
+        path.moveTo(x, y)
+        path.lineTo(x + table_width, y)
+    col_x = x
+    for w in [0] + list(widths):
+        col_x += w
+        path.moveTo(col_x, top)
+        path.lineTo(col_x, bottom)
+    c.setStrokeColor(border_color)
+    c.setLineWidth(border_width)
+    c.drawPath(path, stroke=1, fill=0)
+
+def draw_table_rows(c, x, top, columns, rows, row_height, cell_fill=None,
+                    border_color=Color(0.6, 0.6, 0.6), border_width=0.5, first_index=1):
+    """Draw a block of table rows with batched drawing operations.
+
+    Cell backgrounds are grouped by colour into one filled path per colour,
+    all borders are stroked as a single path and the text goes into one text
+    object. cell_fill(i, j, text) returns a cell's background colour (or None),
+    with rows numbered from first_index. Rows are laid out downwards from top;
+    returns the y coordinate of the bottom of the last row.
+    """
+    fills = {}
+    runs = []
+    y = top
+    row_count = 0
+    for i, row in enumerate(rows, start=first_index):
+        bottom = y - row_height
+        cell_x = x
+        for j, (column, text) in enumerate(zip(columns, row)):
+            fill = cell_fill(i, j, text) if cell_fill else None
+            if fill is not None:
+                fills.setdefault(fill, []).append((cell_x, bottom, column.width, row_height))
+            if text:
+                layout_cell_text(c, runs, cell_x, bottom, column.width, row_height, text, column)
+            cell_x += column.width
+        y = bottom
+        row_count += 1
+    if not row_count:
+        return top
     
+    c.saveState()
+    for color, rects in fills.items():
+        c.setFillColor(color)
+        path = c.beginPath()
+        for rect in rects:
+            path.rect(*rect)
+        c.drawPath(path, stroke=0, fill=1)
+    draw_table_grid(c, x, top, [column.width for column in columns], row_count, row_height,
+                    border_color, border_width)
+    draw_text_runs(c, runs)
     c.restoreState()
+    return y
+
+def draw_table_header(c, x, top, columns, height, start_color, end_color,
+                      border_color, border_width, font_size, text_color=white):
+    """Draw a gradient header row with bold, centred column titles"""
+    draw_gradient_header(c, x, top - height, sum(column.width for column in columns), height,
+                         start_color, end_color)
+    header_columns = [TableColumn(column.header, column.width, "center", "Helvetica-Bold", font_size, text_color,
+                                  wrap=2)
+                      for column in columns]
+    return draw_table_rows(c, x, top, header_columns, [[column.header for column in columns]], height,
+                           border_color=border_color, border_width=border_width)
+
+def draw_header_footer(c, width, height, title="Arka Drive Analysis Report", section=None):
+    """Draw a consistent header and footer with page numbers on the current page.
 
-def draw_header_footer(c, width, height, title="Arka Drive Analysis Report"):
-    """Draw a consistent header and footer with page number on the current page."""
+    section starts a new section on this page; the footer shows the page's
+    index within its section and "Page N of M", with the totals filled in
+    when the report is finished (see page_numbers).
+    """
     c.saveState()
 
     # Top bar background
@@ -201,38 +426,77 @@ def draw_header_footer(c, width, height, title="Arka Drive Analysis Report"):
     c.setFont("Helvetica-Bold", 12)
     c.drawString(PAGE_MARGIN_LEFT, height - 30, title)
     c.setFont("Helvetica", 9)
-    timestamp = datetime.now().strftime("%b %d, %Y  %I:%M %p")
+    timestamp = REPORT_TIME.strftime("%b %d, %Y  %I:%M %p")
     time_width = c.stringWidth(timestamp, "Helvetica", 9)
     c.setFillColor(colors.grey)
     c.drawString(width - PAGE_MARGIN_RIGHT - time_width, height - 30, timestamp)
 
     # Remove old divider; accent line already drawn
 
-    # Footer: page number centered
-    page_num = c.getPageNumber()
-    c.setFont("Helvetica", 9)
-    footer_text = f"Page {page_num}"
-    footer_width = c.stringWidth(footer_text, "Helvetica", 9)
+    # Footer: section page index (left), page number centered
+    if section:
+        PAGE_NUMBERS.begin_section(c, section)
     c.setFillColor(colors.grey)
-    c.drawString((width - footer_width) / 2, 25, footer_text)
+    c.setFont("Helvetica", 8)
+    PAGE_NUMBERS.draw_section_number(c, PAGE_MARGIN_LEFT, 25)
+    c.setFont("Helvetica", 9)
+    PAGE_NUMBERS.draw_page_number(c, width / 2, 25)
 
     c.restoreState()
 
-def add_Arka_watermark(c, width, height, watermark_image="bg.png"):
-    """Add bg.png as watermark at 100% scale"""
-    c.saveState()
+@lru_cache(maxsize=None)
+def get_cover_image_size(path, fallback_width, fallback_height):
+    """Return (width, height) of the cover/watermark image, read once per path"""
+    Image = load_pil_image()
+    if Image is not None:
+        with Image.open(path) as img:
+            return img.size
+    img_width, img_height = get_image_size(path)
+    if not img_width or not img_height:
+        return fallback_width, fallback_height
+    return img_width, img_height
+
+@lru_cache(maxsize=None)
+def prepare_report_background(cover_image, image_dpi=DEFAULT_IMAGE_DPI):
+    """Path of the cover/watermark image to embed, resampled for A4 (see report_assets)"""
+    if not image_dpi or not os.path.exists(cover_image):
+        return cover_image
+    width, height = A4
+    try:
+        return prepare_background(cover_image, get_cover_image_size(cover_image, width, height), A4, image_dpi)
+    except Exception as e:
+        print(f"Warning: could not resample background image {cover_image}: {e}")
+        return cover_image
+
+WATERMARK_FORM = "ArkaWatermark"
+
+def end_form_with_resources(c):
+    """Finish a beginForm() block, keeping the form's own graphics-state resources.
+
+    reportlab only writes fonts and XObjects into a form's resource dictionary,
+    so alpha (gs) or shading (sh) operators used inside the form would be left
+    unresolved. Build the full dictionary here and hand it to endForm().
+    """
+    resources = pdfdoc.PDFResourceDictionary()
+    resources.basicFonts()
+    resources.allProcs()
+    if c._formsinuse:
+        resources.XObject = c._doc.xobjDict(c._formsinuse)
+    ext_gstate = c._extgstate.getState()
+    if ext_gstate:
+        resources.ExtGState = ext_gstate
+    resources.setShading(c._shadingUsed)
+    resources.setColorSpace(c._colorsUsed)
+    c.endForm(Resources=resources)
+
+def define_Arka_watermark_form(c, width, height, watermark_image="bg.png"):
+    """Precompose the watermark image and its white overlay into a reusable form XObject"""
+    c.beginForm(WATERMARK_FORM)
     
     # Check if watermark image exists
     if os.path.exists(watermark_image):
         try:
-            # Determine image size without PIL (or with it if available)
-            if Image is not None:
-                with Image.open(watermark_image) as img:
-                    img_width, img_height = img.size
-            else:
-                img_width, img_height = get_image_size(watermark_image)
-                if not img_width or not img_height:
-                    img_width, img_height = width, height
+            img_width, img_height = get_cover_image_size(watermark_image, width, height)
 
             # Scale image to cover page while preserving aspect ratio
             page_aspect = width / height
@@ -247,6 +511,7 @@ def add_Arka_watermark(c, width, height, watermark_image="bg.png"):
             x_offset = (width - scaled_width) / 2
             y_offset = (height - scaled_height) / 2
 
+            register_png_image(c, watermark_image)
             c.drawImage(watermark_image, x_offset, y_offset, scaled_width, scaled_height)
 
             # Semi-transparent overlay for watermark look
@@ -270,21 +535,27 @@ def add_Arka_watermark(c, width, height, watermark_image="bg.png"):
         y_pos = height / 2 - 60
         c.drawString(x_pos, y_pos, "Arka")
     
-    c.restoreState()
+    end_form_with_resources(c)
+
+def add_Arka_watermark(c, width, height, watermark_image="bg.png"):
+    """Add bg.png as watermark at 100% scale.
+
+    The image and overlay are drawn once into a form XObject on first use;
+    every page after that only references the form.
+    """
+    if not c.hasForm(WATERMARK_FORM):
+        # Called at the start of a page, so the form does not interleave with page content
+        define_Arka_watermark_form(c, width, height, watermark_image)
+    c.doForm(WATERMARK_FORM)
 
 def create_Arka_cover(c, width, height, cover_image="bg.png"):
     """Create the Arka cover page"""
     
-    # Use the background image if available, otherwise create a dark background
+    # Use the background image if available, otherwise create a dark background.
+    # The image XObject is shared with the watermark form, so it is embedded once.
     if os.path.exists(cover_image):
         try:
-            if Image is not None:
-                with Image.open(cover_image) as img:
-                    img_width, img_height = img.size
-            else:
-                img_width, img_height = get_image_size(cover_image)
-                if not img_width or not img_height:
-                    img_width, img_height = width, height
+            img_width, img_height = get_cover_image_size(cover_image, width, height)
 
             aspect_ratio = float(img_width) / float(img_height)
             # Scale to fit A4
@@ -298,6 +569,7 @@ def create_Arka_cover(c, width, height, cover_image="bg.png"):
             x_offset = (width - scaled_width) / 2
             y_offset = (height - scaled_height) / 2
 
+            register_png_image(c, cover_image)
             c.drawImage(cover_image, x_offset, y_offset, scaled_width, scaled_height)
         except Exception:
             c.setFillColor(Color(0.1, 0.1, 0.1))
@@ -327,7 +599,24 @@ def create_Arka_cover(c, width, height, cover_image="bg.png"):
     
     # c.drawString(x_subtitle, y_subtitle, subtitle)
 
-def create_device_info_table(c, width, height, y_start):
+REPORT_QR_SIZE = 64
+
+def report_id(model):
+    """Report ID shown in the device table and encoded in the QR code"""
+    return model.scanner_version or REPORT_TIME.strftime("Arka-%Y%m%d%H%M%S")
+
+def report_qr_payload(model):
+    """QR code text: the report ID and the SHA-256 of the input JSON file.
+
+    Upper case keeps the text within the QR alphanumeric set where the ID
+    allows it, which needs fewer modules than bytes.
+    """
+    payload = f"ARKA REPORT {report_id(model)}"
+    if INPUT_DIGEST:
+        payload += f" SHA-256 {INPUT_DIGEST.upper()}"
+    return payload
+
+def create_device_info_table(c, width, height, y_start, model):
     """Create the device information table with enhanced professional styling"""
     
     # Title with enhanced styling
@@ -336,7 +625,7 @@ def create_device_info_table(c, width, height, y_start):
     c.drawString(PAGE_MARGIN_LEFT, y_start, "1. Arka Drive Analysis Report")
     
     # Date and time
-    current_time = datetime.now().strftime("%m/%d/%Y, %I:%M:%S %p")
+    current_time = REPORT_TIME.strftime("%m/%d/%Y, %I:%M:%S %p")
     time_width = c.stringWidth(current_time, "Helvetica", 12)
     c.setFont("Helvetica", 12)
     c.setFillColor(black)
@@ -347,45 +636,21 @@ def create_device_info_table(c, width, height, y_start):
     c.setFillColor(Color(0.2, 0.4, 0.8))
     c.drawString(PAGE_MARGIN_LEFT, y_start - 40, "1.1 Device & Report Information")
     
-    # Two-column key/value data populated from INPUT_DATA
-    global INPUT_DATA
-    sysinfo = (INPUT_DATA or {}).get('system_info', {}) if isinstance(INPUT_DATA, dict) else {}
-
-    # Compute totals from drives
-    def hr_bytes(n):
-        try:
-            units = ['B','KB','MB','GB','TB','PB']
-            size = float(n)
-            idx = 0
-            while size >= 1024 and idx < len(units)-1:
-                size /= 1024.0
-                idx += 1
-            return f"{size:.2f} {units[idx]}"
-        except Exception:
-            return str(n)
-
-    total_capacity_b = 0
-    total_used_b = 0
-    try:
-        for d in (INPUT_DATA or {}).get('drives', []):
-            total_capacity_b += int(d.get('total_space_bytes') or 0)
-            total_used_b += int(d.get('used_space_bytes') or 0)
-    except Exception:
-        pass
-    used_pct = (float(total_used_b)/float(total_capacity_b)*100.0) if total_capacity_b > 0 else 0.0
+    # Two-column key/value data populated from the report model
+    sysinfo = model.system_info
 
     os_line = " ".join([str(x) for x in [sysinfo.get('platform') or '', sysinfo.get('release') or '', sysinfo.get('version') or ''] if x]).strip()
     if not os_line:
         os_line = "Windows"
 
     kv_rows = [
-        ("Report ID", (INPUT_DATA or {}).get('scanner_version') or datetime.now().strftime("Arka-%Y%m%d%H%M%S")),
+        ("Report ID", report_id(model)),
         ("Device Name", sysinfo.get('hostname') or ""),
-        ("Serial Number", (INPUT_DATA or {}).get('serial_number') or ""),
+        ("Serial Number", model.serial_number),
         ("Operating System", os_line),
         ("IP Address", sysinfo.get('ip') or ""),
-        ("Total Storage", hr_bytes(total_capacity_b)),
-        ("Total Used", f"{hr_bytes(total_used_b)} ({used_pct:.1f}%)"),
+        ("Total Storage", hr_bytes(model.total_capacity_bytes)),
+        ("Total Used", f"{hr_bytes(model.total_used_bytes)} ({model.used_percentage:.1f}%)"),
     ]
 
     table_top = y_start - 80
@@ -398,61 +663,42 @@ def create_device_info_table(c, width, height, y_start):
     # Enhanced header with gradient background
     header_start_color = Color(0.15, 0.35, 0.75)
     header_end_color = Color(0.25, 0.45, 0.85)
+    columns = [
+        TableColumn("Field", label_col_width, font="Helvetica-Bold", font_size=10),
+        TableColumn("Value", value_col_width, font="Helvetica", font_size=10),
+    ]
     
-    # Draw gradient header background
-    draw_gradient_header(c, table_left, table_top - row_height + 5, table_width, row_height, 
-                        header_start_color, header_end_color)
+    draw_table_header(c, table_left, table_top + 5, columns, row_height, header_start_color, header_end_color,
+                      border_color=black, border_width=0.5, font_size=11)
     
     # Header border
     c.setStrokeColor(Color(0.1, 0.2, 0.6))
     c.setLineWidth(1.5)
     c.rect(table_left, table_top - row_height + 5, table_width, row_height, fill=0, stroke=1)
-    
-    # Header text
-    draw_professional_cell(c, table_left, table_top - row_height + 5, label_col_width, row_height,
-                          text="Field", font="Helvetica", font_size=11, text_color=white, bold=True, align="center")
-    draw_professional_cell(c, table_left + label_col_width, table_top - row_height + 5, value_col_width, row_height,
-                          text="Value", font="Helvetica", font_size=11, text_color=white, bold=True, align="center")
 
-    # Enhanced barcode placeholder
-    barcode_w, barcode_h = 120, 32
-    barcode_x = table_left + table_width - barcode_w
-    barcode_y = table_top + 10
-    
-    # Barcode background with shadow effect
-    c.setFillColor(Color(0.9, 0.9, 0.9))  # Shadow
-    c.rect(barcode_x + 2, barcode_y - 2, barcode_w, barcode_h, fill=1, stroke=0)
-    
-    # Barcode main area
-    c.setFillColor(white)
+    # Report QR code (report ID and input digest) above the right end of the table
+    qr_size = REPORT_QR_SIZE
+    qr_x = table_left + table_width - qr_size
+    qr_y = table_top + 10
+    
+    # Shadow, then the code on white with its quiet zone
+    c.setFillColor(Color(0.9, 0.9, 0.9))
+    c.rect(qr_x + 2, qr_y - 2, qr_size, qr_size, fill=1, stroke=0)
+    draw_qr_code(c, report_qr_payload(model), qr_x, qr_y, qr_size, color=black, background=white)
     c.setStrokeColor(Color(0.3, 0.3, 0.3))
     c.setLineWidth(1)
-    c.rect(barcode_x, barcode_y, barcode_w, barcode_h, fill=1, stroke=1)
-    
-    # Barcode text
-    c.setFont("Helvetica-Bold", 9)
-    c.setFillColor(Color(0.3, 0.3, 0.3))
-    txt = "REPORT BARCODE"
-    txt_w = c.stringWidth(txt, "Helvetica-Bold", 9)
-    c.drawString(barcode_x + (barcode_w - txt_w) / 2, barcode_y + (barcode_h / 2) - 4, txt)
+    c.rect(qr_x, qr_y, qr_size, qr_size, fill=0, stroke=1)
 
     # Enhanced data rows
-    for i, (label, value) in enumerate(kv_rows, start=1):
-        y_pos = table_top - (i * row_height)
-        
+    label_bg_color = Color(0.88, 0.92, 0.96)
+    def cell_fill(i, j, text):
+        if j == 0:
+            return label_bg_color
         # Alternating row colors with better contrast
-        row_color = Color(0.97, 0.98, 0.99) if i % 2 == 1 else Color(0.94, 0.96, 0.98)
-        
-        # Label cell with enhanced styling
-        label_bg_color = Color(0.88, 0.92, 0.96)
-        draw_professional_cell(c, table_left, y_pos - row_height + 5, label_col_width, row_height,
-                             fill_color=label_bg_color, border_color=Color(0.7, 0.7, 0.7),
-                             text=label, font="Helvetica", font_size=10, bold=True, align="left")
-        
-        # Value cell
-        draw_professional_cell(c, table_left + label_col_width, y_pos - row_height + 5, value_col_width, row_height,
-                             fill_color=row_color, border_color=Color(0.7, 0.7, 0.7),
-                             text=value, font="Helvetica", font_size=10, align="left")
+        return Color(0.97, 0.98, 0.99) if i % 2 == 1 else Color(0.94, 0.96, 0.98)
+    
+    draw_table_rows(c, table_left, table_top - row_height + 5, columns, kv_rows, row_height,
+                    cell_fill=cell_fill, border_color=Color(0.7, 0.7, 0.7))
 
     # Table border enhancement
     c.setStrokeColor(Color(0.1, 0.2, 0.6))
@@ -461,7 +707,7 @@ def create_device_info_table(c, width, height, y_start):
     
     return table_top - (len(kv_rows) + 1) * row_height - 25
 
-def create_system_overview(c, width, height, y_start):
+def create_system_overview(c, width, height, y_start, model):
     """Create system overview section with enhanced professional styling"""
     
     # Section header with enhanced styling
@@ -475,36 +721,10 @@ def create_system_overview(c, width, height, y_start):
     c.drawString(PAGE_MARGIN_LEFT, y_start - 30, "2. System Overview")
     
     # System overview table data (header + one data row)
-    global INPUT_DATA
-    total_drives = 0
-    total_capacity_b = 0
-    total_used_b = 0
-    if INPUT_DATA and isinstance(INPUT_DATA, dict):
-        try:
-            drives = INPUT_DATA.get('drives') or []
-            total_drives = int(INPUT_DATA.get('total_drives') or len(drives) or 0)
-            for d in drives:
-                total_capacity_b += int(d.get('total_space_bytes') or 0)
-                total_used_b += int(d.get('used_space_bytes') or 0)
-        except Exception:
-            pass
-
-    def hr_bytes(n):
-        try:
-            units = ['B','KB','MB','GB','TB','PB']
-            size = float(n)
-            idx = 0
-            while size >= 1024 and idx < len(units)-1:
-                size /= 1024.0
-                idx += 1
-            return f"{size:.2f} {units[idx]}"
-        except Exception:
-            return str(n)
-
-    used_pct = (float(total_used_b)/float(total_capacity_b)*100.0) if total_capacity_b > 0 else 0.0
     overview_data = [
         ["Total Drives", "Total Capacity", "Total Used", "Used %"],
-        [str(total_drives or 0), hr_bytes(total_capacity_b), hr_bytes(total_used_b), f"{used_pct:.1f}%"]
+        [str(model.total_drives), hr_bytes(model.total_capacity_bytes), hr_bytes(model.total_used_bytes),
+         f"{model.used_percentage:.1f}%"]
     ]
     
     table_y = y_start - 60
@@ -513,45 +733,28 @@ def create_system_overview(c, width, height, y_start):
     table_left = PAGE_MARGIN_LEFT
     table_width = sum(col_widths)
     
-    for i, row in enumerate(overview_data):
-        y_pos = table_y - (i * row_height)
-        x_offset = table_left
-        
-        for j, cell in enumerate(row):
-            if i == 0:  # Header row with gradient
-                # Enhanced header styling
-                header_start_color = Color(0.2, 0.5, 0.2)  # Green theme
-                header_end_color = Color(0.3, 0.6, 0.3)
-                
-                # Draw gradient background
-                draw_gradient_header(c, x_offset, y_pos - row_height + 5, col_widths[j], row_height,
-                                   header_start_color, header_end_color)
-                
-                # Draw header cell with border
-                draw_professional_cell(c, x_offset, y_pos - row_height + 5, col_widths[j], row_height,
-                                      border_color=Color(0.1, 0.3, 0.1), border_width=1.2,
-                                      text=cell, font="Helvetica", font_size=11, 
-                                      text_color=white, bold=True, align="center")
-            else:  # Data row
-                # Enhanced data cell styling
-                data_bg_color = Color(0.95, 0.98, 0.95)  # Light green tint
-                
-                # Special styling for percentage column
-                if j == 3:  # Used % column
-                    percentage = float(cell.replace('%', ''))
-                    if percentage > 70:
-                        data_bg_color = Color(1.0, 0.9, 0.9)  # Light red for high usage
-                    elif percentage > 50:
-                        data_bg_color = Color(1.0, 0.95, 0.8)  # Light orange for medium usage
-                    else:
-                        data_bg_color = Color(0.9, 1.0, 0.9)  # Light green for low usage
-                
-                draw_professional_cell(c, x_offset, y_pos - row_height + 5, col_widths[j], row_height,
-                                      fill_color=data_bg_color, border_color=Color(0.6, 0.6, 0.6),
-                                      text=cell, font="Helvetica", font_size=11, 
-                                      text_color=black, bold=False, align="center")
-            
-            x_offset += col_widths[j]
+    columns = [TableColumn(header, w, align="center", font_size=11)
+               for header, w in zip(overview_data[0], col_widths)]
+    
+    # Enhanced header styling
+    header_start_color = Color(0.2, 0.5, 0.2)  # Green theme
+    header_end_color = Color(0.3, 0.6, 0.3)
+    draw_table_header(c, table_left, table_y + 5, columns, row_height, header_start_color, header_end_color,
+                      border_color=Color(0.1, 0.3, 0.1), border_width=1.2, font_size=11)
+    
+    def cell_fill(i, j, cell):
+        # Special styling for percentage column
+        if j == 3:  # Used % column
+            percentage = float(cell.replace('%', ''))
+            if percentage > 70:
+                return Color(1.0, 0.9, 0.9)  # Light red for high usage
+            elif percentage > 50:
+                return Color(1.0, 0.95, 0.8)  # Light orange for medium usage
+            return Color(0.9, 1.0, 0.9)  # Light green for low usage
+        return Color(0.95, 0.98, 0.95)  # Light green tint
+    
+    draw_table_rows(c, table_left, table_y - row_height + 5, columns, overview_data[1:], row_height,
+                    cell_fill=cell_fill)
     
     # Enhanced table border
     c.setStrokeColor(Color(0.1, 0.3, 0.1))
@@ -566,7 +769,7 @@ def create_system_overview(c, width, height, y_start):
     
     return table_y - len(overview_data) * row_height - 25
 
-def create_drive_details(c, width, height, y_start):
+def create_drive_details(c, width, height, y_start, model):
     """Create drive details section with enhanced professional styling"""
     
     # Drive Details header
@@ -577,38 +780,13 @@ def create_drive_details(c, width, height, y_start):
     # Drive details table header
     drive_header = ["Drive", "Filesystem", "Storage Used", "Total Capacity", "Free Space", "File Categories"]
     
-    # Drive data from INPUT_DATA
-    global INPUT_DATA
+    # Drive rows from the report model; no input means no rows rather than bogus samples
     drive_data = []
-    def hr_bytes(n):
-        try:
-            units = ['B','KB','MB','GB','TB','PB']
-            size = float(n)
-            idx = 0
-            while size >= 1024 and idx < len(units)-1:
-                size /= 1024.0
-                idx += 1
-            return f"{size:.2f} {units[idx]}"
-        except Exception:
-            return str(n)
-
-    if INPUT_DATA and isinstance(INPUT_DATA, dict):
-        for d in INPUT_DATA.get('drives', []):
-            drive_name = d.get('drive') or ''
-            filesystem = d.get('filesystem') or ''
-            used_h = d.get('used_space_human') or hr_bytes(d.get('used_space_bytes') or 0)
-            total_h = d.get('total_space_human') or hr_bytes(d.get('total_space_bytes') or 0)
-            free_h = d.get('free_space_human') or hr_bytes(d.get('free_space_bytes') or 0)
-            # Build categories summary
-            cats = d.get('file_analysis', {}).get('categories', {}) or {}
-            lines = []
-            for cat, vals in cats.items():
-                cnt = vals.get('count') or 0
-                sz = vals.get('size') or 0
-                lines.append(f"{cat}: {cnt} files ({hr_bytes(sz)})")
-            cat_text = "\n".join(lines[:12]) if lines else ""
-            drive_data.append([drive_name, filesystem, used_h, total_h, free_h, cat_text])
-    # If no input, keep empty to avoid bogus sample rows
+    for d in model.drives:
+        # Build categories summary
+        lines = [f"{cat}: {total.count} files ({hr_bytes(total.size)})" for cat, total in d.categories.items()]
+        cat_text = "\n".join(lines[:12])
+        drive_data.append([d.drive, d.filesystem, d.used_human, d.total_human, d.free_human, cat_text])
     
     table_y = y_start - 30
     header_height = 35  # Increased for better header appearance
@@ -617,69 +795,32 @@ def create_drive_details(c, width, height, y_start):
     table_left = PAGE_MARGIN_LEFT
     table_width = sum(col_widths)
     
+    columns = [
+        TableColumn(drive_header[0], col_widths[0], align="center", font="Helvetica-Bold", font_size=11),
+        TableColumn(drive_header[1], col_widths[1], wrap=2),
+        TableColumn(drive_header[2], col_widths[2], align="right"),  # Storage columns
+        TableColumn(drive_header[3], col_widths[3], align="right"),
+        TableColumn(drive_header[4], col_widths[4], align="right"),
+        TableColumn(drive_header[5], col_widths[5], font_size=7, multiline=True),  # File categories
+    ]
+    
     # Enhanced header with gradient
     header_start_color = Color(0.6, 0.2, 0.2)  # Red theme for drive details
     header_end_color = Color(0.7, 0.3, 0.3)
-    
-    # Draw gradient header background
-    draw_gradient_header(c, table_left, table_y - header_height + 5, table_width, header_height,
-                        header_start_color, header_end_color)
-    
-    # Draw individual header cells with enhanced styling
-    x_offset = table_left
-    for j, header in enumerate(drive_header):
-        draw_professional_cell(c, x_offset, table_y - header_height + 5, col_widths[j], header_height,
-                             border_color=Color(0.4, 0.1, 0.1), border_width=1.2,
-                             text=header, font="Helvetica", font_size=10,
-                             text_color=white, bold=True, align="center")
-        x_offset += col_widths[j]
+    draw_table_header(c, table_left, table_y + 5, columns, header_height, header_start_color, header_end_color,
+                      border_color=Color(0.4, 0.1, 0.1), border_width=1.2, font_size=10)
     
     # Enhanced data rows
-    for i, row in enumerate(drive_data):
-        y_pos = table_y - header_height - (i * row_height)
-        x_offset = table_left
-        
+    def cell_fill(i, j, cell):
+        if j == 0:  # Drive column
+            return Color(0.85, 0.90, 0.95)  # Light blue for drive letters
+        if j == len(columns) - 1:  # File categories column
+            return Color(0.92, 0.96, 0.98)  # Light blue for categories
         # Alternating row colors with enhanced contrast
-        row_bg_base = Color(0.98, 0.95, 0.95) if i % 2 == 0 else Color(0.95, 0.92, 0.92)
-        
-        for j, cell in enumerate(row):
-            if j == len(row) - 1:  # File categories column - special handling
-                # Enhanced multiline cell with better formatting
-                categories_bg = Color(0.92, 0.96, 0.98)  # Light blue for categories
-                
-                # Draw cell background
-                draw_professional_cell(c, x_offset, y_pos - row_height + 5, col_widths[j], row_height,
-                                     fill_color=categories_bg, border_color=Color(0.6, 0.6, 0.6), border_width=0.8)
-                
-                # Draw enhanced multiline text with adjusted spacing for smaller width
-                draw_multiline_cell_text(c, x_offset, y_pos - row_height + 5, col_widths[j], row_height,
-                                       cell, font="Helvetica", font_size=7, text_color=black,
-                                       line_spacing=10, padding=4)
-            else:
-                # Regular data cells with enhanced styling
-                cell_bg = row_bg_base
-                
-                # Special formatting for drive names
-                if j == 0:  # Drive column
-                    cell_bg = Color(0.85, 0.90, 0.95)  # Light blue for drive letters
-                    font_style = "Helvetica-Bold"
-                    font_size = 11
-                    text_align = "center"
-                elif j in [2, 3, 4]:  # Storage columns
-                    font_style = "Helvetica"
-                    font_size = 9
-                    text_align = "right"
-                else:
-                    font_style = "Helvetica"
-                    font_size = 9
-                    text_align = "left"
-                
-                draw_professional_cell(c, x_offset, y_pos - row_height + 5, col_widths[j], row_height,
-                                     fill_color=cell_bg, border_color=Color(0.6, 0.6, 0.6), border_width=0.8,
-                                     text=cell, font=font_style.split('-')[0], font_size=font_size,
-                                     text_color=black, bold=(font_style.endswith('Bold')), align=text_align)
-            
-            x_offset += col_widths[j]
+        return Color(0.98, 0.95, 0.95) if i % 2 == 1 else Color(0.95, 0.92, 0.92)
+    
+    draw_table_rows(c, table_left, table_y - header_height + 5, columns, drive_data, row_height,
+                    cell_fill=cell_fill, border_width=0.8)
     
     # Enhanced table border
     c.setStrokeColor(Color(0.4, 0.1, 0.1))
@@ -696,53 +837,62 @@ def create_drive_details(c, width, height, y_start):
     
     return table_y - header_height - len(drive_data) * row_height - 25
 
-def create_Arka_report(output_filename="Arka_Drive_Analysis_Report.pdf", cover_image="bg.png"):
-    """Create the complete Arka report"""
-    
-    c = canvas.Canvas(output_filename, pagesize=A4)
-    width, height = A4
-    
-    print("Creating Arka Drive Analysis Report...")
-    
-    # Page 1 - Cover page
-    print("Creating cover page...")
-    create_Arka_cover(c, width, height, cover_image)
-    c.showPage()
-    
-    # Page 2 - Device Information and Drive Analysis
-    print("Creating analysis page...")
-    add_Arka_watermark(c, width, height, cover_image)
-    draw_header_footer(c, width, height)
-    # Bookmark and outline for section 1
-    c.bookmarkPage("sec_device_info")
-    c.addOutlineEntry("1. Device & Report Information", "sec_device_info", level=0, closed=None)
-    
-    y_pos = height - PAGE_MARGIN_TOP
-    y_pos = create_device_info_table(c, width, height, y_pos)
-    # Bookmark and outline for section 2
-    c.bookmarkPage("sec_system_overview")
-    c.addOutlineEntry("2. System Overview", "sec_system_overview", level=0, closed=None)
-    y_pos = create_system_overview(c, width, height, y_pos - 20)
-    # Move Drive Details to next page
-    c.showPage()
-    add_Arka_watermark(c, width, height, cover_image)
-    draw_header_footer(c, width, height)
-    # Bookmark and outline for section 3 on the new page
-    c.bookmarkPage("sec_drive_details")
-    c.addOutlineEntry("3. Drive Details", "sec_drive_details", level=0, closed=None)
-    y_pos = create_drive_details(c, width, height, height - PAGE_MARGIN_TOP)
-    
-    c.showPage()
-    
-    # Page 3 - Secure Deletion Log
-    print("Creating secure deletion log...")
-    add_Arka_watermark(c, width, height, cover_image)
-    draw_header_footer(c, width, height)
-    # Bookmark and outline for section 4
-    c.bookmarkPage("sec_deletion_log")
-    c.addOutlineEntry("4. Secure Deletion Log", "sec_deletion_log", level=0, closed=None)
-    
-    # Continue from previous page or add new content
+# Secure Deletion Log layout
+DELETION_LOG_COLUMNS = [
+    TableColumn("File / Folder Name / Path", 140, font_size=8, wrap=2),  # Long paths wrap at separators
+    TableColumn("File Type / Category", 80, align="center", font_size=8),
+    TableColumn("File Size", 60, align="right", font_size=8),
+    TableColumn("Deletion Method", 130, font_size=7),  # Smaller font for long method names
+]
+DELETION_LOG_HEADER_HEIGHT = 32
+DELETION_LOG_ROW_HEIGHT = 25
+
+def iter_deletion_rows(items):
+    """Yield deletion log table rows one at a time from an iterable of deletion items"""
+    for it in items:
+        path = it.get('path') or it.get('name') or ''
+        size_h = hr_bytes(it.get('size') or 0)
+        cat = 'File'
+        method = 'Delete'
+        if it.get('success') is False:
+            method = f"Failed ({it.get('error','error')})"
+        yield [path, cat, size_h, method]
+
+def draw_enhanced_deletion_header(c, x, top, columns, height):
+    """Draw enhanced header for deletion table"""
+    # Purple theme for deletion log
+    header_start_color = Color(0.4, 0.2, 0.6)
+    header_end_color = Color(0.5, 0.3, 0.7)
+    draw_table_header(c, x, top, columns, height, header_start_color, header_end_color,
+                      border_color=Color(0.2, 0.1, 0.4), border_width=1.2, font_size=9)
+
+def deletion_cell_fill(i, j, cell):
+    """Background colour of a deletion log cell"""
+    # Special formatting based on column
+    if j == 1:  # File Type column
+        if "Personal" in cell:
+            return Color(0.95, 0.90, 0.90)  # Light red
+        elif "System" in cell:
+            return Color(0.90, 0.95, 0.90)  # Light green
+        elif "Document" in cell:
+            return Color(0.90, 0.90, 0.95)  # Light blue
+    elif j == 3:  # Deletion Method column
+        if "Simple Delete" in cell:
+            return Color(1.0, 0.95, 0.85)  # Light orange for simple delete
+        elif "Secure Erase" in cell:
+            return Color(0.85, 0.95, 0.85)  # Light green for secure erase
+    # Enhanced alternating row colors
+    return Color(0.96, 0.94, 0.98) if i % 2 == 1 else Color(0.94, 0.92, 0.96)
+
+def draw_deletion_log(c, width, height, rows, cover_image="bg.png", continued=False):
+    """Draw the Secure Deletion Log, paginating over an iterator of rows.
+
+    Rows are pulled one page at a time and every page holds a fixed number of
+    rows, so the cost per page is constant and no row list is built up in
+    memory. The table header is repeated on each continuation page.
+    continued=True titles the first page as a continuation too, for a
+    session appended to an existing report.
+    """
     c.setFont("Helvetica-Bold", 12)
     c.setFillColor(black)
     c.drawString(PAGE_MARGIN_LEFT, height - PAGE_MARGIN_TOP, "Below mentioned files are Deleted")
@@ -750,140 +900,97 @@ def create_Arka_report(output_filename="Arka_Drive_Analysis_Report.pdf", cover_i
     # Secure Deletion Log header
     c.setFont("Helvetica-Bold", 14)
     c.setFillColor(Color(0.2, 0.4, 0.8))
-    c.drawString(PAGE_MARGIN_LEFT, height - PAGE_MARGIN_TOP - 30, "4. Secure Deletion Log")
+    title = "4. Secure Deletion Log (continued)" if continued else "4. Secure Deletion Log"
+    c.drawString(PAGE_MARGIN_LEFT, height - PAGE_MARGIN_TOP - 30, title)
     
-    # Deletion data from input or leave only header
-    global INPUT_DATA
-    deletion_data = [["File / Folder Name / Path", "File Type / Category", "File Size", "Deletion Method"]]
-    def hr_bytes(n):
-        try:
-            units = ['B','KB','MB','GB','TB','PB']
-            size = float(n)
-            idx = 0
-            while size >= 1024 and idx < len(units)-1:
-                size /= 1024.0
-                idx += 1
-            return f"{size:.2f} {units[idx]}"
-        except Exception:
-            return str(n)
-    if INPUT_DATA and isinstance(INPUT_DATA, dict):
-        rep = INPUT_DATA.get('deletion_report') or {}
-        items = rep.get('items') or []
-        for it in items[:50]:
-            path = it.get('path') or it.get('name') or ''
-            size_h = hr_bytes(it.get('size') or 0)
-            cat = 'File'
-            method = 'Delete'
-            if it.get('success') is False:
-                method = f"Failed ({it.get('error','error')})"
-            deletion_data.append([path, cat, size_h, method])
-    
-    # Enhanced deletion table with professional styling
     table_y = height - PAGE_MARGIN_TOP - 60
-    header_height = 32  # Increased for better appearance
-    row_height = 25     # Increased for better spacing
-    col_widths = [140, 80, 60, 130]  # Reduced widths for more compact table
     table_left = PAGE_MARGIN_LEFT
-    table_width = sum(col_widths)
-    
-    def draw_enhanced_deletion_header(c, x, y, widths, height):
-        """Draw enhanced header for deletion table"""
-        # Purple theme for deletion log
-        header_start_color = Color(0.4, 0.2, 0.6)
-        header_end_color = Color(0.5, 0.3, 0.7)
-        
-        # Draw gradient background
-        draw_gradient_header(c, x, y, sum(widths), height, header_start_color, header_end_color)
-        
-        # Draw header cells
-        x_offset = x
-        for j, (header, width) in enumerate(zip(deletion_data[0], widths)):
-            draw_professional_cell(c, x_offset, y, width, height,
-                                 border_color=Color(0.2, 0.1, 0.4), border_width=1.2,
-                                 text=header, font="Helvetica", font_size=9,
-                                 text_color=white, bold=True, align="center")
-            x_offset += width
-    
-    # Draw deletion table
-    first_page = True
-    for i, row in enumerate(deletion_data):
-        y_pos = table_y - (i * row_height)
-        
-        if y_pos < PAGE_MARGIN_BOTTOM + 50:  # Check if we need a new page
-            c.showPage()
-            add_Arka_watermark(c, width, height, cover_image)
-            draw_header_footer(c, width, height)
-            # Repeat section title on new page
-            c.setFont("Helvetica-Bold", 14)
-            c.setFillColor(Color(0.2, 0.4, 0.8))
-            c.drawString(PAGE_MARGIN_LEFT, height - PAGE_MARGIN_TOP - 30, "4. Secure Deletion Log (continued)")
-            # Reset table start and redraw header
-            table_y = height - PAGE_MARGIN_TOP - 60
-            y_pos = table_y
-            draw_enhanced_deletion_header(c, table_left, y_pos - header_height + 5, col_widths, header_height)
-            y_pos = table_y - header_height
-            first_page = False
-            # Skip header row on continuation pages
-            if i == 0:
-                continue
+    header_height = DELETION_LOG_HEADER_HEIGHT
+    row_height = DELETION_LOG_ROW_HEIGHT
+    # Rows are drawn while their position stays above the bottom margin
+    rows_per_page = int((table_y - header_height - (PAGE_MARGIN_BOTTOM + 50)) // row_height) + 1
+    
+    rows = iter(rows)
+    page_rows = list(islice(rows, rows_per_page))
+    index = 1
+    while True:
+        draw_enhanced_deletion_header(c, table_left, table_y + 5, DELETION_LOG_COLUMNS, header_height)
+        draw_table_rows(c, table_left, table_y - header_height + 5, DELETION_LOG_COLUMNS, page_rows, row_height,
+                        cell_fill=deletion_cell_fill, border_width=0.7, first_index=index)
+        index += len(page_rows)
         
-        if i == 0 and first_page:  # Header row on first page
-            draw_enhanced_deletion_header(c, table_left, y_pos - header_height + 5, col_widths, header_height)
-        elif i > 0:  # Data rows
-            x_offset = table_left
-            
-            # Enhanced alternating row colors
-            row_color = Color(0.96, 0.94, 0.98) if i % 2 == 1 else Color(0.94, 0.92, 0.96)
-            
-            for j, cell in enumerate(row):
-                cell_bg = row_color
-                font_size = 8
-                text_align = "left"
-                
-                # Special formatting based on column
-                if j == 1:  # File Type column
-                    if "Personal" in cell:
-                        cell_bg = Color(0.95, 0.90, 0.90)  # Light red
-                    elif "System" in cell:
-                        cell_bg = Color(0.90, 0.95, 0.90)  # Light green
-                    elif "Document" in cell:
-                        cell_bg = Color(0.90, 0.90, 0.95)  # Light blue
-                    text_align = "center"
-                elif j == 2:  # File Size column
-                    text_align = "right"
-                elif j == 3:  # Deletion Method column
-                    if "Simple Delete" in cell:
-                        cell_bg = Color(1.0, 0.95, 0.85)  # Light orange for simple delete
-                    elif "Secure Erase" in cell:
-                        cell_bg = Color(0.85, 0.95, 0.85)  # Light green for secure erase
-                    font_size = 7  # Smaller font for long method names
-                
-                draw_professional_cell(c, x_offset, y_pos - row_height + 5, col_widths[j], row_height,
-                                     fill_color=cell_bg, border_color=Color(0.6, 0.6, 0.6), border_width=0.7,
-                                     text=cell, font="Helvetica", font_size=font_size,
-                                     text_color=black, bold=False, align=text_align)
-                
-                x_offset += col_widths[j]
-    
-    c.showPage()
-    
-    # Page 4 - Summary Statistics
-    print("Creating summary page...")
-    add_Arka_watermark(c, width, height, cover_image)
-    draw_header_footer(c, width, height)
-    # Bookmark and outline for section 5
-    c.bookmarkPage("sec_summary")
-    c.addOutlineEntry("5. Summary Statistics", "sec_summary", level=0, closed=None)
-    
+        page_rows = list(islice(rows, rows_per_page))
+        if not page_rows:
+            break
+        c.showPage()
+        add_Arka_watermark(c, width, height, cover_image)
+        draw_header_footer(c, width, height)
+        # Repeat section title on new page
+        c.setFont("Helvetica-Bold", 14)
+        c.setFillColor(Color(0.2, 0.4, 0.8))
+        c.drawString(PAGE_MARGIN_LEFT, height - PAGE_MARGIN_TOP - 30, "4. Secure Deletion Log (continued)")
+
+def draw_export_digest(c, width, height, export):
+    """Draw section 4 of a summary-only report: the export holding the full deletion log and its SHA-256"""
+    c.setFont("Helvetica-Bold", 14)
+    c.setFillColor(Color(0.2, 0.4, 0.8))
+    c.drawString(PAGE_MARGIN_LEFT, height - PAGE_MARGIN_TOP - 30, "4. Secure Deletion Log (exported)")
+    c.setFont("Helvetica", 10)
+    c.setFillColor(black)
+    c.drawString(PAGE_MARGIN_LEFT, height - PAGE_MARGIN_TOP - 50,
+                 "The complete deletion log is in the export file below and is not repeated in this report.")
+    
+    rows = [
+        ("Export File", os.path.basename(export.path)),
+        ("Format", export.format.upper()),
+        ("File Size", hr_bytes(export.size)),
+        ("Deletion Records", str(export.counts['deletion'])),
+        ("Largest Files Listed", str(export.counts['largest'])),
+        ("Sensitive Files Listed", str(export.counts['sensitive'])),
+    ]
+    table_top = height - PAGE_MARGIN_TOP - 75
+    table_left = PAGE_MARGIN_LEFT
+    table_width = width - PAGE_MARGIN_LEFT - PAGE_MARGIN_RIGHT
+    row_height = 28
+    columns = [
+        TableColumn("Field", table_width * 0.35, font="Helvetica-Bold", font_size=10),
+        TableColumn("Value", table_width * 0.65, font="Helvetica", font_size=10),
+    ]
+    # Purple theme, as the deletion log it stands in for
+    draw_table_header(c, table_left, table_top + 5, columns, row_height, Color(0.4, 0.2, 0.6), Color(0.5, 0.3, 0.7),
+                      border_color=Color(0.2, 0.1, 0.4), border_width=1.2, font_size=11)
+    bottom = draw_table_rows(c, table_left, table_top - row_height + 5, columns, rows, row_height,
+                             cell_fill=lambda i, j, cell: Color(0.94, 0.92, 0.96) if j == 0 else
+                             Color(0.96, 0.94, 0.98) if i % 2 == 1 else Color(0.98, 0.97, 0.99),
+                             border_color=Color(0.7, 0.7, 0.7))
+    c.setStrokeColor(Color(0.2, 0.1, 0.4))
+    c.setLineWidth(1.5)
+    c.rect(table_left, bottom, table_width, table_top + 5 - bottom, fill=0, stroke=1)
+    
+    # The digest in a fixed-width font, on a line of its own so that it is never truncated
+    y = bottom - 30
+    c.setFont("Helvetica-Bold", 11)
+    c.setFillColor(Color(0.4, 0.2, 0.6))
+    c.drawString(table_left, y, "SHA-256 of the export file")
+    c.setFont("Courier", 9)
+    c.setFillColor(black)
+    c.drawString(table_left, y - 16, export.sha256)
+    c.setFont("Helvetica-Oblique", 9)
+    c.setFillColor(Color(0.4, 0.4, 0.4))
+    c.drawString(table_left, y - 34, f"Check the export with: generate_Arka_report.py --verify {os.path.basename(export.path)}")
+
+def draw_summary_statistics(c, width, height, totals, title="5. Summary Statistics",
+                            note="Note: Statistics are based on the current deletion session and secure erase operations performed."):
+    """Draw the Summary Statistics table for a set of deletion totals"""
     # Summary Statistics header
     c.setFont("Helvetica-Bold", 14)
     c.setFillColor(Color(0.2, 0.4, 0.8))
-    c.drawString(PAGE_MARGIN_LEFT, height - PAGE_MARGIN_TOP - 30, "5. Summary Statistics")
+    c.drawString(PAGE_MARGIN_LEFT, height - PAGE_MARGIN_TOP - 30, title)
     
     # Enhanced Summary table with professional styling
     summary_data = [
         ["Total Files Deleted", "Total Data Size Deleted", "Files Failed to Delete", "Sensitive Files Deleted"],
-        ["10", "30.2 GB", "0", "3"]  # Sample data instead of empty
+        [str(totals.deleted), hr_bytes(totals.bytes_deleted), str(totals.failed), str(totals.sensitive_deleted)]
     ]
     
     table_y = height - PAGE_MARGIN_TOP - 60
@@ -893,61 +1000,32 @@ def create_Arka_report(output_filename="Arka_Drive_Analysis_Report.pdf", cover_i
     table_left = PAGE_MARGIN_LEFT
     table_width = sum(col_widths)
     
+    # Special styling for different types of data
+    if totals.failed > 0:
+        failed_bg = Color(1.0, 0.90, 0.90)  # Light red
+        failed_text = Color(0.8, 0.1, 0.1)  # Dark red
+    else:
+        failed_bg = Color(0.90, 1.0, 0.90)  # Light green
+        failed_text = Color(0.1, 0.6, 0.1)  # Dark green
+    data_bgs = [
+        Color(0.90, 0.95, 1.0),  # Total Files Deleted: light blue
+        Color(0.95, 1.0, 0.90),  # Total Data Size Deleted: light green
+        failed_bg,               # Files Failed to Delete
+        Color(1.0, 0.95, 0.85),  # Sensitive Files Deleted: light orange
+    ]
+    text_colors = [Color(0.1, 0.3, 0.7), Color(0.1, 0.6, 0.1), failed_text, Color(0.8, 0.4, 0.1)]
+    columns = [TableColumn(header, w, align="center", font="Helvetica-Bold", font_size=14, text_color=color)
+               for header, w, color in zip(summary_data[0], col_widths, text_colors)]
+    
     # Enhanced header with gradient (orange theme for summary)
     header_start_color = Color(0.8, 0.4, 0.1)
     header_end_color = Color(0.9, 0.5, 0.2)
-    
-    # Draw gradient header background
-    draw_gradient_header(c, table_left, table_y - header_height + 5, table_width, header_height,
-                        header_start_color, header_end_color)
-    
-    # Draw header cells with enhanced styling
-    x_offset = table_left
-    for j, header in enumerate(summary_data[0]):
-        draw_professional_cell(c, x_offset, table_y - header_height + 5, col_widths[j], header_height,
-                             border_color=Color(0.6, 0.2, 0.05), border_width=1.5,
-                             text=header, font="Helvetica", font_size=10,
-                             text_color=white, bold=True, align="center")
-        x_offset += col_widths[j]
+    draw_table_header(c, table_left, table_y + 5, columns, header_height, header_start_color, header_end_color,
+                      border_color=Color(0.6, 0.2, 0.05), border_width=1.5, font_size=10)
     
     # Draw data row with enhanced styling
-    data_y_pos = table_y - header_height
-    x_offset = table_left
-    
-    for j, cell in enumerate(summary_data[1]):
-        # Special styling for different types of data
-        if j == 0:  # Total Files Deleted
-            data_bg = Color(0.90, 0.95, 1.0)  # Light blue
-            text_color = Color(0.1, 0.3, 0.7)  # Dark blue
-            font_size = 14
-            bold = True
-        elif j == 1:  # Total Data Size Deleted
-            data_bg = Color(0.95, 1.0, 0.90)  # Light green
-            text_color = Color(0.1, 0.6, 0.1)  # Dark green
-            font_size = 14
-            bold = True
-        elif j == 2:  # Files Failed to Delete
-            failed_count = int(cell) if cell.isdigit() else 0
-            if failed_count > 0:
-                data_bg = Color(1.0, 0.90, 0.90)  # Light red
-                text_color = Color(0.8, 0.1, 0.1)  # Dark red
-            else:
-                data_bg = Color(0.90, 1.0, 0.90)  # Light green
-                text_color = Color(0.1, 0.6, 0.1)  # Dark green
-            font_size = 14
-            bold = True
-        else:  # Sensitive Files Deleted
-            data_bg = Color(1.0, 0.95, 0.85)  # Light orange
-            text_color = Color(0.8, 0.4, 0.1)  # Dark orange
-            font_size = 14
-            bold = True
-        
-        draw_professional_cell(c, x_offset, data_y_pos - data_row_height + 5, col_widths[j], data_row_height,
-                             fill_color=data_bg, border_color=Color(0.6, 0.6, 0.6), border_width=1,
-                             text=cell, font="Helvetica", font_size=font_size,
-                             text_color=text_color, bold=bold, align="center")
-        
-        x_offset += col_widths[j]
+    draw_table_rows(c, table_left, table_y - header_height + 5, columns, summary_data[1:], data_row_height,
+                    cell_fill=lambda i, j, cell: data_bgs[j], border_width=1)
     
     # Enhanced table border with shadow
     c.setStrokeColor(Color(0.6, 0.2, 0.05))
@@ -966,48 +1044,429 @@ def create_Arka_report(output_filename="Arka_Drive_Analysis_Report.pdf", cover_i
     note_y = table_y - header_height - data_row_height - 20
     c.setFont("Helvetica-Oblique", 9)
     c.setFillColor(Color(0.4, 0.4, 0.4))
-    c.drawString(table_left, note_y, "Note: Statistics are based on the current deletion session and secure erase operations performed.")
+    c.drawString(table_left, note_y, note)
+
+def save_report(c, filename, manifest=None):
+    """Save the canvas and write the report's SHA-256 manifest; returns (digest, manifest path).
+
+    The digest is taken from the bytes as they are written - by the
+    streaming document, or here for a buffered canvas - never by reading
+    the saved file back.
+    """
+    if isinstance(c, StreamingCanvas):
+        c.save()
+        sha256 = c._doc.sha256
+    else:
+        with HashingWriter(open(filename, 'wb')) as f:
+            f.write(c.getpdfdata())
+        sha256 = f.hexdigest()
+    return sha256, write_manifest(filename, sha256, INPUT_DIGEST, manifest)
+
+def create_Arka_report(output_filename="Arka_Drive_Analysis_Report.pdf", cover_image="bg.png", timings=None,
+                       invariant=False, output_mode="stream", object_streams=False, image_dpi=DEFAULT_IMAGE_DPI,
+                       manifest=None, model=None, export=None):
+    """Create the complete Arka report; phase durations are added to timings if given.
+
+    Every timestamp in the report is taken from one clock reading. With
+    invariant=True reportlab's invariant mode also fixes the document dates
+    and ID, so the same input and assets always give the same PDF bytes.
+    output_mode "stream" writes each page to the file as soon as it is
+    finished; "buffer" keeps the whole document in memory until save.
+    object_streams=True (stream mode only) writes a PDF 1.5 file with
+    compressed object streams and an xref stream. The cover image is
+    embedded resampled to image_dpi (0: as it is). The PDF's SHA-256 is
+    left in OUTPUT_DIGEST and recorded in the manifest (default
+    <output>.sha256.json). Given the ExportResult of an export of the
+    deletion log (and the model it was exported from, whose totals the
+    export tallied), the log is replaced by the export's name and digest.
+    """
+    global REPORT_TIME, PAGE_NUMBERS, OUTPUT_DIGEST
+    REPORT_TIME = datetime.now()
+    PAGE_NUMBERS = PageNumbering()
+    
+    layout_started = time.perf_counter()
+    set_stream_encoding(object_streams)
+    if output_mode == "stream":
+        c = StreamingCanvas(output_filename, object_streams=object_streams, pagesize=A4,
+                            invariant=1 if invariant else 0)
+    elif object_streams:
+        raise ValueError("Object streams are only written in stream output mode")
+    else:
+        c = canvas.Canvas(output_filename, pagesize=A4, invariant=1 if invariant else 0)
+    width, height = A4
+    
+    print("Creating Arka Drive Analysis Report...")
+    # Aggregate the input once; every section reads from the model
+    if model is None:
+        model = build_report_model(INPUT_DATA)
+    cover_image = prepare_report_background(cover_image, image_dpi)
+    
+    # Page 1 - Cover page
+    print("Creating cover page...")
+    create_Arka_cover(c, width, height, cover_image)
+    c.showPage()
+    
+    # Page 2 - Device Information and Drive Analysis
+    print("Creating analysis page...")
+    add_Arka_watermark(c, width, height, cover_image)
+    draw_header_footer(c, width, height, section="Device Information")
+    # Bookmark and outline for section 1
+    c.bookmarkPage("sec_device_info")
+    c.addOutlineEntry("1. Device & Report Information", "sec_device_info", level=0, closed=None)
+    
+    y_pos = height - PAGE_MARGIN_TOP
+    y_pos = create_device_info_table(c, width, height, y_pos, model)
+    # Bookmark and outline for section 2
+    c.bookmarkPage("sec_system_overview")
+    c.addOutlineEntry("2. System Overview", "sec_system_overview", level=0, closed=None)
+    y_pos = create_system_overview(c, width, height, y_pos - 20, model)
+    # Move Drive Details to next page
+    c.showPage()
+    add_Arka_watermark(c, width, height, cover_image)
+    draw_header_footer(c, width, height, section="Drive Details")
+    # Bookmark and outline for section 3 on the new page
+    c.bookmarkPage("sec_drive_details")
+    c.addOutlineEntry("3. Drive Details", "sec_drive_details", level=0, closed=None)
+    y_pos = create_drive_details(c, width, height, height - PAGE_MARGIN_TOP, model)
+    
+    c.showPage()
+    
+    # Page 3 - Secure Deletion Log
+    print("Creating secure deletion log...")
+    add_Arka_watermark(c, width, height, cover_image)
+    draw_header_footer(c, width, height, section="Secure Deletion Log")
+    # Bookmark and outline for section 4
+    c.bookmarkPage("sec_deletion_log")
+    c.addOutlineEntry("4. Secure Deletion Log", "sec_deletion_log", level=0, closed=None)
+    
+    if export is not None:
+        draw_export_digest(c, width, height, export)
+    else:
+        # Deletion rows are pulled lazily so the log can list every item
+        draw_deletion_log(c, width, height, iter_deletion_rows(model.iter_deletion_items()), cover_image)
+    
+    c.showPage()
+    
+    # Page 4 - Summary Statistics
+    print("Creating summary page...")
+    add_Arka_watermark(c, width, height, cover_image)
+    draw_header_footer(c, width, height, section="Summary Statistics")
+    # Bookmark and outline for section 5
+    c.bookmarkPage("sec_summary")
+    c.addOutlineEntry("5. Summary Statistics", "sec_summary", level=0, closed=None)
+    
+    # The totals were tallied while the deletion log streamed the items
+    draw_summary_statistics(c, width, height, model.deletion_totals())
+    PAGE_NUMBERS.finish(c)
     
     # Save the PDF
-    c.save()
+    save_started = time.perf_counter()
+    OUTPUT_DIGEST = save_report(c, output_filename, manifest)
+    if timings is not None:
+        timings['layout'] = save_started - layout_started
+        timings['save'] = time.perf_counter() - save_started
     print(f"Arka report '{output_filename}' created successfully!")
     return True
 
+def append_deletion_session(report_filename, cover_image="bg.png", timings=None, image_dpi=DEFAULT_IMAGE_DPI,
+                            manifest=None):
+    """Append the input's deletion session to an existing report.
+
+    Adds "Secure Deletion Log (continued)" pages and a summary of the session
+    after the last page, with outline entries following the existing ones,
+    as a PDF incremental update: the existing bytes are left untouched, so
+    the time taken depends only on the size of the new session. On failure
+    the report is restored to its previous state. The manifest is rewritten
+    with the digest of the updated file.
+    """
+    global REPORT_TIME, PAGE_NUMBERS, OUTPUT_DIGEST
+    REPORT_TIME = datetime.now()
+    PAGE_NUMBERS = PageNumbering()
+    session = REPORT_TIME.strftime("%b %d, %Y  %I:%M %p")
+    
+    layout_started = time.perf_counter()
+    c = AppendingCanvas(report_filename, pagesize=A4)
+    width, height = A4
+    set_stream_encoding(c._doc.object_streams)
+    try:
+        print(f"Appending deletion session to '{report_filename}'...")
+        model = build_report_model(INPUT_DATA)
+        # Only drawn if the report has no watermark form to reuse
+        cover_image = prepare_report_background(cover_image, image_dpi)
+        
+        add_Arka_watermark(c, width, height, cover_image)
+        draw_header_footer(c, width, height, section="Secure Deletion Log (continued)")
+        c.bookmarkPage("sec_deletion_log")
+        c.addOutlineEntry(f"4. Secure Deletion Log (continued, {session})", "sec_deletion_log", level=0, closed=None)
+        draw_deletion_log(c, width, height, iter_deletion_rows(model.iter_deletion_items()), cover_image,
+                          continued=True)
+        c.showPage()
+        
+        add_Arka_watermark(c, width, height, cover_image)
+        draw_header_footer(c, width, height, section="Summary Statistics (continued)")
+        c.bookmarkPage("sec_summary")
+        c.addOutlineEntry(f"5. Summary Statistics (continued, {session})", "sec_summary", level=0, closed=None)
+        draw_summary_statistics(c, width, height, model.deletion_totals(), "5. Summary Statistics (continued)",
+                                f"Note: Statistics cover only the deletion session appended on {session}.")
+        PAGE_NUMBERS.finish(c)
+        
+        save_started = time.perf_counter()
+        c.save()
+    except Exception:
+        c.discard()
+        raise
+    OUTPUT_DIGEST = c._doc.sha256, write_manifest(report_filename, c._doc.sha256, INPUT_DIGEST, manifest)
+    if timings is not None:
+        timings['layout'] = save_started - layout_started
+        timings['save'] = time.perf_counter() - save_started
+    print(f"Deletion session appended to '{report_filename}'")
+    return True
+
+def export_deletion_log(export_path, fmt, summary_pdf=None, cover_image="bg.png", timings=None,
+                        output_mode="stream", object_streams=False, image_dpi=DEFAULT_IMAGE_DPI, manifest=None):
+    """Stream the input's file lists to an export file, optionally followed by a summary-only PDF.
+
+    The export gets a SHA-256 manifest like a PDF report does. The summary
+    PDF reuses the deletion totals tallied while the items were exported,
+    so the items are read once either way. Returns (ExportResult, export
+    manifest path).
+    """
+    global OUTPUT_DIGEST
+    export_started = time.perf_counter()
+    model = build_report_model(INPUT_DATA)
+    export = export_report(export_path, fmt, INPUT_DATA, model)
+    export_manifest = write_manifest(export_path, export.sha256, INPUT_DIGEST, manifest)
+    if timings is not None:
+        timings['export'] = time.perf_counter() - export_started
+    print(f"Exported {sum(export.counts.values())} record(s) to '{export_path}'")
+    OUTPUT_DIGEST = None
+    if summary_pdf:
+        create_Arka_report(summary_pdf, cover_image, timings, output_mode=output_mode, object_streams=object_streams,
+                           image_dpi=image_dpi, model=model, export=export)
+    return export, export_manifest
+
 INPUT_DATA = None
+INPUT_DIGEST = None  # SHA-256 of the input JSON file, encoded in the report QR code
+REPORT_TIME = None  # Set once per report by create_Arka_report
+PAGE_NUMBERS = None  # Footer page numbering of the report being drawn
+OUTPUT_DIGEST = None  # (SHA-256, manifest path) of the report last saved
+
+# reportlab's ASCII85 setting, used unless streams are written for a PDF 1.5 file
+DEFAULT_USE_A85 = rl_config.useA85
+
+def set_stream_encoding(object_streams):
+    """Pick the stream encoding for the next report.
+
+    ASCII85 keeps streams 7-bit clean for PDF 1.4 consumers at the cost of
+    25% more bytes and a pure-Python encode of every page and image; it is
+    turned off for object-stream (PDF 1.5) output. Set before each report,
+    since reportlab reads it from its global config while formatting.
+    """
+    rl_config.useA85 = 0 if object_streams else DEFAULT_USE_A85
+
+# Batch mode
+REPORT_FONTS = ["Helvetica", "Helvetica-Bold", "Helvetica-Oblique"]
+
+def load_batch_manifest(manifest_path, default_cover="bg.png"):
+    """Read a batch manifest into a list of {"input", "output", "cover"} jobs.
+
+    The manifest is a JSON list of jobs (or an object with a "jobs" list);
+    each job names an input JSON and an output PDF and may override the cover
+    image. Relative paths are resolved against the manifest's directory.
+    """
+    with open(manifest_path, 'r', encoding='utf-8-sig') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, dict):
+        manifest = manifest.get('jobs') or []
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+    for i, entry in enumerate(manifest):
+        if not isinstance(entry, dict) or not entry.get('input') or not entry.get('output'):
+            raise ValueError(f"Manifest job {i} needs 'input' and 'output' paths")
+        cover = os.path.join(base_dir, entry['cover']) if entry.get('cover') else default_cover
+        jobs.append({
+            'input': os.path.join(base_dir, entry['input']),
+            'output': os.path.join(base_dir, entry['output']),
+            'cover': cover,
+        })
+    return jobs
+
+def preload_report_assets(cover_images):
+    """Load fonts and cover image metadata into this process's caches"""
+    for font in REPORT_FONTS:
+        pdfmetrics.getFont(font)
+    for cover in cover_images:
+        if os.path.exists(cover):
+            width, height = A4
+            get_cover_image_size(cover, width, height)
+
+def render_batch_job(job, input_mode="stream", object_streams=False, image_dpi=DEFAULT_IMAGE_DPI):
+    """Render one manifest job in a worker process and return its status entry"""
+    global INPUT_DATA, INPUT_DIGEST
+    status = {'input': job['input'], 'output': job['output'], 'success': False}
+    started = time.perf_counter()
+    try:
+        # Keep the per-page progress messages of each job out of the batch log
+        with contextlib.redirect_stdout(io.StringIO()):
+            INPUT_DATA = load_report_input(job['input'], stream=(input_mode == 'stream'))
+            INPUT_DIGEST = file_digest(job['input'])
+            create_Arka_report(job['output'], job['cover'], object_streams=object_streams, image_dpi=image_dpi)
+        status['success'] = True
+        status['sha256'] = OUTPUT_DIGEST[0]
+    except Exception as e:
+        status['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        INPUT_DATA = INPUT_DIGEST = None
+    status['seconds'] = round(time.perf_counter() - started, 3)
+    return status
+
+def run_batch(manifest_path, cover_image="bg.png", workers=None, input_mode="stream", status_path=None,
+              object_streams=False, image_dpi=DEFAULT_IMAGE_DPI):
+    """Render every job of a manifest across a pool of worker processes.
+
+    Workers import reportlab and preload fonts and cover images once, then
+    render jobs until the manifest is exhausted. A status summary with one
+    entry per job (in manifest order) is written to status_path, by default
+    next to the manifest, and returned.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    jobs = load_batch_manifest(manifest_path, cover_image)
+    if status_path is None:
+        status_path = os.path.splitext(manifest_path)[0] + "_status.json"
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1, 61))  # 61: Windows pool limit
+    started_at = datetime.now().isoformat()
+    print(f"Rendering {len(jobs)} report(s) with {workers} worker(s)...")
+    
+    results = [None] * len(jobs)
+    covers = sorted({job['cover'] for job in jobs})
+    # Resample each background once here; the workers then only read the cached files
+    for cover in covers:
+        prepare_report_background(cover, image_dpi)
+    with ProcessPoolExecutor(max_workers=workers, initializer=preload_report_assets,
+                             initargs=(covers,)) as pool:
+        futures = {pool.submit(render_batch_job, job, input_mode, object_streams, image_dpi): i
+                   for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:  # Worker process died
+                results[i] = {'input': jobs[i]['input'], 'output': jobs[i]['output'], 'success': False,
+                              'error': f"{type(e).__name__}: {e}"}
+            state = "OK" if results[i]['success'] else f"FAILED ({results[i]['error']})"
+            print(f"[{done}/{len(jobs)}] {state}: {jobs[i]['output']}")
+    
+    summary = {
+        'operation': 'batch_report',
+        'manifest': os.path.abspath(manifest_path),
+        'started_at': started_at,
+        'completed_at': datetime.now().isoformat(),
+        'workers': workers,
+        'total': len(jobs),
+        'succeeded': sum(1 for r in results if r['success']),
+        'failed': sum(1 for r in results if not r['success']),
+        'jobs': results,
+    }
+    with open(status_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    print(f"Batch complete: {summary['succeeded']} succeeded, {summary['failed']} failed")
+    print(f"Status: {status_path}")
+    return summary
 
 def main():
     """Main function to generate the Arka report"""
     print("=== Arka Drive Analysis Report Generator ===")
     print("Creating exact replica of Arka report format...")
     
-    parser = argparse.ArgumentParser(description='Generate Arka Drive Analysis Report')
-    parser.add_argument('--output', '-o', default='Arka_Drive_Analysis_Report.pdf', help='Output PDF file path')
-    parser.add_argument('--cover', default='bg.png', help='Path to cover/watermark image (bg.png)')
-    parser.add_argument('--input', help='Path to JSON containing drive scan/report data')
+    parser = build_arg_parser()
     args = parser.parse_args()
+    if args.object_streams and args.output_mode != 'stream':
+        parser.error("--object-streams needs --output-mode stream")
+    if args.summary_pdf and args.format == 'pdf':
+        parser.error("--summary-pdf needs --format csv, jsonl or html")
 
+    if args.batch:
+        summary = run_batch(args.batch, args.cover, args.workers, args.input_mode, args.batch_status,
+                            args.object_streams, args.image_dpi)
+        sys.exit(1 if summary['failed'] else 0)
     output_file = args.output
     cover_img = args.cover
-    global INPUT_DATA
-    INPUT_DATA = None
+    global INPUT_DATA, INPUT_DIGEST
+    INPUT_DATA = INPUT_DIGEST = None
+    timings = {'import': IMPORT_FINISHED - IMPORT_STARTED - CACHE_LOOKUP_SECONDS}
+    # The lookup normally already ran before the rendering imports (see top of file)
+    cache, cache_key, hit = CACHE_LOOKUP or lookup_cached_report(args)
+    if cache is not None:
+        timings['cache'] = CACHE_LOOKUP_SECONDS
+    if hit:
+        serve_cached_report(args, cache_key, hit, timings)
+        return
+    
+    load_started = time.perf_counter()
     if args.input and os.path.exists(args.input):
         try:
-            with open(args.input, 'r', encoding='utf-8') as f:
-                INPUT_DATA = json.load(f)
+            INPUT_DATA = load_report_input(args.input, stream=(args.input_mode == 'stream'))
+            INPUT_DIGEST = file_digest(args.input)
         except Exception as e:
             print(f"Warning: failed to parse input JSON: {e}")
+    timings['load'] = time.perf_counter() - load_started
+
+    if args.format != 'pdf':
+        export_path = args.output
+        if export_path.lower().endswith('.pdf'):
+            export_path = export_path[:-4] + '.' + args.format
+        try:
+            export, export_manifest = export_deletion_log(export_path, args.format, args.summary_pdf, cover_img,
+                                                          timings, args.output_mode, args.object_streams,
+                                                          args.image_dpi, args.digest_manifest)
+        except Exception as e:
+            print(f"Error: could not export to {export_path}: {e}")
+            sys.exit(1)
+        print(f"\nOutput: {export_path}")
+        print_report_digest(export.sha256, export_manifest)
+        if args.summary_pdf:
+            print(f"Summary: {args.summary_pdf}")
+            print(f"Summary SHA-256: {OUTPUT_DIGEST[0]}")
+        if args.timings:
+            print_timings(timings)
+        sys.exit(0)
+
+    if args.append_to:
+        try:
+            success = append_deletion_session(args.append_to, cover_img, timings, args.image_dpi,
+                                              args.digest_manifest)
+        except Exception as e:
+            print(f"Error: could not append to {args.append_to}: {e}")
+            success = False
+        if success:
+            print(f"\nOutput: {args.append_to}")
+            print_report_digest(*OUTPUT_DIGEST)
+        if args.timings:
+            print_timings(timings)
+        sys.exit(0 if success else 1)
 
     # Generate the report
-    success = create_Arka_report(output_file, cover_img)
+    success = create_Arka_report(output_file, cover_img, timings, invariant=cache is not None,
+                                 output_mode=args.output_mode, object_streams=args.object_streams,
+                                 image_dpi=args.image_dpi, manifest=args.digest_manifest)
+    if success and cache is not None:
+        try:
+            cache.store(cache_key, output_file)
+        except OSError as e:
+            print(f"Warning: could not update report cache: {e}")
     
     if success:
         print("\nArka Report generated successfully!")
         print(f"Output: {output_file}")
+        print_report_digest(*OUTPUT_DIGEST)
         print(f"Cover: {cover_img}")
         print("Arka Watermark: Applied to all content pages")
         print("Format: Exact replica of reference document")
     else:
         print("\n❌ Failed to generate report. Please check the error messages above.")
+    if args.timings:
+        print_timings(timings)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Arka Page Numbers
+"Page N of M" and per-section page numbers drawn in a single layout pass
+"""
+
+TOTAL_FORM = "ArkaPageTotal"
+
+
+class PageNumbering:
+    """Page totals drawn before they are known, as forms filled in when the document ends.
+
+    A page draws the part of the text it knows ("Page 7 of ") and then a
+    form XObject that will hold the total, referenced by name before it
+    exists. finish() defines the forms with the final numbers just before
+    save(), so the report is laid out once and each total is written once
+    however many pages show it. Sections count their pages the same way,
+    each with a form named after the page the section starts on, which keeps
+    the names unique when sessions are appended to a report.
+    """
+
+    def __init__(self):
+        self.sections = []  # [title, form name, first page, last page]
+        self.fonts = {}  # form name -> (font, size) it is drawn with
+
+    def begin_section(self, c, title):
+        """Start counting the pages of a section at the current page"""
+        page = c.getPageNumber()
+        self._end_section(page - 1)
+        self.sections.append([title, "ArkaSectionPages%d" % page, page, None])
+
+    def _end_section(self, last_page):
+        if self.sections and self.sections[-1][3] is None:
+            self.sections[-1][3] = last_page
+
+    def _draw_deferred(self, c, x, y, text, form):
+        """Draw text at x, y in the current font, followed by the number held in form"""
+        font, size = c._fontname, c._fontsize
+        self.fonts.setdefault(form, (font, size))
+        c.drawString(x, y, text)
+        c.saveState()
+        c.translate(x + c.stringWidth(text, font, size), y)
+        c.doForm(form)
+        c.restoreState()
+
+    def draw_page_number(self, c, x, y):
+        """Draw "Page N of M" centred on x"""
+        page = c.getPageNumber()
+        text = "Page %d of " % page
+        # The total is not known yet; it is centred as if it had as many
+        # digits as this page's number (digits share one width in the standard fonts)
+        width = c.stringWidth(text + str(page), c._fontname, c._fontsize)
+        self._draw_deferred(c, x - width / 2, y, text, TOTAL_FORM)
+
+    def draw_section_number(self, c, x, y):
+        """Draw "<section> - page i of k" starting at x; nothing before the first section"""
+        if not self.sections:
+            return
+        title, form, first, _ = self.sections[-1]
+        self._draw_deferred(c, x, y, "%s - page %d of " % (title, c.getPageNumber() - first + 1), form)
+
+    def finish(self, c):
+        """Define the total forms; called on the last page, before save()"""
+        last_page = c.getPageNumber()
+        self._end_section(last_page)
+        numbers = {TOTAL_FORM: last_page}
+        for _, form, first, last in self.sections:
+            numbers[form] = last - first + 1
+        for form, value in numbers.items():
+            if form not in self.fonts:
+                continue
+            font, size = self.fonts[form]
+            # The form inherits the colour of the text it follows
+            c.beginForm(form, lowery=-size, uppery=size)
+            c.setFont(font, size)
+            c.drawString(0, 0, str(value))
+            c.endForm()
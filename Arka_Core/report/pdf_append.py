@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+"""
+Arka Report Appender
+Adds pages and outline entries to an existing report as a PDF incremental update
+"""
+
+import hashlib
+import os
+import re
+import time
+import zlib
+from collections import namedtuple
+
+from reportlab.pdfbase import pdfdoc
+
+from pdf_stream import StreamingCanvas, StreamingPDFDocument, WrittenObject
+from report_digest import HashingWriter
+
+
+class PDFSyntaxError(ValueError):
+    """The existing file is not a PDF that can be updated"""
+
+
+class _Truncated(Exception):
+    """A value runs past the end of the bytes read so far"""
+
+
+# Parsed values are dicts, lists, ints, floats, True/False/None and these
+Ref = namedtuple('Ref', ['number', 'generation'])
+
+
+class Name(str):
+    """A PDF name, without the leading slash"""
+
+
+class Raw(bytes):
+    """A string token kept exactly as written, delimiters included"""
+
+
+_SPACE = re.compile(rb'(?:[ \t\r\n\f\0]+|%[^\r\n]*)*')
+_REGULAR = re.compile(rb'[^ \t\r\n\f\0()<>\[\]{}/%]+')
+_REF_TAIL = re.compile(rb'[ \t\r\n\f\0]+(\d+)[ \t\r\n\f\0]+R(?![^ \t\r\n\f\0()<>\[\]{}/%])')
+_OBJ_HEADER = re.compile(rb'[ \t\r\n\f\0]*(\d+)[ \t\r\n\f\0]+(\d+)[ \t\r\n\f\0]+obj')
+_XREF_SUBSECTION = re.compile(rb'[ \t\r\n\f\0]*(\d+)[ \t]+(\d+)[ \t]*(?:\r\n|\r|\n)')
+_STREAM_START = re.compile(rb'[ \t\r\n\f\0]*stream(?:\r\n|\n)')
+_NAME_ESCAPE = re.compile(rb'#([0-9A-Fa-f]{2})')
+_NAME_SPECIAL = re.compile(rb'[^!-~]|[#()<>\[\]{}/%]')
+
+
+def _skip_space(data, pos):
+    pos = _SPACE.match(data, pos).end()
+    if pos >= len(data):
+        raise _Truncated
+    return pos
+
+
+def parse_value(data, pos=0, complete=False):
+    """Parse the PDF value at data[pos]; returns (value, end offset).
+
+    Unless data is complete (holds everything up to the end of the value's
+    container), a value that may continue past the end of data raises
+    _Truncated so that the caller can read more and try again.
+    """
+    pos = _skip_space(data, pos)
+    ch = data[pos:pos + 1]
+    if ch == b'<':
+        if data[pos + 1:pos + 2] == b'<':
+            result = {}
+            pos += 2
+            while True:
+                pos = _skip_space(data, pos)
+                if data.startswith(b'>>', pos):
+                    return result, pos + 2
+                key, pos = parse_value(data, pos, complete)
+                if not isinstance(key, Name):
+                    raise PDFSyntaxError("Dictionary key %r is not a name" % (key,))
+                result[key], pos = parse_value(data, pos, complete)
+        end = data.find(b'>', pos)
+        if end < 0:
+            raise _Truncated
+        return Raw(data[pos:end + 1]), end + 1
+    if ch == b'[':
+        result = []
+        pos += 1
+        while True:
+            pos = _skip_space(data, pos)
+            if data[pos:pos + 1] == b']':
+                return result, pos + 1
+            value, pos = parse_value(data, pos, complete)
+            result.append(value)
+    if ch == b'(':
+        depth = 0
+        i = pos
+        while i < len(data):
+            c = data[i]
+            if c == 0x5c:  # backslash escapes the next byte
+                i += 2
+                continue
+            if c == 0x28:
+                depth += 1
+            elif c == 0x29:
+                depth -= 1
+                if depth == 0:
+                    return Raw(data[pos:i + 1]), i + 1
+            i += 1
+        raise _Truncated
+    if ch == b'/':
+        m = _REGULAR.match(data, pos + 1)
+        end = m.end() if m else pos + 1
+        if end >= len(data) and not complete:
+            raise _Truncated
+        raw = _NAME_ESCAPE.sub(lambda e: bytes([int(e.group(1), 16)]), data[pos + 1:end])
+        return Name(raw.decode('latin-1')), end
+    m = _REGULAR.match(data, pos)
+    if not m:
+        raise PDFSyntaxError("Unexpected %r at offset %d" % (ch, pos))
+    end = m.end()
+    if end >= len(data) and not complete:
+        raise _Truncated
+    token = m.group()
+    if token in (b'true', b'false', b'null'):
+        return {b'true': True, b'false': False, b'null': None}[token], end
+    try:
+        number = int(token)
+    except ValueError:
+        try:
+            return float(token), end
+        except ValueError:
+            raise PDFSyntaxError("Unexpected %r at offset %d" % (token, pos)) from None
+    tail = _REF_TAIL.match(data, end)
+    if tail:
+        return Ref(number, int(tail.group(1))), tail.end()
+    if len(data) - end < 24 and not complete:  # "number generation R" may continue past the bytes read
+        raise _Truncated
+    return number, end
+
+
+def format_value(value):
+    """Serialise a parsed value back to PDF syntax"""
+    if isinstance(value, Raw):
+        return bytes(value)
+    if isinstance(value, Name):
+        return b'/' + _NAME_SPECIAL.sub(lambda e: b'#%02X' % e.group()[0], value.encode('latin-1'))
+    if isinstance(value, Ref):
+        return b'%d %d R' % value
+    if isinstance(value, bool):
+        return b'true' if value else b'false'
+    if value is None:
+        return b'null'
+    if isinstance(value, int):
+        return b'%d' % value
+    if isinstance(value, float):
+        return (b'%.6f' % value).rstrip(b'0').rstrip(b'.')
+    if isinstance(value, dict):
+        return b'<< ' + b' '.join(format_value(Name(k)) + b' ' + format_value(v) for k, v in value.items()) + b' >>'
+    if isinstance(value, (list, tuple)):
+        return b'[ ' + b' '.join(map(format_value, value)) + b' ]'
+    raise TypeError("Cannot write %r as a PDF value" % (value,))
+
+
+def _unpredict_png(data, columns, colors=1, bits=8):
+    """Undo the PNG row filters of a FlateDecode /Predictor 10-15 stream"""
+    bpp = max(1, colors * bits // 8)
+    row_length = (columns * colors * bits + 7) // 8
+    out = bytearray()
+    prev = bytearray(row_length)
+    for start in range(0, len(data), row_length + 1):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + 1 + row_length])
+        for i in range(len(row)):
+            left = row[i - bpp] if i >= bpp else 0
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + prev[i]) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xFF
+            elif kind == 4:
+                up_left = prev[i - bpp] if i >= bpp else 0
+                p = left + prev[i] - up_left
+                pa, pb, pc = abs(p - left), abs(p - prev[i]), abs(p - up_left)
+                row[i] = (row[i] + (left if pa <= pb and pa <= pc else prev[i] if pb <= pc else up_left)) & 0xFF
+        out += row
+        prev = row
+    return bytes(out)
+
+
+def decode_stream(dictionary, data):
+    """Decoded data of a stream; only FlateDecode (with or without a predictor) is supported"""
+    filters = dictionary.get('Filter')
+    filters = filters if isinstance(filters, list) else [filters] if filters else []
+    params = dictionary.get('DecodeParms')
+    params = params if isinstance(params, list) else [params] * len(filters)
+    for name, param in zip(filters, params):
+        if name != 'FlateDecode':
+            raise PDFSyntaxError("Unsupported stream filter /%s" % name)
+        data = zlib.decompress(data)
+        param = param or {}
+        if param.get('Predictor', 1) >= 10:
+            data = _unpredict_png(data, param.get('Columns', 1), param.get('Colors', 1),
+                                  param.get('BitsPerComponent', 8))
+        elif param.get('Predictor', 1) != 1:
+            raise PDFSyntaxError("Unsupported predictor %r" % param.get('Predictor'))
+    return data
+
+
+class _XrefTable:
+    """Classic xref section; an entry is read from the file by its position"""
+
+    def __init__(self, pdf, subsections):
+        self.pdf = pdf
+        self.subsections = subsections  # (first number, count, file offset of the entries)
+
+    def entry(self, number):
+        for start, count, position in self.subsections:
+            if start <= number < start + count:
+                raw = self.pdf._read_at(position + 20 * (number - start), 20)
+                return (1, int(raw[:10]), int(raw[11:16])) if raw[17:18] == b'n' else (0, 0, 0)
+        return None
+
+
+class _XrefStream:
+    """Cross-reference stream; an entry is a fixed-width row of its decoded data"""
+
+    def __init__(self, data, widths, index):
+        self.data = data
+        self.widths = widths
+        self.row_length = sum(widths)
+        self.subsections = []  # (first number, count, offset of the rows in data)
+        position = 0
+        for start, count in zip(index[::2], index[1::2]):
+            self.subsections.append((start, count, position))
+            position += count * self.row_length
+
+    def entry(self, number):
+        for start, count, position in self.subsections:
+            if start <= number < start + count:
+                pos = position + self.row_length * (number - start)
+                fields = []
+                for width in self.widths:
+                    fields.append(int.from_bytes(self.data[pos:pos + width], 'big'))
+                    pos += width
+                if self.widths[0] == 0:  # type 1 is the default
+                    fields[0] = 1
+                return tuple(fields)
+        return None
+
+
+class ExistingPDF:
+    """Read access to the parts of an existing PDF that an incremental update needs.
+
+    Only the trailer, the xref sections and the objects asked for are read.
+    A classic xref entry is read from the file by its position in the
+    fixed-width table; an xref stream is decoded once. Objects inside
+    compressed object streams are supported, so PDF 1.5 reports written
+    with object streams can be updated too (xref_streams is then True).
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self._object_streams = {}  # object stream number -> (First, decoded data, offsets)
+        try:
+            self.file_size = os.fstat(self._file.fileno()).st_size
+            self.version = self._read_version()
+            self.startxref = self._read_startxref()
+            self._sections = []  # newest first
+            self.trailer = None
+            offset, seen = self.startxref, set()
+            while offset is not None:
+                if offset in seen:
+                    raise PDFSyntaxError("xref sections form a loop at offset %d" % offset)
+                seen.add(offset)
+                section, trailer = self._read_xref(offset)
+                self._sections.append(section)
+                if self.trailer is None:
+                    self.trailer = trailer
+                offset = trailer.get('Prev')
+            if 'Encrypt' in self.trailer:
+                raise PDFSyntaxError("Encrypted documents cannot be updated")
+            self.xref_streams = isinstance(self._sections[0], _XrefStream)
+            self.size = self.trailer['Size']
+            self.catalog = self.object(self.trailer['Root'])
+        except Exception:
+            self._file.close()
+            raise
+
+    def close(self):
+        self._file.close()
+
+    def _read_at(self, offset, size):
+        self._file.seek(offset)
+        return self._file.read(size)
+
+    def _read_version(self):
+        m = re.match(rb'%PDF-(\d+)\.(\d+)', self._read_at(0, 16))
+        if not m:
+            raise PDFSyntaxError("%s is not a PDF file" % self.filename)
+        return int(m.group(1)), int(m.group(2))
+
+    def _read_startxref(self):
+        tail = self._read_at(max(0, self.file_size - 1024), 1024)
+        m = re.search(rb'startxref[ \t\r\n\f\0]+(\d+)', tail[tail.rfind(b'startxref'):])
+        if not m:
+            raise PDFSyntaxError("No startxref at the end of %s" % self.filename)
+        return int(m.group(1))
+
+    def ends_with_newline(self):
+        return self._read_at(self.file_size - 1, 1) in (b'\n', b'\r')
+
+    def _parse_at(self, offset, header=None):
+        """Parse the value at offset, after an "N G obj" header if one is given as a regex.
+
+        Returns the value and the file offset just past it.
+        """
+        size = 4096
+        while True:
+            data = self._read_at(offset, size)
+            pos = 0
+            if header is not None:
+                m = header.match(data)
+                if not m:
+                    raise PDFSyntaxError("Expected an object at offset %d" % offset)
+                pos = m.end()
+            try:
+                value, end = parse_value(data, pos)
+                return value, offset + end
+            except _Truncated:
+                if offset + len(data) >= self.file_size:
+                    raise PDFSyntaxError("Truncated value at offset %d" % offset) from None
+                size *= 4
+
+    def _read_stream(self, offset):
+        """Dictionary and decoded data of the stream object at offset"""
+        dictionary, end = self._parse_at(offset, _OBJ_HEADER)
+        m = _STREAM_START.match(self._read_at(end, 64))
+        if not isinstance(dictionary, dict) or not m:
+            raise PDFSyntaxError("Expected a stream at offset %d" % offset)
+        data = self._read_at(end + m.end(), self.resolve(dictionary.get('Length')))
+        return dictionary, decode_stream(dictionary, data)
+
+    def _read_xref(self, offset):
+        """The xref section at offset and its trailer dictionary"""
+        data = self._read_at(offset, 64)
+        if not data.startswith(b'xref'):
+            if not _OBJ_HEADER.match(data):
+                raise PDFSyntaxError("No xref section at offset %d" % offset)
+            dictionary, rows = self._read_stream(offset)
+            if dictionary.get('Type') != 'XRef':
+                raise PDFSyntaxError("No xref stream at offset %d" % offset)
+            index = dictionary.get('Index') or [0, dictionary['Size']]
+            return _XrefStream(rows, dictionary['W'], index), dictionary
+        subsections = []
+        offset += 4
+        while True:
+            data = self._read_at(offset, 64)
+            m = _XREF_SUBSECTION.match(data)
+            if not m:
+                break
+            start, count = int(m.group(1)), int(m.group(2))
+            subsections.append((start, count, offset + m.end()))
+            offset += m.end() + 20 * count  # entries are exactly 20 bytes
+        pos = _SPACE.match(data).end()
+        if not data.startswith(b'trailer', pos):
+            raise PDFSyntaxError("No trailer after the xref table at offset %d" % offset)
+        return _XrefTable(self, subsections), self._parse_at(offset + pos + len(b'trailer'))[0]
+
+    def _entry(self, number):
+        """(type, field 2, field 3) of the current xref entry of an object, as in an xref stream"""
+        for section in self._sections:
+            entry = section.entry(number)
+            if entry is not None:
+                return entry
+        return (0, 0, 0)
+
+    def _compressed_object(self, stream_number, index):
+        cached = self._object_streams.get(stream_number)
+        if cached is None:
+            kind, offset, _ = self._entry(stream_number)
+            if kind != 1:
+                raise PDFSyntaxError("Object stream %d is not in the file" % stream_number)
+            dictionary, data = self._read_stream(offset)
+            first = dictionary['First']
+            cached = self._object_streams[stream_number] = (first, data, [int(v) for v in data[:first].split()])
+        first, data, offsets = cached
+        try:
+            return parse_value(data, first + offsets[2 * index + 1], complete=True)[0]
+        except (_Truncated, IndexError):
+            raise PDFSyntaxError("Bad object %d in object stream %d" % (index, stream_number)) from None
+
+    def object(self, ref):
+        """The value of an indirect object (a stream's dictionary for stream objects)"""
+        kind, field2, field3 = self._entry(ref.number)
+        if kind == 1:
+            return self._parse_at(field2, _OBJ_HEADER)[0]
+        if kind == 2:
+            return self._compressed_object(field2, field3)
+        raise PDFSyntaxError("Object %d %d is not in the file" % ref)
+
+    def resolve(self, value):
+        return self.object(value) if isinstance(value, Ref) else value
+
+    def last_page(self, pages_ref):
+        """Dictionary of the last page under a page tree node"""
+        node = self.object(pages_ref)
+        while node.get('Type') != 'Page':
+            kids = self.resolve(node.get('Kids'))
+            if not kids:
+                return None
+            node = self.object(kids[-1])
+        return node
+
+    def page_xobjects(self, page):
+        """{name: (Ref, object dictionary)} of the XObjects in a page's resources"""
+        resources = self.resolve(page.get('Resources')) or {}
+        xobjects = self.resolve(resources.get('XObject')) or {}
+        return {name: (ref, self.object(ref)) for name, ref in xobjects.items() if isinstance(ref, Ref)}
+
+
+class ExistingObject(WrittenObject):
+    """Placeholder for an object of the existing file that new pages refer to"""
+
+    def __init__(self, width=None, height=None):
+        self.width = width
+        self.height = height
+
+
+class AppendingPDFDocument(StreamingPDFDocument):
+    """StreamingPDFDocument that adds its pages to an existing PDF as an incremental update.
+
+    New objects are numbered after the existing ones and written after the
+    end of the file. They are followed by new revisions of the few objects
+    that change - the root page tree node, the outline root and its last
+    entry, the catalog if it gains an outline or a newer version - and by an
+    xref section for just these objects, chained to the previous one with
+    /Prev. The new pages hang off a page tree node of their own, so the root
+    node gains one kid per update, and top-level outline entries are linked
+    after the existing ones. XObjects used on the existing last page (the
+    watermark form) are reused by name instead of being embedded again;
+    registering a new object under one of these names (the page total form)
+    writes it as a new revision of the existing object. The digest of the
+    updated file needs the existing bytes too, so they are read once (and
+    only hashed) when the update starts.
+    """
+
+    def __init__(self, filename, existing, **kwds):
+        self.existing = existing
+        self._revised = []  # existing object numbers given new content
+        super().__init__(filename, **kwds)
+
+    def _begin_file(self, filename):
+        existing = self.existing
+        hasher = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(chunk)
+        self._file = HashingWriter(open(filename, 'ab'), hasher)
+        self._offset = existing.file_size
+        if not existing.ends_with_newline():
+            self._write(b'\n')
+
+        # Move the objects registered so far (the font dictionary) after the existing ones
+        shift = existing.size - 1
+        self.numberToId = {number + shift: oid for number, oid in self.numberToId.items()}
+        self.idToObjectNumberAndVersion = {oid: (number + shift, version)
+                                           for oid, (number, version) in self.idToObjectNumberAndVersion.items()}
+        self.objectcounter += shift
+        self._next_number += shift
+
+        catalog = existing.catalog
+        self._pages_ref = catalog['Pages']
+        self.Pages.Parent = self._existing_ref(self._pages_ref)
+        self._outlines_ref = catalog.get('Outlines')
+        if isinstance(self._outlines_ref, Ref):
+            self._register_existing(self.Outlines, 'Existing.Outlines', self._outlines_ref)
+        else:
+            self._outlines_ref = None
+        last_page = existing.last_page(self._pages_ref)
+        if last_page is not None:
+            for name, (ref, obj) in existing.page_xobjects(last_page).items():
+                self._register_existing(ExistingObject(obj.get('Width'), obj.get('Height')), name, ref)
+
+    def _register_existing(self, obj, name, ref):
+        """Make name refer to an object of the existing file"""
+        setattr(obj, pdfdoc.__InternalName__, name)
+        self.idToObject[name] = obj
+        self.idToObjectNumberAndVersion[name] = tuple(ref)
+
+    def Reference(self, obj, name=None):
+        current = self.idToObject.get(name) if name is not None else None
+        if isinstance(current, ExistingObject) and obj is not current:
+            # New content for an object of the existing file, written as a revision
+            number, generation = self.idToObjectNumberAndVersion[name]
+            setattr(obj, pdfdoc.__InternalName__, name)
+            self.idToObject[name] = obj
+            self.numberToId[number] = name
+            if generation:
+                self._generations[number] = generation
+            self._revised.append(number)
+            return pdfdoc.PDFObjectReference(name)
+        return super().Reference(obj, name)
+
+    def _existing_ref(self, ref):
+        """PDFObjectReference to an object of the existing file"""
+        name = "Existing.%d.%d" % tuple(ref)
+        self.idToObjectNumberAndVersion[name] = tuple(ref)
+        return pdfdoc.PDFObjectReference(name)
+
+    def _ref(self, name):
+        return Ref(*self.idToObjectNumberAndVersion[name])
+
+    def _live_objects(self):
+        return (self.idToObject.get(pdfdoc.BasicFonts), self.Pages, self.Outlines)
+
+    def _prepare_save(self, canvas):
+        for fnt in self.delayedFonts:
+            fnt.addObjects(self)
+        outlines = self.Outlines
+        outlines.prepare(self, canvas)
+        if outlines.ready > 0 and self._outlines_ref is not None:
+            old_last = self.existing.object(self._outlines_ref).get('Last')
+            if old_last is not None:
+                self.idToObject[outlines.first.name].Prev = self._existing_ref(old_last)
+
+    def _write_revision(self, ref, value):
+        self._offsets[ref.number] = self._offset
+        self._generations[ref.number] = ref.generation
+        self._write(b'%d %d obj\n' % tuple(ref) + format_value(value) + b'\nendobj\n')
+
+    def _write_objects(self):
+        for number in self._revised:
+            self._write_object(number)
+        super()._write_objects()
+        existing = self.existing
+
+        pages = dict(existing.object(self._pages_ref))
+        pages['Kids'] = list(existing.resolve(pages.get('Kids')) or []) + [self._ref(self.Pages.__InternalName__)]
+        pages['Count'] = pages.get('Count', 0) + len(self.Pages.pages)
+        self._write_revision(self._pages_ref, pages)
+
+        catalog = None
+        outlines = self.Outlines
+        if outlines.ready > 0:
+            first, last = self._ref(outlines.first.name), self._ref(outlines.last.name)
+            if self._outlines_ref is None:
+                catalog = dict(existing.catalog)
+                catalog['Outlines'] = self._ref(outlines.__InternalName__)
+            else:
+                root = dict(existing.object(self._outlines_ref))
+                old_last = root.get('Last')
+                if old_last is None:
+                    root['First'] = first
+                else:
+                    entry = dict(existing.object(old_last))
+                    entry['Next'] = first
+                    self._write_revision(old_last, entry)
+                root['Last'] = last
+                root['Count'] = root.get('Count', 0) + outlines.count
+                self._write_revision(self._outlines_ref, root)
+        if self._pdfVersion > existing.version:
+            # The header cannot change in an update; the catalog's /Version overrides it
+            catalog = catalog or dict(existing.catalog)
+            catalog['Version'] = Name("%d.%d" % self._pdfVersion)
+        if catalog is not None:
+            self._write_revision(existing.trailer['Root'], catalog)
+
+    def _write_trailer(self):
+        existing = self.existing
+        trailer = existing.trailer
+        self._write_xref(Root=format_value(trailer['Root']),
+                         Info=format_value(trailer['Info']) if 'Info' in trailer else None,
+                         ID=format_value(self._update_id()), Prev=existing.startxref)
+        existing.close()
+
+    def _update_id(self):
+        """File identifier: the original first part and a new second part for this revision"""
+        old = self.existing.trailer.get('ID')
+        first = old[0] if isinstance(old, list) and old else None
+        h = hashlib.md5(bytes(first or b''))
+        h.update(b"%d" % self._offset)
+        if not self.invariant:
+            h.update(repr(time.time()).encode('ascii'))
+        new = Raw(b"<" + h.hexdigest().encode('ascii') + b">")
+        return [first or new, new]
+
+    def _patch_header_version(self, filename):
+        return False  # Handled by the catalog's /Version
+
+    def discard(self):
+        """Remove everything appended so far, leaving the existing document as it was"""
+        self._file.close()
+        self.existing.close()
+        os.truncate(self.existing.filename, self.existing.file_size)
+
+
+class AppendingCanvas(StreamingCanvas):
+    """Canvas that adds its pages to the end of an existing PDF (see AppendingPDFDocument).
+
+    Page numbers continue from the existing document and top-level entries
+    added with addOutlineEntry() follow its existing outline. If rendering
+    fails, discard() restores the file to its previous state.
+    """
+
+    def __init__(self, filename, **kwds):
+        self._existing = ExistingPDF(filename)
+        try:
+            super().__init__(filename, **kwds)
+        except Exception:
+            self._existing.close()
+            raise
+        pages = self._existing.object(self._existing.catalog['Pages'])
+        self._pageNumber = pages.get('Count', 0) + 1
+
+    def _make_document(self, filename, **kwds):
+        # An update is written in the same form as the file it updates
+        kwds['object_streams'] = self._existing.xref_streams
+        return AppendingPDFDocument(filename, self._existing, **kwds)
+
+    def discard(self):
+        self._doc.discard()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Arka Streaming PDF Writer
+reportlab canvas whose document writes each page to disk as soon as it is finished
+"""
+
+import zlib
+
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen import canvas
+
+from report_cache import file_digest
+from report_digest import HashingWriter
+
+# Objects packed into each object stream in object-stream mode
+OBJECTS_PER_STREAM = 100
+
+
+class WrittenObject(pdfdoc.PDFObject):
+    """Placeholder left in the document for an object already written to the file.
+
+    It keeps the object's registration (so references, hasForm() and name
+    lookups still work) and the image size that drawImage() reads when it
+    reuses a cached image, but none of the object's content.
+    """
+
+    def __init__(self, obj):
+        self.width = getattr(obj, 'width', None)
+        self.height = getattr(obj, 'height', None)
+
+    def format(self, document):
+        raise ValueError("PDF object has already been written")
+
+
+class PendingObject(pdfdoc.PDFObject):
+    """Placeholder for an object referenced by name before it is defined.
+
+    Pages that use a form defined only at the end of the document (such as
+    a page total) are written while the form is still pending; the number
+    reserved for it is filled in when Reference() registers the form.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def format(self, document):
+        raise ValueError("Forward reference to %s was never defined" % self.name)
+
+
+def number_runs(numbers):
+    """Split sorted object numbers into runs of consecutive numbers"""
+    runs = []
+    for number in numbers:
+        if runs and number == runs[-1][-1] + 1:
+            runs[-1].append(number)
+        else:
+            runs.append([number])
+    return runs
+
+
+class StreamingPDFDocument(pdfdoc.PDFDocument):
+    """PDFDocument that writes objects to the output file incrementally.
+
+    flush() serialises every registered object that can no longer change -
+    finished pages, their content streams, images, forms, fonts - and drops
+    it from memory, leaving a WrittenObject in its place. Objects that grow
+    until the end (page tree, font dictionary, outlines, catalog, info) are
+    held back and written by SaveToFile() together with the xref table and
+    trailer. Only object numbers, file offsets and the held objects stay in
+    memory, so memory use does not grow with the page count. Objects used
+    before they are defined (forms drawn by StreamingCanvas.doForm()) get
+    their number from reserve() and are held until they are registered.
+
+    With object_streams=True the file is PDF 1.5: objects other than streams
+    are packed OBJECTS_PER_STREAM at a time into compressed object streams,
+    and the cross-reference table is itself a compressed stream, which
+    removes the per-object overhead of the dictionaries and the 20-byte
+    xref entries of a long report.
+
+    Everything is written through a HashingWriter, so sha256 holds the
+    file's digest once it is saved, without reading the file back.
+    """
+
+    def __init__(self, filename, object_streams=False, **kwds):
+        super().__init__(filename=filename, **kwds)
+        self.object_streams = object_streams
+        if object_streams and self._pdfVersion < (1, 5):
+            self._pdfVersion = (1, 5)
+        self._offsets = {}  # object number -> file offset
+        self._compressed = {}  # object number -> (object stream number, index)
+        self._generations = {}  # object number -> generation, where not 0
+        self._packed = []  # (object number, body) for the next object stream
+        self._held = []  # object numbers written at the end
+        self._next_number = 1  # first object number not yet written or held
+        self.sha256 = None  # hex digest of the file, set by SaveToFile()
+        self._begin_file(filename)
+
+    def _begin_file(self, filename):
+        """Open the output file and write the PDF header"""
+        self._file = HashingWriter(open(filename, 'wb'))
+        self._offset = 0
+        header_version = self._pdfVersion
+        self._header_version = header_version
+        self._write(pdfdoc.pdfdocEnc("%%PDF-%s.%s" % header_version) +
+                    b'\n%\223\214\213\236 ReportLab Generated PDF document http://www.reportlab.com\n')
+
+    def _write(self, data):
+        self._file.write(data)
+        self._offset += len(data)
+
+    def _live_objects(self):
+        """Objects that keep changing until the document is saved"""
+        return (self.idToObject.get(pdfdoc.BasicFonts), self.Pages, self.Outlines, self.Catalog, self.info)
+
+    def _new_object_number(self):
+        """Register a number for an object the writer creates itself (object and xref streams)"""
+        self.objectcounter += 1
+        number = self.objectcounter
+        name = "Stream.%d" % number
+        self.idToObjectNumberAndVersion[name] = (number, 0)
+        self.numberToId[number] = name
+        self.idToObject[name] = WrittenObject(None)
+        return number
+
+    def reserve(self, name):
+        """Give name an object number now, for an object registered later under that name"""
+        if name not in self.idToObject:
+            super().Reference(PendingObject(name), name)
+
+    def Reference(self, obj, name=None):
+        if name is not None and isinstance(self.idToObject.get(name), PendingObject) \
+                and obj is not self.idToObject[name]:
+            # The object a reserved number was waiting for
+            setattr(obj, pdfdoc.__InternalName__, name)
+            self.idToObject[name] = obj
+            return pdfdoc.PDFObjectReference(name)
+        return super().Reference(obj, name)
+
+    def hasForm(self, name):
+        obj = self.idToObject.get(pdfdoc.xObjectName(name))
+        return obj is not None and not isinstance(obj, PendingObject)
+
+    def _write_object(self, number):
+        oid = self.numberToId[number]
+        obj = self.idToObject[oid]
+        if self.object_streams:
+            body = pdfdoc.format(obj, self, toplevel=1)
+            if not body.rstrip().endswith(b'endstream'):
+                self._packed.append((number, body))
+                if len(self._packed) >= OBJECTS_PER_STREAM:
+                    self._write_object_stream()
+                self.idToObject[oid] = WrittenObject(obj)
+                return
+        self._offsets[number] = self._offset
+        self._write(pdfdoc.PDFIndirectObject(oid, obj).format(self))
+        self.idToObject[oid] = WrittenObject(obj)
+
+    def _write_object_stream(self):
+        """Write the packed objects as one compressed object stream"""
+        packed, self._packed = self._packed, []
+        number = self._new_object_number()
+        index, bodies = [], []
+        position = 0
+        for i, (packed_number, body) in enumerate(packed):
+            self._compressed[packed_number] = (number, i)
+            index.append(b"%d %d" % (packed_number, position))
+            bodies.append(body.rstrip(b'\n'))
+            position += len(bodies[-1]) + 1
+        header = b" ".join(index) + b"\n"
+        data = zlib.compress(header + b"\n".join(bodies) + b"\n")
+        self._offsets[number] = self._offset
+        self._write(b"%d 0 obj\n<< /Type /ObjStm /N %d /First %d /Filter /FlateDecode /Length %d >>\nstream\n"
+                    % (number, len(packed), len(header), len(data)) + data + b"\nendstream\nendobj\n")
+
+    def addPage(self, page):
+        # The page tree only needs a reference; the page itself is flushed
+        name = self.thisPageName()
+        self.Reference(page, name)
+        self.Pages.addPage(pdfdoc.PDFObjectReference(name))
+        self.pageCounter += 1
+        self.inObject = None
+
+    def flush(self):
+        """Write out every object registered so far that can no longer change"""
+        live = [id(obj) for obj in self._live_objects()]
+        # Formatting an object can register new ones (e.g. a page's content
+        # stream), so keep going until the counter stops moving
+        while self._next_number <= self.objectcounter:
+            number = self._next_number
+            self._next_number += 1
+            if number in self._offsets:  # an object stream, already written
+                continue
+            obj = self.idToObject[self.numberToId[number]]
+            if id(obj) in live or isinstance(obj, PendingObject):
+                self._held.append(number)
+            else:
+                self._write_object(number)
+
+    def SaveToFile(self, filename, canvas):
+        if getattr(self, '_savedToFile', False):
+            raise RuntimeError("class %s instances can only be saved once" % self.__class__.__name__)
+        self._savedToFile = True
+        if self.encrypt.info():
+            raise ValueError("Encrypted documents cannot be written page by page")
+        self._prepare_save(canvas)
+        self._write_objects()
+        self._write_trailer()
+        self._file.close()
+        self.sha256 = self._file.hexdigest()
+        if self._patch_header_version(filename):
+            self.sha256 = file_digest(filename)
+
+    def _prepare_save(self, canvas):
+        """As GetPDFData: realise delayed fonts, sign the info and prepare the outline"""
+        for fnt in self.delayedFonts:
+            fnt.addObjects(self)
+        self.info.invariant = self.invariant
+        self.info.digest(self.signature)
+        self.Reference(self.Catalog)
+        self.Reference(self.info)
+        self.Outlines.prepare(self, canvas)
+        if self.Outlines.ready < 0:
+            self.Catalog.Outlines = None
+
+    def _write_objects(self):
+        """Write every object not yet in the file, the held ones last"""
+        self.flush()
+        # Held objects are complete now; formatting them may still register more
+        held = self._held
+        while held:
+            self._held = []
+            for number in held:
+                self._write_object(number)
+            self.flush()
+            held = self._held
+        if self._packed:
+            self._write_object_stream()
+
+    def _write_trailer(self):
+        self._write_xref(Root=self.Reference(self.Catalog), Info=self.Reference(self.info), ID=self.ID())
+
+    def _write_xref(self, **trailer):
+        """Write the cross-reference section for the objects written so far, then the trailer.
+
+        trailer holds the trailer entries besides Size (values may be
+        preformatted bytes). Consecutive object numbers share a subsection,
+        so a document that wrote every object gets a single one.
+        """
+        trailer = {key: value for key, value in trailer.items() if value is not None}
+        xref_number = self._new_object_number() if self.object_streams else None
+        xref_offset = self._offset
+        if xref_number is not None:
+            self._offsets[xref_number] = xref_offset
+        size = self.objectcounter + 1
+        runs = number_runs(sorted({0, *self._offsets, *self._compressed}))
+        if xref_number is not None:
+            self._write_xref_stream(xref_number, xref_offset, size, runs, trailer)
+            return
+        lines = [b"xref\n"]
+        for run in runs:
+            lines.append(b"%d %d\n" % (run[0], len(run)))
+            for number in run:
+                if number == 0:
+                    lines.append(b"0000000000 65535 f \n")
+                else:
+                    lines.append(b"%010d %05d n \n" % (self._offsets[number], self._generations.get(number, 0)))
+        self._write(b"".join(lines))
+        self._write(pdfdoc.PDFTrailer(startxref=xref_offset, Size=size, **trailer).format(self))
+
+    def _write_xref_stream(self, number, offset, size, runs, trailer):
+        width = max(1, (max(offset, size).bit_length() + 7) // 8)
+        rows = []
+        for run in runs:
+            for n in run:
+                if n == 0:
+                    rows.append(b"\0" + bytes(width) + b"\xff\xff")
+                elif n in self._compressed:
+                    stream, index = self._compressed[n]
+                    rows.append(b"\2" + stream.to_bytes(width, 'big') + index.to_bytes(2, 'big'))
+                else:
+                    rows.append(b"\1" + self._offsets[n].to_bytes(width, 'big') +
+                                self._generations.get(n, 0).to_bytes(2, 'big'))
+        data = zlib.compress(b"".join(rows))
+        dictionary = pdfdoc.PDFDictionary({'Type': pdfdoc.PDFName('XRef'), 'Size': size,
+                                           'W': pdfdoc.PDFArray([1, width, 2])})
+        if len(runs) > 1 or runs[0][0] != 0 or len(runs[0]) != size:
+            dictionary['Index'] = pdfdoc.PDFArray([v for run in runs for v in (run[0], len(run))])
+        for key, value in trailer.items():
+            dictionary[key] = value
+        dictionary['Filter'] = pdfdoc.PDFName('FlateDecode')
+        dictionary['Length'] = len(data)
+        self._write(b"%d 0 obj\n" % number + dictionary.format(self) + b"\nstream\n" + data +
+                    b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % offset)
+
+    def _patch_header_version(self, filename):
+        """Raise the version in the header if features used later need a newer PDF; True if it did"""
+        if self._pdfVersion == self._header_version:
+            return False
+        old = pdfdoc.pdfdocEnc("%%PDF-%s.%s" % self._header_version)
+        new = pdfdoc.pdfdocEnc("%%PDF-%s.%s" % self._pdfVersion)
+        if len(old) != len(new):
+            raise ValueError("Cannot patch PDF header version %r -> %r" % (old, new))
+        with open(filename, 'r+b') as f:
+            f.write(new)
+        return True
+
+
+class StreamingCanvas(canvas.Canvas):
+    """Canvas that flushes each finished page to disk through a StreamingPDFDocument.
+
+    Used like canvas.Canvas but only with a filename, not a file object, and
+    without encryption. getpdfdata() is not available. As with canvas.Canvas,
+    doForm() may use a form that is only defined later, before save().
+    object_streams=True writes a PDF 1.5 file with object and
+    cross-reference streams.
+    """
+
+    def __init__(self, filename, object_streams=False, **kwds):
+        super().__init__(filename, **kwds)
+        base = self._doc
+        self._doc = self._make_document(filename, compression=self._pageCompression, invariant=base.invariant,
+                                        pdfVersion=base._pdfVersion, lang=kwds.get('lang'),
+                                        object_streams=object_streams)
+        # The initial font was registered with the discarded document
+        self._make_preamble()
+
+    def _make_document(self, filename, **kwds):
+        return StreamingPDFDocument(filename, **kwds)
+
+    def showPage(self):
+        super().showPage()
+        self._doc.flush()
+
+    def doForm(self, name):
+        # The page may be written before the form is defined, so it needs its number now
+        self._doc.reserve(self._doc.getXObjectName(name))
+        super().doForm(name)
+
+    def getpdfdata(self):
+        raise NotImplementedError("StreamingCanvas writes directly to its file")
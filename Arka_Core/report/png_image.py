@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Arka PNG Passthrough
+PNG files embedded in the PDF from their compressed IDAT data, without Pillow and without decoding pixels
+"""
+
+import struct
+import zlib
+from collections import namedtuple
+
+from reportlab import rl_config
+from reportlab.lib.rl_accel import asciiBase85Encode
+from reportlab.lib.utils import _digester
+from reportlab.pdfbase import pdfdoc
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG colour type -> (channels, PDF colour space)
+COLOR_TYPES = {0: (1, 'DeviceGray'), 2: (3, 'DeviceRGB'), 3: (1, 'Indexed'),
+               4: (2, 'DeviceGray'), 6: (4, 'DeviceRGB')}
+
+PNGInfo = namedtuple('PNGInfo', 'width height bit_depth color_type palette transparency data')
+
+
+class PNGFormatError(ValueError):
+    """The file is not a PNG that can be embedded without decoding it"""
+
+
+def read_png(path):
+    """Parse a PNG file's chunks: header fields, palette, transparency and the concatenated IDAT data"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(PNG_SIGNATURE):
+        raise PNGFormatError("%s is not a PNG file" % path)
+    header = palette = transparency = None
+    idat = []
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if len(body) < length:
+            raise PNGFormatError("Truncated %s chunk in %s" % (kind.decode('latin-1'), path))
+        pos += 12 + length  # length, type, data, CRC
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body[:13])
+        elif kind == b'PLTE':
+            palette = body
+        elif kind == b'tRNS':
+            transparency = body
+        elif kind == b'IDAT':
+            idat.append(body)
+        elif kind == b'IEND':
+            break
+    if header is None or not idat:
+        raise PNGFormatError("%s has no image data" % path)
+    width, height, bit_depth, color_type, compression, filter_method, interlace = header
+    if color_type not in COLOR_TYPES or compression != 0 or filter_method != 0:
+        raise PNGFormatError("Unsupported PNG format in %s" % path)
+    if interlace:
+        # Adam7 passes cannot be described with PDF predictors
+        raise PNGFormatError("Interlaced PNG %s needs decoding" % path)
+    if color_type == 3 and (palette is None or transparency):
+        raise PNGFormatError("Palette PNG %s needs decoding" % path)
+    return PNGInfo(width, height, bit_depth, color_type, palette, transparency, b"".join(idat))
+
+
+def split_alpha(info):
+    """Split the still-filtered rows of a grey+alpha or RGBA image into colour and alpha rows.
+
+    PNG filters predict each byte from the same byte of the pixel to the
+    left and of the row above, so every channel's bytes are a valid filtered
+    image on their own: moving them apart (keeping each row's filter type)
+    gives two predictor-coded images without undoing the filters.
+    """
+    channels = COLOR_TYPES[info.color_type][0]
+    sample = info.bit_depth // 8
+    pixel = channels * sample
+    color_pixel = pixel - sample
+    row_size = 1 + info.width * pixel
+    raw = zlib.decompress(info.data)
+    if len(raw) < row_size * info.height:
+        raise PNGFormatError("PNG image data is truncated")
+    color_rows, alpha_rows = [], []
+    color = bytearray(info.width * color_pixel)
+    alpha = bytearray(info.width * sample)
+    for start in range(0, row_size * info.height, row_size):
+        row = raw[start + 1:start + row_size]
+        for k in range(color_pixel):
+            color[k::color_pixel] = row[k::pixel]
+        for k in range(sample):
+            alpha[k::sample] = row[color_pixel + k::pixel]
+        filter_type = raw[start:start + 1]
+        color_rows.append(filter_type + color)
+        alpha_rows.append(filter_type + alpha)
+    return zlib.compress(b"".join(color_rows)), zlib.compress(b"".join(alpha_rows))
+
+
+class _HexString(pdfdoc.PDFObject):
+    def __init__(self, data):
+        self.data = data
+
+    def format(self, document):
+        return b"<" + self.data.hex().encode('ascii') + b">"
+
+
+class PNGImageXObject(pdfdoc.PDFImageXObject):
+    """Image XObject whose stream is PNG IDAT data, decoded by the viewer with PNG predictors.
+
+    The data is FlateDecode with /DecodeParms << /Predictor 15 >>, which is
+    exactly how PNG stores it, so opaque images are copied byte for byte.
+    Alpha channels are split off into a second PNGImageXObject (left in
+    _smask for the canvas to register as the image's soft mask); a tRNS
+    colour key becomes a /Mask colour range.
+    """
+
+    def __init__(self, name, data, width, height, bit_depth, colors, color_space, mask=None):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.bitsPerComponent = bit_depth
+        self.colors = colors
+        self.colorSpace = color_space
+        self.mask = mask
+        self._smask = None
+        if rl_config.useA85:
+            self.streamContent = asciiBase85Encode(data)
+            self._filters = 'ASCII85Decode', 'FlateDecode'
+        else:
+            self.streamContent = data
+            self._filters = 'FlateDecode',
+
+    @classmethod
+    def from_png(cls, name, info):
+        channels, color_space = COLOR_TYPES[info.color_type]
+        mask = None
+        if info.color_type == 3:
+            color_space = pdfdoc.PDFArray([pdfdoc.PDFName('Indexed'), pdfdoc.PDFName('DeviceRGB'),
+                                           len(info.palette) // 3 - 1, _HexString(info.palette)])
+        elif info.transparency and info.color_type in (0, 2):
+            key = struct.unpack('>%dH' % channels, info.transparency[:2 * channels])
+            mask = [v for value in key for v in (value, value)]
+        if info.color_type in (4, 6):
+            if info.bit_depth < 8:
+                raise PNGFormatError("Unsupported PNG bit depth %d" % info.bit_depth)
+            color, alpha = split_alpha(info)
+            image = cls(name, color, info.width, info.height, info.bit_depth, channels - 1, color_space)
+            image._smask = cls(_digester(("%s SMask" % name).encode('utf-8')), alpha,
+                               info.width, info.height, info.bit_depth, 1, 'DeviceGray')
+            return image
+        return cls(name, info.data, info.width, info.height, info.bit_depth, channels, color_space, mask)
+
+    def format(self, document):
+        S = pdfdoc.PDFStream(content=self.streamContent)
+        dictionary = S.dictionary
+        dictionary["Type"] = pdfdoc.PDFName("XObject")
+        dictionary["Subtype"] = pdfdoc.PDFName("Image")
+        dictionary["Width"] = self.width
+        dictionary["Height"] = self.height
+        dictionary["BitsPerComponent"] = self.bitsPerComponent
+        if isinstance(self.colorSpace, str):
+            dictionary["ColorSpace"] = pdfdoc.PDFName(self.colorSpace)
+        else:
+            dictionary["ColorSpace"] = self.colorSpace
+        dictionary["Filter"] = pdfdoc.PDFArray([pdfdoc.PDFName(f) for f in self._filters])
+        params = pdfdoc.PDFDictionary({'Predictor': 15, 'Colors': self.colors,
+                                       'BitsPerComponent': self.bitsPerComponent, 'Columns': self.width})
+        # One entry per filter; some readers ignore a bare dictionary next to a Filter array
+        dictionary["DecodeParms"] = pdfdoc.PDFArray([pdfdoc.PDFnull] * (len(self._filters) - 1) + [params])
+        dictionary["Length"] = len(self.streamContent)
+        if self.mask:
+            dictionary["Mask"] = pdfdoc.PDFArray(self.mask)
+        if getattr(self, 'smask', None):
+            dictionary["SMask"] = self.smask
+        return S.format(document)
+
+
+def register_png_image(canv, path):
+    """Register a PNG file with the canvas so that canv.drawImage(path) embeds it without decoding.
+
+    The XObject is registered under the name drawImage() derives from the
+    path (with no mask), so drawImage() finds it and only draws it. Returns
+    False, registering nothing, when the file is not a PNG this module can
+    pass through; drawImage() then handles it as usual.
+    """
+    name = _digester(('%s%s' % (path, None)).encode('utf-8'))
+    doc = canv._doc
+    reg_name = doc.getXObjectName(name)
+    if doc.idToObject.get(reg_name) is not None:
+        return True
+    try:
+        image = PNGImageXObject.from_png(name, read_png(path))
+    except (OSError, zlib.error, struct.error, PNGFormatError):
+        return False
+    # As drawImage() registers a new image and its soft mask
+    doc.Reference(image, reg_name)
+    doc.addForm(name, image)
+    smask = image._smask
+    if smask is not None:
+        image.smask = doc.Reference(smask, doc.getXObjectName(smask.name))
+    del image._smask
+    return True
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Arka Report Assets
+Cover/watermark background resampled for the page once and cached on disk as JPEG
+"""
+
+import hashlib
+import os
+import tempfile
+
+from report_cache import default_cache_dir, file_digest
+
+ASSET_VERSION = b"arka-background/1"
+DEFAULT_IMAGE_DPI = 72
+JPEG_QUALITY = 85
+
+
+def target_size(source_size, page_size, dpi):
+    """Pixel size of an image scaled to cover the page at dpi, never larger than the source"""
+    img_width, img_height = source_size
+    page_width, page_height = page_size
+    # Output pixels per source pixel when the image covers the page at dpi
+    scale = max(page_width / img_width, page_height / img_height) * dpi / 72.0
+    if scale >= 1:
+        return img_width, img_height
+    return max(1, round(img_width * scale)), max(1, round(img_height * scale))
+
+
+def load_pil_image():
+    """Return PIL's Image module, or None when Pillow is unavailable.
+
+    PIL is optional; for dev environments using embeddable Python, compiled wheels may be unavailable.
+    Without it the generator reads PNG/JPEG sizes itself and the cover image is embedded as it is.
+    """
+    try:
+        from PIL import Image  # type: ignore
+    except Exception:
+        return None
+    return Image if hasattr(Image, 'open') else None
+
+
+def prepare_background(path, source_size, page_size, dpi=DEFAULT_IMAGE_DPI, cache_dir=None):
+    """Path of the background image to embed: the source resampled for the page as a cached JPEG.
+
+    The first use decodes the source with Pillow, flattens any transparency
+    onto white (the image is only drawn on white pages), resamples it to the
+    size that covers the page at dpi and stores it as a JPEG named by the
+    source's digest and the target size. Later runs find that file and
+    reportlab embeds its bytes as they are (DCTDecode), without decoding.
+    Without Pillow and without a cached copy the source path is returned.
+    """
+    width, height = target_size(source_size, page_size, dpi)
+    key = hashlib.sha256(ASSET_VERSION)
+    key.update(file_digest(path).encode('ascii'))
+    key.update(b"%dx%d q%d" % (width, height, JPEG_QUALITY))
+    directory = cache_dir or default_cache_dir('assets')
+    cached = os.path.join(directory, "%s_%dx%d.jpg" % (key.hexdigest()[:32], width, height))
+    if os.path.exists(cached):
+        return cached
+
+    Image = load_pil_image()
+    if Image is None:
+        return path
+    with Image.open(path) as img:
+        if img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info:
+            rgba = img.convert('RGBA')
+            flat = Image.new('RGBA', rgba.size, (255, 255, 255, 255))
+            flat.alpha_composite(rgba)
+            img = flat.convert('RGB')
+        else:
+            img = img.convert('RGB')
+        if img.size != (width, height):
+            img = img.resize((width, height), Image.LANCZOS)
+        os.makedirs(directory, exist_ok=True)
+        # Written under a temporary name so that concurrent batch workers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                img.save(f, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+            os.replace(tmp_path, cached)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return cached
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Arka Report Cache
+Content-addressed store of rendered PDFs with size-bounded LRU eviction
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+CACHE_VERSION = b"arka-report-cache/1"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir(name='report_cache'):
+    """Per-user cache directory (LOCALAPPDATA on Windows, XDG cache elsewhere)"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') \
+        or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'Arka', name)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file, read in chunks"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ReportCache:
+    """Directory of rendered reports named by the digest of everything that went into them.
+
+    A key covers the input JSON, the cover/watermark assets and the generator
+    itself, so any change to any of them is a miss. Hits refresh the entry's
+    modification time; after each store the least recently used entries are
+    removed until the directory fits within max_bytes.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key_for(self, input_paths, generator_paths, extra=()):
+        """Digest of the inputs and assets (by content) and the generator code and settings"""
+        h = hashlib.sha256(CACHE_VERSION)
+        for path in list(input_paths) + list(generator_paths):
+            h.update(b'\0')
+            if path and os.path.exists(path):
+                h.update(file_digest(path).encode('ascii'))
+        for value in extra:
+            h.update(b'\0' + str(value).encode('utf-8'))
+        return h.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key + '.pdf')
+
+    def fetch(self, key, output_path, chunk_size=1 << 20):
+        """Copy a cached report to output_path; returns its SHA-256 hex digest, or False on a miss.
+
+        The copy is hashed on the way through, so the report is read once.
+        """
+        entry = self._entry(key)
+        h = hashlib.sha256()
+        try:
+            with open(entry, 'rb') as src, open(output_path, 'wb') as dst:
+                for chunk in iter(lambda: src.read(chunk_size), b''):
+                    h.update(chunk)
+                    dst.write(chunk)
+            os.utime(entry)
+        except FileNotFoundError:
+            return False
+        return h.hexdigest()
+
+    def store(self, key, pdf_path):
+        """Add a freshly rendered report and evict least recently used entries"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        os.close(fd)
+        try:
+            shutil.copyfile(pdf_path, tmp_path)
+            os.replace(tmp_path, self._entry(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits within max_bytes"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.is_file() and e.name.endswith('.pdf'):
+                    st = e.stat()
+                    entries.append((st.st_mtime, st.st_size, e.path))
+                    total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
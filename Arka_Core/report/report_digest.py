@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Arka Report Digest
+SHA-256 of a report computed while it is written, its sidecar manifest and verification against it
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from report_cache import file_digest
+
+MANIFEST_FORMAT = "arka-report-manifest/1"
+MANIFEST_SUFFIX = ".sha256.json"
+
+
+class HashingWriter:
+    """File wrapper that hashes every byte written through it.
+
+    The digest of a file written only through write() is available as soon
+    as it is closed, without reading it back. Pass a hasher that has already
+    seen the file's existing bytes to extend a file opened for appending.
+    """
+
+    def __init__(self, file, hasher=None):
+        self.file = file
+        self.hasher = hasher or hashlib.sha256()
+
+    def write(self, data):
+        self.hasher.update(data)
+        return self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+    def hexdigest(self):
+        return self.hasher.hexdigest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def manifest_path(report_path):
+    """Sidecar manifest of a report: <report>.sha256.json next to it"""
+    return report_path + MANIFEST_SUFFIX
+
+
+def write_manifest(report_path, sha256, input_sha256=None, path=None):
+    """Write the sidecar manifest recording a report's size and SHA-256; returns its path"""
+    path = path or manifest_path(report_path)
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'file': os.path.basename(report_path),
+        'size': os.path.getsize(report_path),
+        'sha256': sha256,
+        'input_sha256': input_sha256,
+        'created_at': datetime.now().isoformat(),
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def verify_report(report_path, path=None):
+    """Check a report against its manifest; returns (ok, message).
+
+    The size is compared first, so a truncated or extended file fails
+    without being read; otherwise the file is hashed once in large chunks.
+    """
+    path = path or manifest_path(report_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        expected, size = manifest['sha256'].lower(), manifest['size']
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        return False, f"unreadable manifest {path}: {e}"
+    try:
+        actual_size = os.path.getsize(report_path)
+        if actual_size != size:
+            return False, f"size {actual_size} differs from {size} in the manifest"
+        actual = file_digest(report_path, chunk_size=4 << 20)
+    except OSError as e:
+        return False, f"cannot read {report_path}: {e}"
+    if actual != expected:
+        return False, f"SHA-256 {actual} differs from {expected} in the manifest"
+    return True, f"SHA-256 {actual}"
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Arka Report Export
+Deletion log, largest files and sensitive files streamed to CSV, JSON Lines or HTML
+"""
+
+import csv
+import json
+from collections import namedtuple
+from html import escape
+
+from report_digest import HashingWriter
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'html')
+
+# Record kinds in the order they are written, with their HTML section titles
+EXPORT_SECTIONS = (
+    ('deletion', "Secure Deletion Log"),
+    ('largest', "Largest Files"),
+    ('sensitive', "Sensitive Files"),
+)
+
+# Columns of the CSV and HTML exports; JSON Lines keeps each entry's own fields
+EXPORT_COLUMNS = ('record', 'drive', 'path', 'name', 'size', 'type', 'status', 'error')
+
+CHUNK_CHARS = 1 << 20  # text encoded and written per write() to the file
+
+ExportResult = namedtuple('ExportResult', ['path', 'format', 'size', 'sha256', 'counts'])
+
+
+class _TextSink:
+    """Text stream that encodes and writes in large chunks.
+
+    csv.writer and the row formatters write many small strings; joining
+    them and writing about a megabyte at a time keeps the per-row cost to
+    building the text. Characters UTF-8 cannot encode (lone surrogates from
+    the input JSON) are written as backslash escapes.
+    """
+
+    def __init__(self, writer, chunk_chars=CHUNK_CHARS):
+        self.writer = writer
+        self.chunk_chars = chunk_chars
+        self.parts = []
+        self.pending = 0
+        self.size = 0
+
+    def write(self, text):
+        self.parts.append(text)
+        self.pending += len(text)
+        if self.pending >= self.chunk_chars:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            data = "".join(self.parts).encode('utf-8', 'backslashreplace')
+            self.writer.write(data)
+            self.size += len(data)
+            self.parts = []
+            self.pending = 0
+
+
+def iter_export_sections(data, model):
+    """(record kind, title, entry count, iterable of (drive, entry)) for each export section.
+
+    Deletion items come from model.iter_deletion_items(), so exporting them
+    also tallies the model's deletion totals; the drives' file lists are
+    read from the input (lazily, when it was loaded in stream mode).
+    """
+    drives = (data.get('drives') or []) if isinstance(data, dict) else []
+    for kind, title in EXPORT_SECTIONS:
+        if kind == 'deletion':
+            items = model.deletion_items
+            entries = (('', item) for item in model.iter_deletion_items())
+            count = len(items) if hasattr(items, '__len__') else None
+        else:
+            key = kind + '_files'
+            lists = [(d.get('drive') or '', (d.get('file_analysis') or {}).get(key) or []) for d in drives]
+            entries = ((drive, entry) for drive, files in lists for entry in files)
+            count = sum(len(files) for _, files in lists)
+        yield kind, title, count, entries
+
+
+def export_row(kind, drive, entry):
+    """Values of EXPORT_COLUMNS for one entry"""
+    status = error = ''
+    if kind == 'deletion':
+        failed = entry.get('success') is False
+        status = 'failed' if failed else 'deleted'
+        error = (entry.get('error') or 'error') if failed else ''
+    path = entry.get('path') or entry.get('readable_path') or ''
+    size = entry.get('size')
+    return (kind, drive, path, entry.get('name') or '', '' if size is None else size,
+            entry.get('type') or '', status, error)
+
+
+def _write_csv(sink, sections, counts):
+    writer = csv.writer(sink, lineterminator='\n')
+    writer.writerow(EXPORT_COLUMNS)
+    for kind, _, _, entries in sections:
+        for drive, entry in entries:
+            writer.writerow(export_row(kind, drive, entry))
+            counts[kind] += 1
+
+
+def _write_jsonl(sink, sections, counts):
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    for kind, _, _, entries in sections:
+        for drive, entry in entries:
+            record = {'record': kind, 'drive': drive} if drive else {'record': kind}
+            # The export's own fields win over keys of the same name in the entry
+            record.update((key, value) for key, value in entry.items() if key not in record)
+            sink.write(dumps(record))
+            sink.write('\n')
+            counts[kind] += 1
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>%s</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 24px; color: #222; }
+h1 { color: #3366cc; font-size: 20px; }
+h2 { color: #3366cc; font-size: 16px; margin-top: 28px; }
+table { border-collapse: collapse; width: 100%%; }
+th { background: #664499; color: #fff; text-align: left; padding: 4px 6px; }
+td { border-bottom: 1px solid #ddd; padding: 3px 6px; word-break: break-all; }
+td.n { text-align: right; white-space: nowrap; }
+tr.failed td { background: #fbe5e5; }
+</style>
+</head>
+<body>
+<h1>%s</h1>
+"""
+
+
+def _write_html(sink, sections, counts, title):
+    sink.write(_HTML_HEAD % (escape(title), escape(title)))
+    header = "".join("<th>%s</th>" % escape(column.capitalize()) for column in EXPORT_COLUMNS[1:])
+    for kind, section_title, count, entries in sections:
+        heading = section_title if count is None else "%s (%d)" % (section_title, count)
+        sink.write('<h2>%s</h2>\n<table>\n<thead><tr>%s</tr></thead>\n<tbody>\n' % (escape(heading), header))
+        for drive, entry in entries:
+            row = export_row(kind, drive, entry)
+            cells = "".join(('<td class="n">%s</td>' if j == 3 else "<td>%s</td>") % escape(str(value))
+                            for j, value in enumerate(row[1:]))
+            sink.write('<tr class="failed">%s</tr>\n' % cells if row[6] == 'failed' else "<tr>%s</tr>\n" % cells)
+            counts[kind] += 1
+        sink.write("</tbody>\n</table>\n")
+    sink.write("</body>\n</html>\n")
+
+
+def export_report(path, fmt, data, model, title="Arka Drive Analysis Report"):
+    """Stream the deletion log and the drives' file lists to path; returns an ExportResult.
+
+    Entries are written as they are read, in large chunks, through a
+    HashingWriter, so the export's SHA-256 is known when it is closed and
+    memory use does not depend on the number of entries.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("Unknown export format %r" % fmt)
+    counts = {kind: 0 for kind, _ in EXPORT_SECTIONS}
+    sections = iter_export_sections(data, model)
+    with HashingWriter(open(path, 'wb')) as writer:
+        sink = _TextSink(writer)
+        if fmt == 'csv':
+            _write_csv(sink, sections, counts)
+        elif fmt == 'jsonl':
+            _write_jsonl(sink, sections, counts)
+        else:
+            _write_html(sink, sections, counts, title)
+        sink.flush()
+    return ExportResult(path, fmt, sink.size, writer.hexdigest(), counts)
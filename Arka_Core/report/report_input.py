@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Arka Report Input Loader
+Incremental reader for the report input JSON written by main.js (Arka_report_input.json)
+"""
+
+import codecs
+import json
+import re
+from json.scanner import make_scanner
+
+# Arrays that can hold one entry per file on a scanned volume. In stream mode
+# these are never materialised; they are exposed as LazyJsonArray objects.
+LAZY_ARRAY_PATHS = (
+    ('drives', '*', 'file_analysis', 'largest_files'),
+    ('drives', '*', 'file_analysis', 'sensitive_files'),
+    ('deletion_report', 'items'),
+)
+
+CHUNK_SIZE = 1 << 20  # 1 MB of input per read
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+_scan_once = make_scanner(json.JSONDecoder())
+
+
+def _path_matches(path, pattern):
+    """True if path matches pattern exactly, with '*' matching any array index"""
+    if len(path) != len(pattern):
+        return False
+    return all(p == '*' or p == k for k, p in zip(path, pattern))
+
+
+def _path_is_prefix(path):
+    """True if path leads towards (but is not) one of the lazy array paths"""
+    for pattern in LAZY_ARRAY_PATHS:
+        if len(path) < len(pattern) and _path_matches(path, pattern[:len(path)]):
+            return True
+    return False
+
+
+def _path_is_lazy(path):
+    return any(_path_matches(path, pattern) for pattern in LAZY_ARRAY_PATHS)
+
+
+class _JsonChunkReader:
+    """Pull reader over a UTF-8 JSON file that decodes one value at a time.
+
+    Only a window of the file is held in memory. Values are decoded with the
+    C scanner from the json module, so individual elements parse at native
+    speed while the document as a whole is never loaded.
+    """
+
+    def __init__(self, f, byte_offset=0, chunk_size=CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        f.seek(byte_offset)
+        self.buf = ''
+        self.pos = 0
+        self.base = byte_offset  # byte offset of buf[0] in the file
+        self.eof = False
+
+    def _fill(self, min_size=0):
+        """Drop consumed text and append at least one more chunk"""
+        consumed = self.buf[:self.pos]
+        if consumed:
+            self.base += len(consumed.encode('utf-8'))
+        data = self._f.read(max(self._chunk_size, min_size))
+        if not data:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + self._decoder.decode(data, final=self.eof)
+        self.pos = 0
+
+    def byte_offset(self):
+        """Byte offset in the file of the current read position"""
+        return self.base + len(self.buf[:self.pos].encode('utf-8'))
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at end of input)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ''
+            self._fill()
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f"Expected '{ch}' at byte {self.byte_offset()}")
+        self.pos += 1
+
+    def value(self):
+        """Decode and return the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _scan_once(self.buf, self.pos)
+            except (StopIteration, json.JSONDecodeError):
+                if self.eof:
+                    raise ValueError(f"Invalid JSON value at byte {self.byte_offset()}")
+                # Value runs past the window: grow it geometrically and retry
+                self._fill(len(self.buf) - self.pos)
+                continue
+            if (not self.eof and isinstance(obj, (int, float))
+                    and _NUMBER_TAIL.match(self.buf, end).end() == len(self.buf)):
+                # A number at the window edge may continue in the next chunk
+                self._fill(len(self.buf) - self.pos)
+                continue
+            self.pos = end
+            return obj
+
+
+class LazyJsonArray:
+    """Read-only view of a JSON array in the input file.
+
+    Iterating re-reads the array from disk and yields one decoded element at a
+    time, so memory use does not depend on the number of elements. len() is
+    known up front because elements are counted while the loader skips them.
+    """
+
+    def __init__(self, path, byte_offset, count):
+        self._path = path
+        self._byte_offset = byte_offset
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        if not self._count:
+            return
+        with open(self._path, 'rb') as f:
+            reader = _JsonChunkReader(f, self._byte_offset)
+            reader.expect('[')
+            while True:
+                yield reader.value()
+                ch = reader.peek()
+                reader.pos += 1
+                if ch == ']':
+                    return
+                if ch != ',':
+                    raise ValueError(f"Malformed array in {self._path}")
+
+    def __repr__(self):
+        return f"LazyJsonArray({self._count} items @ {self._byte_offset})"
+
+
+def _skip_array(reader, file_path):
+    """Consume an array without keeping its elements, returning a lazy view"""
+    offset = reader.byte_offset()
+    reader.expect('[')
+    count = 0
+    if reader.peek() == ']':
+        reader.pos += 1
+        return LazyJsonArray(file_path, offset, 0)
+    while True:
+        reader.value()
+        count += 1
+        ch = reader.peek()
+        reader.pos += 1
+        if ch == ']':
+            return LazyJsonArray(file_path, offset, count)
+        if ch != ',':
+            raise ValueError(f"Expected ',' or ']' at byte {reader.byte_offset()}")
+
+
+def _parse(reader, path, file_path):
+    """Parse the next value, descending only along lazy array paths"""
+    ch = reader.peek()
+    if ch == '[' and _path_is_lazy(path):
+        return _skip_array(reader, file_path)
+    if not _path_is_prefix(path):
+        return reader.value()
+
+    if ch == '{':
+        reader.pos += 1
+        obj = {}
+        if reader.peek() == '}':
+            reader.pos += 1
+            return obj
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            obj[key] = _parse(reader, path + (key,), file_path)
+            ch = reader.peek()
+            reader.pos += 1
+            if ch == '}':
+                return obj
+            if ch != ',':
+                raise ValueError(f"Expected ',' or '}}' at byte {reader.byte_offset()}")
+    if ch == '[':
+        reader.pos += 1
+        arr = []
+        if reader.peek() == ']':
+            reader.pos += 1
+            return arr
+        while True:
+            arr.append(_parse(reader, path + ('*',), file_path))
+            ch = reader.peek()
+            reader.pos += 1
+            if ch == ']':
+                return arr
+            if ch != ',':
+                raise ValueError(f"Expected ',' or ']' at byte {reader.byte_offset()}")
+    return reader.value()
+
+
+def load_report_input(file_path, stream=True):
+    """Load the report input JSON.
+
+    With stream=False this is a plain json.load. With stream=True small fields
+    are decoded eagerly and the arrays listed in LAZY_ARRAY_PATHS are replaced
+    by LazyJsonArray objects that read their elements from disk on demand.
+    """
+    if not stream:
+        with open(file_path, 'r', encoding='utf-8-sig') as f:
+            return json.load(f)
+
+    with open(file_path, 'rb') as f:
+        reader = _JsonChunkReader(f)
+        if reader.peek() == '\ufeff':
+            reader.pos += 1
+        data = _parse(reader, (), file_path)
+        if reader.peek():
+            raise ValueError(f"Extra data at byte {reader.byte_offset()}")
+    return data
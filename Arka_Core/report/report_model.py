@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Arka Report Model
+Aggregates the report input once into the figures every report section draws
+"""
+
+from collections import namedtuple
+from dataclasses import dataclass, field
+
+
+def hr_bytes(n):
+    """Format a byte count as a human readable string"""
+    try:
+        units = ['B','KB','MB','GB','TB','PB']
+        size = float(n)
+        idx = 0
+        while size >= 1024 and idx < len(units)-1:
+            size /= 1024.0
+            idx += 1
+        return f"{size:.2f} {units[idx]}"
+    except Exception:
+        return str(n)
+
+
+def normalize_path(path):
+    """Canonical form of a Windows path for matching paths from different sources"""
+    path = str(path or '').replace('/', '\\')
+    if path.startswith('\\\\?\\'):
+        path = path[4:]
+    return path.rstrip('\\').lower() if len(path) > 3 else path.lower()
+
+
+def _to_int(value):
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+# Per-category file count and size of one drive
+CategoryTotal = namedtuple('CategoryTotal', ['count', 'size'])
+
+# One scanned drive, with display strings already resolved
+DriveRow = namedtuple('DriveRow', ['drive', 'filesystem', 'total_bytes', 'used_bytes', 'free_bytes',
+                                   'total_human', 'used_human', 'free_human', 'categories'])
+
+
+@dataclass
+class DeletionTotals:
+    """Counts and byte totals over the items of a deletion report"""
+    deleted: int = 0
+    failed: int = 0
+    bytes_deleted: int = 0
+    sensitive_deleted: int = 0
+
+    def add(self, item, sensitive_paths=frozenset()):
+        if item.get('success') is False:
+            self.failed += 1
+        else:
+            self.deleted += 1
+            self.bytes_deleted += _to_int(item.get('size'))
+            if sensitive_paths and normalize_path(item.get('path')) in sensitive_paths:
+                self.sensitive_deleted += 1
+
+
+@dataclass
+class ReportModel:
+    """Everything the report sections need, computed in one pass over the input.
+
+    Drive figures are aggregated when the model is built. Deletion items can
+    number in the millions and are only read from disk by the deletion log,
+    so their totals are tallied while the log streams them through
+    iter_deletion_items(); deletion_totals() runs the pass itself if nothing
+    has consumed the items yet. Deleted items are counted as sensitive when
+    their path is in the set built from the drives' sensitive_files.
+    """
+    scanner_version: str = ''
+    serial_number: str = ''
+    system_info: dict = field(default_factory=dict)
+    total_drives: int = 0
+    total_capacity_bytes: int = 0
+    total_used_bytes: int = 0
+    drives: list = field(default_factory=list)
+    deletion_items: object = ()
+    sensitive_files: list = field(default_factory=list)
+    _deletion: DeletionTotals = field(default=None, init=False, repr=False)
+
+    @property
+    def used_percentage(self):
+        if self.total_capacity_bytes <= 0:
+            return 0.0
+        return float(self.total_used_bytes) / float(self.total_capacity_bytes) * 100.0
+
+    def iter_deletion_items(self):
+        """Yield the deletion items, tallying their totals on the first complete pass"""
+        if self._deletion is not None:
+            yield from self.deletion_items
+            return
+        totals = DeletionTotals()
+        sensitive_paths = self.sensitive_paths()
+        for item in self.deletion_items:
+            totals.add(item, sensitive_paths)
+            yield item
+        self._deletion = totals
+
+    def sensitive_paths(self):
+        """Set of normalized paths the scanner flagged as sensitive, for O(1) lookups"""
+        paths = set()
+        for files in self.sensitive_files:
+            for f in files:
+                for key in ('path', 'readable_path'):
+                    if f.get(key):
+                        paths.add(normalize_path(f[key]))
+        return paths
+
+    def deletion_totals(self):
+        if self._deletion is None:
+            for _ in self.iter_deletion_items():
+                pass
+        return self._deletion
+
+
+def build_report_model(data):
+    """Build a ReportModel from the report input (None or a dict from load_report_input)"""
+    model = ReportModel()
+    if not isinstance(data, dict):
+        return model
+
+    model.scanner_version = data.get('scanner_version') or ''
+    model.serial_number = data.get('serial_number') or ''
+    model.system_info = data.get('system_info') or {}
+
+    drives = data.get('drives') or []
+    for d in drives:
+        total_b = _to_int(d.get('total_space_bytes'))
+        used_b = _to_int(d.get('used_space_bytes'))
+        free_b = _to_int(d.get('free_space_bytes'))
+        model.total_capacity_bytes += total_b
+        model.total_used_bytes += used_b
+
+        analysis = d.get('file_analysis') or {}
+        if analysis.get('sensitive_files'):
+            model.sensitive_files.append(analysis['sensitive_files'])
+
+        categories = {}
+        for cat, vals in (analysis.get('categories') or {}).items():
+            vals = vals or {}
+            categories[cat] = CategoryTotal(_to_int(vals.get('count')), _to_int(vals.get('size')))
+
+        model.drives.append(DriveRow(
+            drive=d.get('drive') or '',
+            filesystem=d.get('filesystem') or '',
+            total_bytes=total_b,
+            used_bytes=used_b,
+            free_bytes=free_b,
+            total_human=d.get('total_space_human') or hr_bytes(total_b),
+            used_human=d.get('used_space_human') or hr_bytes(used_b),
+            free_human=d.get('free_space_human') or hr_bytes(free_b),
+            categories=categories,
+        ))
+    model.total_drives = _to_int(data.get('total_drives')) or len(model.drives)
+
+    model.deletion_items = (data.get('deletion_report') or {}).get('items') or []
+    return model
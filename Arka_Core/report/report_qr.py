@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Arka Report QR Code
+QR codes from reportlab's qrencoder with faster Reed-Solomon and mask selection, drawn as a single path
+"""
+
+import re
+from functools import lru_cache
+
+from reportlab.graphics.barcode import qrencoder
+
+ERROR_CORRECT_LEVELS = {'L': qrencoder.QRErrorCorrectLevel.L, 'M': qrencoder.QRErrorCorrectLevel.M,
+                        'Q': qrencoder.QRErrorCorrectLevel.Q, 'H': qrencoder.QRErrorCorrectLevel.H}
+QUIET_ZONE = 4  # modules of white margin around the symbol
+
+# GF(256) tables; EXP is doubled so that sums of two logs need no modulo
+_EXP = qrencoder.EXP_TABLE[:255] * 2
+_LOG = qrencoder.LOG_TABLE
+
+# Runs of five or more modules of one colour (penalty rule 1)
+_RUNS = re.compile(r"0{5,}|1{5,}")
+_FINDER = "10111010000"  # the only finder-like pattern qrencoder scores (rule 3)
+_BIT_CHARS = bytes.maketrans(b"\0\1", b"01")
+
+
+@lru_cache(maxsize=None)
+def _generator_logs(ec_count):
+    """Logs of the Reed-Solomon generator polynomial's coefficients after the leading 1"""
+    poly = [1]
+    for i in range(ec_count):
+        # poly *= (x + alpha^i)
+        root = _EXP[i]
+        poly = [a ^ (_EXP[_LOG[b] + _LOG[root]] if b else 0) for a, b in zip(poly + [0], [0] + poly)]
+    return [_LOG[coefficient] for coefficient in poly[1:]]
+
+
+def rs_remainder(data, ec_count):
+    """Reed-Solomon error correction bytes for one block of data bytes"""
+    generator = _generator_logs(ec_count)
+    remainder = [0] * ec_count
+    for byte in data:
+        factor = byte ^ remainder.pop(0)
+        remainder.append(0)
+        if factor:
+            log_factor = _LOG[factor]
+            remainder = [r ^ _EXP[log_factor + g] for r, g in zip(remainder, generator)]
+    return remainder
+
+
+@lru_cache(maxsize=None)
+def _mask_rows(mask_pattern, count):
+    """Rows of a mask pattern as integers, column 0 in the most significant bit"""
+    mask = qrencoder.QRUtil.getMask(mask_pattern)
+    return [sum(1 << (count - 1 - col) for col in range(count) if mask(row, col)) for row in range(count)]
+
+
+@lru_cache(maxsize=None)
+def _data_positions(version):
+    """qrencoder's data module positions for a version, and the rows of the data region as integers"""
+    qr = qrencoder.QRCode(version, qrencoder.QRErrorCorrectLevel.M)
+    qr.moduleCount = count = version * 4 + 17
+    positions = list(qr._dataPosIterator())
+    region = [0] * count
+    for col, row in positions:
+        region[row] |= 1 << (count - 1 - col)
+    return positions, region
+
+
+def _rows_to_ints(modules):
+    return [int(bytes(row).translate(_BIT_CHARS), 2) for row in modules]
+
+
+def lost_points(rows, count):
+    """qrencoder's mask penalty (QRUtil.getLostPoint) for rows given as integers"""
+    lines = [format(row, "0%db" % count) for row in rows]
+    columns = ["".join(column) for column in zip(*lines)]
+    score = 0
+    # Rule 1: runs in rows and columns (the space keeps runs from joining across lines)
+    runs = _RUNS.findall(" ".join(lines + columns))
+    score += sum(map(len, runs)) - 2 * len(runs)
+    # Rule 2: 2x2 blocks of one colour
+    full = (1 << count) - 1
+    for upper, lower in zip(rows, rows[1:]):
+        same = ~(upper ^ lower) & full
+        blocks = same & (same >> 1) & ~(upper ^ (upper >> 1)) & (full >> 1)
+        score += 3 * bin(blocks).count("1")
+    # Rule 3: finder-like patterns, searched in rows only, as qrencoder does
+    last_start = count - len(_FINDER)
+    for line in lines:
+        start = line.find(_FINDER)
+        while 0 <= start < last_start:
+            score += 40
+            start = line.find(_FINDER, start + len(_FINDER))
+    # Rule 4: balance of dark and light modules
+    dark = sum(bin(row).count("1") for row in rows)
+    return score + 10 * (abs(100 * dark // (count * count) - 50) // 5)
+
+
+class _BitBuffer(qrencoder.QRBitBuffer):
+    """QRBitBuffer that appends whole fields to an integer instead of bit by bit"""
+
+    def __init__(self):
+        self.value = 0
+        self.length = 0
+
+    @property
+    def buffer(self):
+        padding = -self.length % 8
+        return list((self.value << padding).to_bytes((self.length + padding) // 8, 'big'))
+
+    def put(self, num, length):
+        self.value = (self.value << length) | (num & ((1 << length) - 1))
+        self.length += length
+
+    def putBit(self, bit):
+        self.put(1 if bit else 0, 1)
+
+
+class FastQRCode(qrencoder.QRCode):
+    """qrencoder.QRCode with table-driven Reed-Solomon coding and integer-row masking.
+
+    qrencoder builds the complete symbol module by module nine times - once
+    per mask to score it, once more for the result - and divides polynomials
+    recursively for the error correction bytes. Here the data bits are laid
+    out once as rows of integers, each mask is applied and scored with bit
+    and string operations, and the error correction bytes come from a shift
+    register. Scoring follows qrencoder rule for rule, so the chosen mask and
+    the modules are the same.
+    """
+
+    _dataRows = None
+
+    def make(self):
+        if self.version is None:
+            self.version = self.calculate_version()
+        if self.dataCache is None:
+            self.dataCache = self.create_data()
+        self.makeImpl(False, self.getBestMaskPattern())
+
+    def create_data(self):
+        """As QRCode.createData, with the error correction bytes from rs_remainder()"""
+        rs_blocks = qrencoder.QRRSBlock.getRSBlocks(self.version, self.errorCorrectLevel)
+        buffer = _BitBuffer()
+        for data in self.dataList:
+            data.write(buffer, self.version)
+        capacity = sum(block.dataCount for block in rs_blocks) * 8
+        if buffer.getLengthInBits() > capacity:
+            raise ValueError("code length overflow. (%d > %d)" % (buffer.getLengthInBits(), capacity))
+        if buffer.getLengthInBits() + 4 <= capacity:
+            buffer.put(0, 4)
+        buffer.put(0, -buffer.getLengthInBits() % 8)
+        pad = [qrencoder.QRCode.PAD0, qrencoder.QRCode.PAD1]
+        while buffer.getLengthInBits() < capacity:
+            buffer.put(pad[0], 8)
+            pad.reverse()
+
+        data_blocks, ec_blocks = [], []
+        codewords = buffer.buffer
+        offset = 0
+        for block in rs_blocks:
+            data_blocks.append(codewords[offset:offset + block.dataCount])
+            offset += block.dataCount
+            ec_blocks.append(rs_remainder(data_blocks[-1], block.totalCount - block.dataCount))
+        # Interleave the codewords of the blocks
+        codewords = []
+        for blocks in (data_blocks, ec_blocks):
+            for i in range(max(len(b) for b in blocks)):
+                codewords.extend(b[i] for b in blocks if i < len(b))
+        return codewords
+
+    def data_rows(self):
+        """Unmasked data bits laid out on the symbol, as rows of integers"""
+        if self._dataRows is None:
+            count = self.version * 4 + 17
+            positions, _ = _data_positions(self.version)
+            bits = "".join(format(byte, "08b") for byte in self.dataCache)
+            rows = [0] * count
+            for (col, row), bit in zip(positions, bits):
+                if bit == "1":
+                    rows[row] |= 1 << (count - 1 - col)
+            self._dataRows = rows
+        return self._dataRows
+
+    def _masked_rows(self, base, mask_pattern):
+        _, region = _data_positions(self.version)
+        mask = _mask_rows(mask_pattern, self.moduleCount)
+        return [(b & ~r) | ((d ^ m) & r) for b, d, m, r in zip(base, self.data_rows(), mask, region)]
+
+    def mapData(self, data, maskPattern):
+        count = self.moduleCount
+        rows = self._masked_rows(_rows_to_ints(self.modules), maskPattern)
+        self.modules = [[bit == "1" for bit in format(row, "0%db" % count)] for row in rows]
+
+    def getBestMaskPattern(self):
+        # Function patterns with blank format information, as qrencoder scores them
+        self.moduleCount = self.version * 4 + 17
+        self.makeImpl(True, 0)
+        base = _rows_to_ints(self.modules)
+        best, best_points = 0, None
+        for pattern in range(8):
+            points = lost_points(self._masked_rows(base, pattern), self.moduleCount)
+            if best_points is None or points < best_points:
+                best, best_points = pattern, points
+        return best
+
+
+@lru_cache(maxsize=64)
+def qr_matrix(payload, level='M'):
+    """QR modules for payload as a tuple of rows of booleans (True = dark), memoised by payload"""
+    qr = FastQRCode(None, ERROR_CORRECT_LEVELS[level])
+    qr.addData(payload)
+    qr.make()
+    return tuple(tuple(row) for row in qr.modules)
+
+
+def module_rectangles(matrix):
+    """Dark modules merged into rectangles (col, row, width, height).
+
+    Each row is cut into runs of dark modules, and a run continues the
+    rectangle above it when it covers exactly the same columns.
+    """
+    done = []
+    open_rects = {}  # (first col, last col) -> [col, row, width, height]
+    for row, modules in enumerate(matrix):
+        runs = []
+        col = 0
+        count = len(modules)
+        while col < count:
+            if modules[col]:
+                start = col
+                while col < count and modules[col]:
+                    col += 1
+                runs.append((start, col))
+            else:
+                col += 1
+        next_rects = {}
+        for run in runs:
+            rect = open_rects.pop(run, None)
+            if rect is None:
+                rect = [run[0], row, run[1] - run[0], 0]
+            rect[3] += 1
+            next_rects[run] = rect
+        done.extend(open_rects.values())
+        open_rects = next_rects
+    done.extend(open_rects.values())
+    return done
+
+
+def draw_qr_code(c, payload, x, y, size, level='M', color=None, background=None):
+    """Draw payload as a QR code in a size x size square at x, y, quiet zone included.
+
+    All dark modules are filled as one path of merged rectangles, so the
+    symbol is a single fill operation in the page content.
+    """
+    matrix = qr_matrix(payload, level)
+    count = len(matrix)
+    module = size / (count + 2 * QUIET_ZONE)
+    origin_x = x + QUIET_ZONE * module
+    top = y + size - QUIET_ZONE * module
+    c.saveState()
+    if background is not None:
+        c.setFillColor(background)
+        c.rect(x, y, size, size, fill=1, stroke=0)
+    if color is not None:
+        c.setFillColor(color)
+    path = c.beginPath()
+    for col, row, width, height in module_rectangles(matrix):
+        path.rect(origin_x + col * module, top - (row + height) * module, width * module, height * module)
+    c.drawPath(path, fill=1, stroke=0)
+    c.restoreState()
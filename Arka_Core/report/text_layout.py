@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Arka Report Text Layout
+Cached text measurement, truncation and path wrapping for table cells
+"""
+
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+ELLIPSIS = "..."
+
+# Characters a path may be broken after when it is wrapped onto several lines
+PATH_SEPARATORS = frozenset("\\/._- ")
+
+
+class GlyphWidths:
+    """Per-character advance widths for one font at one size.
+
+    Widths are measured once per character with reportlab's stringWidth and
+    kept, so measuring a string is a dictionary lookup per character instead
+    of a call into the pure-Python metrics code.
+    """
+
+    def __init__(self, font, font_size):
+        self.font = font
+        self.font_size = font_size
+        self._widths = {}
+
+    def char_width(self, ch):
+        width = self._widths.get(ch)
+        if width is None:
+            width = self._widths[ch] = stringWidth(ch, self.font, self.font_size)
+        return width
+
+    def prefix_widths(self, text):
+        """List whose entry i is the width of text[:i]"""
+        return list(accumulate(map(self.char_width, text), initial=0.0))
+
+    def width(self, text):
+        return sum(map(self.char_width, text))
+
+
+@lru_cache(maxsize=None)
+def get_glyph_widths(font, font_size):
+    """Return the shared GlyphWidths cache for a (font, size) pair"""
+    return GlyphWidths(font, font_size)
+
+
+def text_width(text, font, font_size):
+    """Width of text in points, using the cached glyph widths"""
+    return get_glyph_widths(font, font_size).width(text)
+
+
+def _fit_end(prefix, start, max_width):
+    """Largest end such that text[start:end] fits in max_width (binary search)"""
+    return max(bisect_right(prefix, prefix[start] + max_width) - 1, start)
+
+
+def _truncate(text, prefix, start, glyphs, max_width):
+    """text[start:] if it fits, else its longest prefix that fits with an ellipsis"""
+    if prefix[-1] - prefix[start] <= max_width:
+        return text[start:]
+    end = _fit_end(prefix, start, max_width - glyphs.width(ELLIPSIS))
+    return text[start:end] + ELLIPSIS
+
+
+def fit_text(text, font, font_size, max_width):
+    """Truncate text with an ellipsis so that it fits within max_width"""
+    glyphs = get_glyph_widths(font, font_size)
+    return _truncate(text, glyphs.prefix_widths(text), 0, glyphs, max_width)
+
+
+def wrap_text(text, font, font_size, max_width, max_lines, separators=PATH_SEPARATORS):
+    """Split text into at most max_lines lines no wider than max_width.
+
+    Lines are broken after the last separator that fits so that paths wrap at
+    directory and name boundaries; a run without separators is broken where
+    it reaches max_width. If the text still does not fit, the middle of it is
+    dropped: the last line becomes an ellipsis followed by as much of the end
+    of the text as fits, which keeps the file name of a long path visible.
+    """
+    glyphs = get_glyph_widths(font, font_size)
+    prefix = glyphs.prefix_widths(text)
+    total = prefix[-1]
+    lines = []
+    start = 0
+    while len(lines) < max_lines - 1 and total - prefix[start] > max_width:
+        end = _fit_end(prefix, start, max_width)
+        for i in range(end - 1, start, -1):
+            if text[i] in separators:
+                end = i + 1
+                break
+        end = max(end, start + 1)
+        lines.append(text[start:end])
+        start = end
+    if total - prefix[start] <= max_width:
+        lines.append(text[start:])
+    else:
+        # Shortest tail that fits next to the ellipsis (binary search)
+        tail = bisect_left(prefix, total - (max_width - glyphs.width(ELLIPSIS)), start)
+        lines.append(ELLIPSIS + text[tail:])
+    return lines
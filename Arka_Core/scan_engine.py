@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Arka Scan Engine
+Parallel directory walk in which worker threads steal each other's directories, producing drive_info.json file analysis
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import shutil
+import string
+import sys
+import threading
+import time
+from collections import deque
+
+from scan_volume import volume_details
+
+SCANNER_VERSION = "2.3 Parallel Engine"
+
+# File categories of the drive_info.json schema, by lower-case extension
+CATEGORY_EXTENSIONS = {
+    'Documents': ('pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'odt', 'ods', 'odp', 'rtf', 'txt',
+                  'csv', 'md', 'epub', 'pages', 'numbers', 'key'),
+    'Media': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'tif', 'tiff', 'webp', 'heic', 'svg', 'ico', 'raw',
+              'mp3', 'wav', 'flac', 'aac', 'ogg', 'wma', 'm4a', 'mp4', 'mkv', 'avi', 'mov', 'wmv', 'flv',
+              'webm', 'm4v', '3gp'),
+    'Archives': ('zip', 'rar', '7z', 'tar', 'gz', 'tgz', 'bz2', 'xz', 'zst', 'cab', 'iso', 'img', 'dmg'),
+    'Executables': ('exe', 'dll', 'msi', 'sys', 'bat', 'cmd', 'com', 'scr', 'ps1', 'vbs', 'jar', 'apk',
+                    'appx', 'msix', 'so', 'dylib', 'bin'),
+}
+OTHER_CATEGORY = 'Other'
+CATEGORIES = tuple(CATEGORY_EXTENSIONS) + (OTHER_CATEGORY,)
+EXTENSION_CATEGORIES = {ext: cat for cat, exts in CATEGORY_EXTENSIONS.items() for ext in exts}
+
+# File names that suggest personal or confidential content (matched in lower case)
+SENSITIVE_NAME = re.compile(r'passw|passwd|secret|credential|account|token|private|wallet|bank|passport'
+                            r'|aadhaar|aadhar|ssn|pan|salary|tax')
+
+LARGEST_FILES_LIMIT = 100
+SENSITIVE_FILES_LIMIT = 10000
+
+# Threads per scan: directory listings release the GIL, so more threads than
+# cores keep an SSD's queue full; a spinning disk only seeks more with more.
+MAX_THREADS = 32
+HDD_THREADS = 2
+PROGRESS_INTERVAL = 0.5  # seconds between ::progress:: lines
+
+
+def default_threads(media_type=None):
+    """Worker threads for a scan of a volume of media_type ('HDD', 'SSD', ...; None if unknown)"""
+    env = os.environ.get('ARKA_SCAN_THREADS')
+    if env and env.isdigit() and int(env) > 0:
+        return int(env)
+    if (media_type or '').upper() == 'HDD':
+        return HDD_THREADS
+    return max(1, min(MAX_THREADS, (os.cpu_count() or 1) * 2))
+
+
+def file_category(lower_name):
+    """Category of a file by the extension of its lower-case name"""
+    dot = lower_name.rfind('.')
+    return EXTENSION_CATEGORIES.get(lower_name[dot + 1:], OTHER_CATEGORY) if dot >= 0 else OTHER_CATEGORY
+
+
+def human_size(n):
+    """Format a byte count as in drive_info.json ("50.00 GB")"""
+    size = float(n)
+    units = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
+    idx = 0
+    while size >= 1024 and idx < len(units) - 1:
+        size /= 1024.0
+        idx += 1
+    return f"{size:.2f} {units[idx]}"
+
+
+class WorkStealingWalker:
+    """Runs scan_directory(job, state) over a tree of directory jobs on a pool of threads.
+
+    scan_directory lists one directory into its worker's state and returns
+    the jobs for the subdirectories to visit. Each worker keeps the jobs it
+    found in a deque of its own and takes the newest one next, so it goes
+    depth first through its subtree, in the order scan_directory returned
+    the jobs, and its deque stays short. A worker
+    that runs out takes the oldest job of another worker - the shallowest
+    one, usually the root of the largest unexplored subtree - so a big
+    subtree is split between workers as soon as any of them is idle.
+    Listing a directory and stat() release the GIL, which is what lets the
+    threads overlap.
+    """
+
+    def __init__(self, scan_directory, threads=None, make_state=dict):
+        self.scan_directory = scan_directory
+        self.threads = max(1, threads or default_threads())
+        self.queues = [deque() for _ in range(self.threads)]
+        self.states = [make_state() for _ in range(self.threads)]
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._pending = 0  # jobs queued or being scanned
+        self._idle = 0
+        self._stopped = False
+        self._error = None
+
+    def stop(self):
+        """Make the workers finish after the directories they are scanning"""
+        with self._lock:
+            self._stopped = True
+            self._wake.notify_all()
+
+    def run(self, jobs, on_tick=None, interval=PROGRESS_INTERVAL):
+        """Walk from the given jobs until every directory is scanned; returns the worker states.
+
+        on_tick(states) is called from the calling thread every interval
+        seconds while the walk runs.
+        """
+        jobs = list(jobs)
+        self._pending = len(jobs)
+        for i, job in enumerate(jobs):
+            self.queues[i % self.threads].append(job)
+        workers = [threading.Thread(target=self._work, args=(i,), name=f"scan-{i}", daemon=True)
+                   for i in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(interval if on_tick else None)
+                if on_tick and worker.is_alive():
+                    on_tick(self.states)
+        if self._error is not None:
+            raise self._error
+        return self.states
+
+    def _next_job(self, index):
+        try:
+            return self.queues[index].pop()
+        except IndexError:
+            pass
+        count = self.threads
+        for k in range(1, count):
+            try:
+                return self.queues[(index + k) % count].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _work(self, index):
+        own = self.queues[index]
+        state = self.states[index]
+        scan_directory = self.scan_directory
+        lock = self._lock
+        while not self._stopped:
+            job = self._next_job(index)
+            if job is None:
+                with lock:
+                    if self._pending == 0 or self._stopped:
+                        return
+                    self._idle += 1
+                    # Woken when jobs are queued; the timeout covers a wake-up lost to a race
+                    self._wake.wait(0.01)
+                    self._idle -= 1
+                continue
+            try:
+                children = scan_directory(job, state)
+            except BaseException as e:
+                with lock:
+                    self._error = self._error or e
+                    self._stopped = True
+                    self._wake.notify_all()
+                return
+            with lock:
+                # Counted and queued together, so the count never drops to 0 with jobs left
+                self._pending += len(children) - 1
+                if children:
+                    # Reversed, so that the first child is popped first
+                    own.extend(reversed(children))
+                    if self._idle:
+                        self._wake.notify(min(len(children), self._idle))
+                if self._pending == 0:
+                    self._wake.notify_all()
+
+
+class FileAnalysis:
+    """The file_analysis of the directories one worker scanned.
+
+    Workers never share one: each fills its own and the results are
+    combined with merge() when the walk ends. largest_files is a bounded
+    min-heap, so a worker keeps only the files that could still make the
+    overall list.
+    """
+
+    def __init__(self, largest_limit=LARGEST_FILES_LIMIT, sensitive_limit=SENSITIVE_FILES_LIMIT):
+        self.largest_limit = largest_limit
+        self.sensitive_limit = sensitive_limit
+        self.total_files = 0
+        self.total_directories = 0
+        self.skipped_errors = 0
+        self.total_bytes = 0
+        self.categories = {cat: [0, 0] for cat in CATEGORIES}  # category -> [count, size]
+        self.largest = []  # min-heap of (size, path, name)
+        self.sensitive = []  # (path, name, size)
+
+    def add_file(self, path, name, size):
+        lower = name.lower()
+        totals = self.categories[file_category(lower)]
+        totals[0] += 1
+        totals[1] += size
+        self.total_files += 1
+        self.total_bytes += size
+        largest = self.largest
+        if len(largest) < self.largest_limit:
+            heapq.heappush(largest, (size, path, name))
+        elif size > largest[0][0]:
+            heapq.heapreplace(largest, (size, path, name))
+        if SENSITIVE_NAME.search(lower) and len(self.sensitive) < self.sensitive_limit:
+            self.sensitive.append((path, name, size))
+
+    def merge(self, other):
+        """Add another worker's results to this one"""
+        self.total_files += other.total_files
+        self.total_directories += other.total_directories
+        self.skipped_errors += other.skipped_errors
+        self.total_bytes += other.total_bytes
+        for cat, (count, size) in other.categories.items():
+            totals = self.categories.setdefault(cat, [0, 0])
+            totals[0] += count
+            totals[1] += size
+        self.largest = heapq.nlargest(self.largest_limit, self.largest + other.largest)
+        heapq.heapify(self.largest)
+        self.sensitive.extend(other.sensitive)
+        return self
+
+    def to_dict(self):
+        """The file_analysis object of a drive in drive_info.json"""
+        sensitive = sorted(self.sensitive)[:self.sensitive_limit]
+        return {
+            'total_files': self.total_files,
+            'total_directories': self.total_directories,
+            'skipped_errors': self.skipped_errors,
+            'categories': {cat: {'count': count, 'size': size} for cat, (count, size) in self.categories.items()},
+            'largest_files': [{'name': name, 'path': path, 'readable_path': path, 'size': size}
+                              for size, path, name in sorted(self.largest, reverse=True)],
+            'sensitive_files': [{'type': 'SensitiveName', 'name': name, 'path': path, 'readable_path': path,
+                                 'size': size} for path, name, size in sensitive],
+        }
+
+
+def normalize_root(root):
+    """Absolute form of a scan root, the same for a walk and for the index"""
+    root = os.path.abspath(root)
+    drive, rest = os.path.splitdrive(root)
+    return root if rest in ('', os.sep) else root.rstrip(os.sep)
+
+
+def _is_junction(entry):
+    # Windows directory junctions are followed by is_dir(follow_symlinks=False)
+    is_junction = getattr(entry, 'is_junction', None)
+    return bool(is_junction and is_junction())
+
+
+def list_directory(path):
+    """Files and subdirectories of one directory: ([(entry, stat result)], [entry], skipped errors).
+
+    Types come from the directory listing and stat results from
+    DirEntry.stat(), which Windows fills in from the listing too, so a file
+    costs no system call there. Symbolic links and junctions are neither
+    followed nor listed. An unreadable directory or entry counts as a
+    skipped error; OSError is only raised if the directory cannot be opened.
+    """
+    files = []
+    subdirs = []
+    errors = 0
+    with os.scandir(path) as it:
+        while True:
+            try:
+                entry = next(it)
+            except StopIteration:
+                break
+            except OSError:
+                errors += 1
+                break
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _is_junction(entry):
+                        subdirs.append(entry)
+                    continue
+                if entry.is_file(follow_symlinks=False):
+                    files.append((entry, entry.stat(follow_symlinks=False)))
+            except OSError:
+                errors += 1
+    return files, subdirs, errors
+
+
+def scan_directory(path, analysis):
+    """List one directory into analysis; returns the paths of its subdirectories"""
+    try:
+        files, subdirs, errors = list_directory(path)
+    except OSError:
+        analysis.skipped_errors += 1
+        return []
+    add_file = analysis.add_file
+    for entry, st in files:
+        add_file(entry.path, entry.name, st.st_size)
+    analysis.skipped_errors += errors
+    analysis.total_directories += len(subdirs)
+    return [entry.path for entry in subdirs]
+
+
+def scan_tree(root, threads=None, largest_limit=LARGEST_FILES_LIMIT, sensitive_limit=SENSITIVE_FILES_LIMIT,
+              on_progress=None):
+    """Scan everything under root on a pool of threads; returns the merged FileAnalysis.
+
+    on_progress(files, directories, bytes) is called about every
+    PROGRESS_INTERVAL seconds with the running totals.
+    """
+    walker = WorkStealingWalker(scan_directory, threads,
+                                make_state=lambda: FileAnalysis(largest_limit, sensitive_limit))
+    on_tick = None
+    if on_progress is not None:
+        def on_tick(states):
+            on_progress(sum(s.total_files for s in states), sum(s.total_directories for s in states),
+                        sum(s.total_bytes for s in states))
+    states = walker.run([root], on_tick)
+    result = states[0]
+    for state in states[1:]:
+        result.merge(state)
+    return result
+
+
+def drive_entry(root, file_analysis, seconds, threads, volume=None, scan_mode='Filesystem'):
+    """A drives[] entry of drive_info.json for a scanned root; volume is its scan_volume.volume_details()"""
+    volume = volume or {}
+    try:
+        usage = shutil.disk_usage(root)
+        total, used, free = usage.total, usage.used, usage.free
+    except OSError:
+        total = used = free = 0
+    return {
+        'drive': root,
+        'model': volume.get('model'),
+        'filesystem': volume.get('filesystem') or 'Unknown',
+        'total_space_bytes': total,
+        'used_space_bytes': used,
+        'free_space_bytes': free,
+        'total_space_human': human_size(total),
+        'used_space_human': human_size(used),
+        'free_space_human': human_size(free),
+        'usage_percentage': round(used / total * 100, 1) if total else 0.0,
+        'scan_mode': scan_mode,
+        'count_accuracy': 'Exact',
+        'scan_duration_seconds': round(seconds, 1),
+        'scan_threads': threads,
+        'media_type': volume.get('media_type') or 'Unknown',
+        'file_analysis': file_analysis,
+    }
+
+
+def all_drives():
+    """Root of every drive: the drive letters that exist on Windows, / elsewhere"""
+    if os.name == 'nt':
+        return [f"{letter}:\\" for letter in string.ascii_uppercase if os.path.exists(f"{letter}:\\")]
+    return [os.sep]
+
+
+def print_progress(percent, message):
+    """Progress marker parsed by main.js"""
+    print(f"::progress::{int(percent)}::{message}", flush=True)
+
+
+def scan_roots(roots, threads=None, media_type=None, electron=False, use_index=False, index_dir=None,
+               full_rescan=False):
+    """Scan each root in turn; returns the drive_info.json document and each root's unrounded scan seconds.
+
+    With use_index, each root is rescanned through its ScanIndex (see
+    scan_index.py), which only lists the directories that changed since the
+    previous scan.
+    """
+    started = time.perf_counter()
+    drives = []
+    seconds = []
+    share = 100.0 / max(1, len(roots))
+    for i, root in enumerate(map(normalize_root, roots)):
+        root_started = time.perf_counter()
+        volume = volume_details(root)
+        if media_type:
+            volume['media_type'] = media_type
+        # Each drive gets its own default: a spinning disk only seeks more with more threads
+        root_threads = threads or default_threads(volume['media_type'])
+        if use_index:
+            from scan_index import ScanIndex, index_path_for
+            on_progress = None
+            if electron:
+                def on_progress(checked, listed, i=i, root=root):
+                    print_progress(share * i, f"Updating {root}: {checked} folders checked, {listed} changed")
+            with ScanIndex(root, index_path_for(root, index_dir)) as index:
+                incremental = index.has_scan() and not full_rescan
+                index.rescan(root_threads, full=full_rescan, on_progress=on_progress)
+                file_analysis = index.file_analysis()
+            seconds.append(time.perf_counter() - root_started)
+            drives.append(drive_entry(root, file_analysis, seconds[-1], root_threads, volume,
+                                      'Indexed' if incremental else 'Filesystem'))
+            continue
+        on_progress = None
+        if electron:
+            try:
+                used = shutil.disk_usage(root).used
+            except OSError:
+                used = 0
+
+            def on_progress(files, directories, scanned, i=i, used=used, root=root):
+                # Bytes found against the volume's used space; capped, as they may not match
+                done = min(0.99, scanned / used) if used else 0
+                print_progress(share * (i + done), f"Scanning {root}: {files} files in {directories} folders")
+        analysis = scan_tree(root, root_threads, on_progress=on_progress)
+        seconds.append(time.perf_counter() - root_started)
+        drives.append(drive_entry(root, analysis.to_dict(), seconds[-1], root_threads, volume))
+    if electron:
+        print_progress(100, "Scan complete")
+    return {
+        'scanner_version': SCANNER_VERSION,
+        'total_drives': len(drives),
+        'drives': drives,
+        'user_remarks': {},
+        'deletion_report': None,
+        'total_scan_seconds': round(time.perf_counter() - started, 1),
+    }, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Arka parallel drive scanner')
+    roots = parser.add_mutually_exclusive_group(required=True)
+    roots.add_argument('--scan', nargs='+', metavar='ROOT', help='Drives or folders to scan')
+    roots.add_argument('--all-drives', action='store_true', help='Scan every drive')
+    parser.add_argument('--threads', type=int,
+                        help='Worker threads (default: 2 per core up to %d, %d on a hard disk; '
+                        'env ARKA_SCAN_THREADS)' % (MAX_THREADS, HDD_THREADS))
+    parser.add_argument('--media-type', choices=['HDD', 'SSD', 'NVMe', 'Unknown'],
+                        help='Media of the scanned volumes instead of the one detected for each drive')
+    parser.add_argument('--output', default='drive_info.json', help='Where to write the scan results')
+    parser.add_argument('--electron', action='store_true', help='Print ::progress:: markers for main.js')
+    parser.add_argument('--no-index', action='store_true',
+                        help='Walk every directory instead of updating the persistent scan index')
+    parser.add_argument('--full-rescan', action='store_true',
+                        help='List every directory again and rebuild the scan index')
+    parser.add_argument('--index-dir', help='Where scan indexes are kept (default: per-user cache folder)')
+    args = parser.parse_args()
+
+    roots = all_drives() if args.all_drives else args.scan
+    info, seconds = scan_roots(roots, args.threads, args.media_type, args.electron, not args.no_index, args.index_dir,
+                               args.full_rescan)
+    tmp_path = args.output + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=2)
+    os.replace(tmp_path, args.output)
+    for drive, elapsed in zip(info['drives'], seconds):
+        analysis = drive['file_analysis']
+        # The JSON keeps one decimal; the rate uses the unrounded time
+        rate = analysis['total_files'] / elapsed if elapsed else 0
+        print(f"{drive['drive']}: {analysis['total_files']} files, {analysis['total_directories']} folders "
+              f"in {elapsed:.2f}s ({rate:.0f} files/s, {drive['scan_threads']} threads)")
+    print(f"Output: {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""
+Arka Scan Index
+Per-volume SQLite index of directories and files, rescanned incrementally by directory modification time
+"""
+
+import hashlib
+import heapq
+import os
+import pathlib
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from scan_engine import (CATEGORIES, LARGEST_FILES_LIMIT, SENSITIVE_FILES_LIMIT, SENSITIVE_NAME, WorkStealingWalker,
+                         file_category, list_directory, normalize_root)
+
+INDEX_VERSION = 3  # PRAGMA user_version; an index of another version is rebuilt
+
+# A directory changed less than this long before it was listed may change
+# again within the same timestamp (FAT keeps 2-second times); it is listed
+# again on the next scan rather than trusted.
+RACY_NS = 2 * 10 ** 9
+
+WRITE_BATCH = 500  # directory records written per transaction
+
+TRIGRAM = 3  # shortest query the name indexes can narrow down
+SUBTREE_SCAN_FILES = 100000  # a subtree with fewer files is searched by reading its names
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS dirs(
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    lower_name TEXT NOT NULL,  -- name.lower(), which searches compare with as a walk does
+    parent INTEGER,
+    mtime_ns INTEGER NOT NULL DEFAULT -1,  -- -1: found but not listed yet
+    scanned_ns INTEGER NOT NULL DEFAULT 0,
+    file_count INTEGER NOT NULL DEFAULT 0,
+    dir_count INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+CREATE TABLE IF NOT EXISTS dir_categories(
+    dir INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (dir, category)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files(
+    id INTEGER PRIMARY KEY,
+    dir INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    lower_name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    sensitive INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+CREATE INDEX IF NOT EXISTS files_size ON files(size);
+"""
+
+# Trigram indexes of the file and directory names, updated by the index
+# writer with their tables (triggers would make writing them several times
+# slower). FTS5 and its trigram tokenizer need SQLite 3.34; with an older
+# SQLite the index works without them and searches scan the names.
+NAMES_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS file_names USING fts5(name, content='files', content_rowid='id',
+                                                         tokenize='trigram');
+CREATE VIRTUAL TABLE IF NOT EXISTS dir_names USING fts5(name, content='dirs', content_rowid='id',
+                                                        tokenize='trigram');
+"""
+
+
+def default_index_dir():
+    """Per-user index directory (LOCALAPPDATA on Windows, XDG cache elsewhere)"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') \
+        or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'Arka', 'scan_index')
+
+
+def index_path_for(root, directory=None):
+    """Index file of a scan root: readable name of the root plus a hash of its normalised path"""
+    root = normalize_root(root)
+    readable = re.sub(r'[^A-Za-z0-9]+', '_', root).strip('_')[:40] or 'root'
+    digest = hashlib.sha1(os.path.normcase(root).encode('utf-8', 'surrogatepass')).hexdigest()[:10]
+    return os.path.join(directory or default_index_dir(), f"{readable}-{digest}.sqlite")
+
+
+def subtree_range(path):
+    """Bounds (low, high) of the paths strictly below path, for an indexed range query"""
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def like_escape(text):
+    """text with the LIKE wildcards escaped by a backslash"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def like_pattern(text, prefix=False):
+    """LIKE pattern of names containing, or starting with, text"""
+    escaped = like_escape(text)
+    return escaped + '%' if prefix else '%' + escaped + '%'
+
+
+class _Listing:
+    """One directory as listed during a rescan, on its way to the index writer"""
+    __slots__ = ('path', 'mtime_ns', 'scanned_ns', 'files', 'subdirs', 'errors')
+
+    def __init__(self, path, mtime_ns, scanned_ns, files, subdirs, errors):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.scanned_ns = scanned_ns
+        self.files = files  # (name, lower_name, size, mtime_ns, category, sensitive)
+        self.subdirs = subdirs  # paths
+        self.errors = errors
+
+
+class _RescanState:
+    """Counters of one rescan worker"""
+
+    def __init__(self):
+        self.checked = 0  # directories whose mtime was compared
+        self.listed = 0  # directories listed again
+        self.files = 0  # files in the listed directories
+
+
+class RescanStats:
+    """What a rescan had to do: directories checked, listed again and removed, files listed"""
+
+    def __init__(self, states, removed, seconds):
+        self.checked = sum(s.checked for s in states)
+        self.listed = sum(s.listed for s in states)
+        self.files_listed = sum(s.files for s in states)
+        self.removed = removed
+        self.seconds = seconds
+
+    def __repr__(self):
+        return (f"RescanStats(checked={self.checked}, listed={self.listed}, files_listed={self.files_listed}, "
+                f"removed={self.removed}, seconds={self.seconds:.3f})")
+
+
+class ScanIndex:
+    """SQLite index of every directory and file under one scan root.
+
+    Each directory row keeps the modification time it had when it was
+    listed, its file and subdirectory counts and, in dir_categories, the
+    count and size of its files per category; each file row keeps the
+    name, size, modification time, category and sensitive flag. A rescan
+    compares every directory's mtime with the stored one. Only directories
+    whose entries changed (mtime differs) are listed again; for the others
+    the stored rows are kept as they are and only their subdirectories'
+    mtimes are checked, one stat() each. Directories that disappeared are
+    removed with their subtrees. The file_analysis of the root is then
+    aggregated from the stored rows, and search() looks names up in the
+    trigram indexes of the stored file and directory names.
+
+    A directory's mtime does not change when a file in it is rewritten in
+    place, so such size changes are only picked up by a full rescan.
+    """
+
+    def __init__(self, root, path=None, readonly=False):
+        """Open (creating it if needed) the index of root.
+
+        A readonly index is opened without a write lock and without
+        touching the file, for searching; if it is of another version or
+        root, has_scan() is False rather than the index being rebuilt.
+        """
+        self.root = normalize_root(root)
+        self.path = path or index_path_for(self.root)
+        self.readonly = readonly
+        if readonly:
+            self._open_readonly()
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            self._drop_tables()
+        self.db.executescript(SCHEMA)
+        try:
+            self.db.executescript(NAMES_SCHEMA)
+            self.names_indexed = True
+        except sqlite3.OperationalError:
+            self.names_indexed = False
+        self.db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        self.usable = True
+        stored = dict(self.db.execute("SELECT key, value FROM meta"))
+        if os.path.normcase(stored.get('root', self.root)) != os.path.normcase(self.root):
+            self.clear()
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('root', ?)", (self.root,))
+
+    def _open_readonly(self):
+        uri = pathlib.Path(os.path.abspath(self.path)).as_uri() + '?mode=ro'
+        self.db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self.usable = False
+        self.names_indexed = False
+        try:
+            if self.db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+                return
+            stored = dict(self.db.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError:
+            return  # not an index, or one that was never written
+        self.usable = os.path.normcase(stored.get('root', '')) == os.path.normcase(self.root)
+        try:
+            self.db.execute("SELECT rowid FROM file_names LIMIT 0")
+            self.names_indexed = True
+        except sqlite3.OperationalError:
+            pass  # written without FTS5, or read by an SQLite without it
+
+    def _drop_tables(self):
+        tables = self.db.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger') "
+                                 "AND name NOT LIKE 'sqlite_%' ORDER BY type = 'table', sql NOT LIKE 'CREATE VIRTUAL%'"
+                                 ).fetchall()
+        with self.db:
+            for kind, name in tables:
+                try:
+                    self.db.execute(f'DROP {kind.upper()} IF EXISTS "{name}"')
+                except sqlite3.OperationalError:
+                    pass  # shadow table of a virtual table dropped before it
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def clear(self):
+        """Forget every directory and file, so that the next rescan lists them all"""
+        with self.db:
+            for table in ('dirs', 'dir_categories', 'files'):
+                self.db.execute(f"DELETE FROM {table}")
+            if self.names_indexed:
+                for names in ('file_names', 'dir_names'):
+                    self.db.execute(f"INSERT INTO {names}({names}) VALUES ('delete-all')")
+            self.db.execute("DELETE FROM meta WHERE key = 'completed_ns'")
+
+    def has_scan(self):
+        """True if the root has been scanned completely at least once"""
+        if not self.usable:
+            return False
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'completed_ns'").fetchone()
+        return row is not None
+
+    def _load_tree(self):
+        """{path: (mtime_ns, scanned_ns, [child paths])} of the stored directories"""
+        rows = self.db.execute("SELECT id, path, parent, mtime_ns, scanned_ns FROM dirs").fetchall()
+        paths = {row[0]: row[1] for row in rows}
+        tree = {path: (mtime_ns, scanned_ns, []) for _, path, _, mtime_ns, scanned_ns in rows}
+        for _, path, parent, _, _ in rows:
+            if parent in paths:
+                tree[paths[parent]][2].append(path)
+        return tree
+
+    def rescan(self, threads=None, full=False, on_progress=None):
+        """Bring the index up to date with the file system; returns RescanStats.
+
+        full=True lists every directory again. on_progress(checked, listed)
+        is called periodically from the calling thread.
+        """
+        started = time.perf_counter()
+        if full:
+            self.clear()
+        tree = self._load_tree()
+        listings = queue.Queue()
+        writer = _IndexWriter(self.db, self.root, tree, listings, self.names_indexed)
+        writer_thread = threading.Thread(target=writer.run, name="scan-index-writer", daemon=True)
+        writer_thread.start()
+
+        def visit(job, state):
+            path, mtime_ns = job
+            state.checked += 1
+            if mtime_ns is None:
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    # Gone since the parent was listed; removed by the writer
+                    listings.put(_Listing(path, None, 0, (), (), 0))
+                    return []
+            stored = tree.get(path)
+            if stored is not None and stored[0] == mtime_ns and mtime_ns < stored[1] - RACY_NS:
+                # Unchanged: keep its rows, check its subdirectories
+                return [(child, None) for child in stored[2]]
+            scanned_ns = time.time_ns()
+            try:
+                files, subdirs, errors = list_directory(path)
+            except OSError:
+                # Stored as not listed, so that it is tried again next time
+                files, subdirs, errors, mtime_ns = [], [], 1, -1
+            state.listed += 1
+            state.files += len(files)
+            rows = []
+            for entry, st in files:
+                lower = entry.name.lower()
+                rows.append((entry.name, lower, st.st_size, st.st_mtime_ns, file_category(lower),
+                             1 if SENSITIVE_NAME.search(lower) else 0))
+            jobs = []
+            for entry in subdirs:
+                try:
+                    jobs.append((entry.path, entry.stat(follow_symlinks=False).st_mtime_ns))
+                except OSError:
+                    jobs.append((entry.path, None))
+            listings.put(_Listing(path, mtime_ns, scanned_ns, rows, [p for p, _ in jobs], errors))
+            return jobs
+
+        on_tick = None
+        if on_progress is not None:
+            def on_tick(states):
+                on_progress(sum(s.checked for s in states), sum(s.listed for s in states))
+        walker = WorkStealingWalker(visit, threads, make_state=_RescanState)
+        try:
+            states = walker.run([(self.root, None)], on_tick)
+        finally:
+            listings.put(None)
+            writer_thread.join()
+        if writer.error is not None:
+            raise writer.error
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('completed_ns', ?)",
+                            (str(time.time_ns()),))
+        return RescanStats(states, writer.removed, time.perf_counter() - started)
+
+    def _stored_directory(self, path):
+        """The stored form of a folder path written in another case, or None if it is not in the index"""
+        row = self.db.execute("SELECT path FROM dirs WHERE path = ?", (path,)).fetchone() or \
+            self.db.execute("SELECT path FROM dirs WHERE path = ? COLLATE NOCASE LIMIT 1", (path,)).fetchone()
+        return row and row[0]
+
+    def search(self, query, subtree=None):
+        """(path, name, is_dir, size) of the directories, then the files, matching a compiled Query.
+
+        subtree limits the search to the paths below that directory. Every
+        filter becomes a condition of the SQL query, the path pattern last
+        as it is tested in Python. Name and extension terms are compared
+        with the str.lower() names. Name terms of TRIGRAM characters or
+        more are first looked up in the trigram indexes; shorter ones (and
+        every term without FTS5) scan the stored names. An anchored path
+        pattern narrows the search to the folder it starts with. Matches
+        are read from the database as they are consumed, in the same order
+        every time, so a caller can stop or skip ahead at any point.
+        """
+        scope = normalize_root(subtree) if subtree else self.root
+        include_scope = False  # whether the scope folder itself may match
+        directory = query.path and query.path.literal_directory()
+        if directory:
+            directory = self._stored_directory(directory)
+            if directory is None:
+                return
+            if directory == scope or directory.startswith(subtree_range(scope)[0]):
+                include_scope = directory != scope
+                scope = directory
+            elif not scope.startswith(subtree_range(directory)[0]):
+                return
+        low, high = subtree_range(scope)
+        phrases = ['"%s"' % text.replace('"', '""') for text, _ in query.names if len(text) >= TRIGRAM]
+        indexed = self.names_indexed and bool(phrases)
+        if indexed and scope != self.root:
+            # The trigram indexes cover the whole root; below a small folder,
+            # reading its names beats filtering every match by path
+            below = self.db.execute("SELECT COALESCE(SUM(file_count), 0) FROM dirs "
+                                    "WHERE path = ? OR (path >= ? AND path < ?)", (scope, low, high)).fetchone()[0]
+            indexed = below > SUBTREE_SCAN_FILES
+        if query.path is not None:
+            path_matches = query.path.matches
+            self.db.create_function('arka_path_match', 2, lambda directory, name: path_matches(
+                os.path.join(directory, name) if name else directory), deterministic=True)
+
+        within = "(d.path = ? OR (d.path >= ? AND d.path < ?))"
+        searches = []
+        if query.match_dirs:
+            searches.append(('dir_names', 'd', "d.path, d.name, 0", "dirs d ON d.id = n.rowid", "dirs d",
+                             within if include_scope else "d.path >= ? AND d.path < ?", "d.path, ''", True))
+        if query.match_files:
+            searches.append(('file_names', 'f', "d.path, f.name, f.size",
+                             "files f ON f.id = n.rowid JOIN dirs d ON d.id = f.dir",
+                             "dirs d CROSS JOIN files f ON f.dir = d.id", within, "d.path, f.name", False))
+        for names, alias, columns, by_name, by_dir, scope_sql, path_args, is_dir in searches:
+            where = [scope_sql]
+            args = [scope, low, high] if scope_sql == within else [low, high]
+            if not is_dir:
+                if query.exts:
+                    where.append("(%s)" % " OR ".join(["f.lower_name LIKE ? ESCAPE '\\'"] * len(query.exts)))
+                    args.extend('%' + like_escape('.' + ext) for ext in query.exts)
+                for op, value in query.sizes:
+                    where.append(f"f.size {op} ?")
+                    args.append(value)
+            for op, value in query.mtimes:
+                where.append(f"{alias}.mtime_ns {op} ?")
+                args.append(value)
+            for text, prefix in query.names:
+                # On the str.lower() names, as in a walk: LIKE ignores the case of ASCII letters only
+                where.append(f"{alias}.lower_name LIKE ? ESCAPE '\\'")
+                args.append(like_pattern(text, prefix))
+            if query.path is not None:
+                literal = query.path.longest_literal()
+                if literal:
+                    # Cheap test in SQL before the pattern is matched in Python
+                    full_path = "d.path" if is_dir else "d.path || ? || f.name"
+                    where.append(f"{full_path} LIKE ? ESCAPE '\\'")
+                    args.extend(([] if is_dir else [os.sep]) + ['%' + like_escape(literal) + '%'])
+                where.append(f"arka_path_match({path_args})")
+            if indexed:
+                # The phrases of a trigram index narrow the names down to those containing the long terms
+                sql = f"SELECT {columns} FROM {names} n CROSS JOIN {by_name} WHERE {names} MATCH ? AND "
+                args.insert(0, " AND ".join(phrases))
+            else:
+                sql = f"SELECT {columns} FROM {by_dir} WHERE "
+            for path, name, size in self.db.execute(sql + " AND ".join(where), args):
+                yield (path, name, True, 0) if is_dir else (os.path.join(path, name), name, False, size)
+
+    def file_analysis(self, largest_limit=LARGEST_FILES_LIMIT, sensitive_limit=SENSITIVE_FILES_LIMIT):
+        """The root's file_analysis (drive_info.json schema) aggregated from the index"""
+        db = self.db
+        total_files, directories, errors = db.execute(
+            "SELECT COALESCE(SUM(file_count), 0), COUNT(*), COALESCE(SUM(errors), 0) FROM dirs").fetchone()
+        categories = {cat: {'count': 0, 'size': 0} for cat in CATEGORIES}
+        for cat, count, size in db.execute(
+                "SELECT category, SUM(count), SUM(size) FROM dir_categories GROUP BY category"):
+            categories[cat] = {'count': count, 'size': size}
+        largest = []
+        threshold = db.execute("SELECT size FROM files ORDER BY size DESC LIMIT 1 OFFSET ?",
+                               (largest_limit - 1,)).fetchone()
+        rows = db.execute("SELECT d.path, f.name, f.size FROM files f JOIN dirs d ON d.id = f.dir "
+                          "WHERE f.size >= ?", (threshold[0] if threshold else 0,))
+        # Ties are ordered by full path, as in a scan without the index
+        largest = heapq.nlargest(largest_limit, ((size, os.path.join(path, name), name) for path, name, size in rows))
+        sensitive = sorted((os.path.join(path, name), name, size) for path, name, size in db.execute(
+            "SELECT d.path, f.name, f.size FROM files f JOIN dirs d ON d.id = f.dir WHERE f.sensitive"))
+        return {
+            'total_files': total_files,
+            'total_directories': max(0, directories - 1),
+            'skipped_errors': errors,
+            'categories': categories,
+            'largest_files': [{'name': name, 'path': path, 'readable_path': path, 'size': size}
+                              for size, path, name in largest],
+            'sensitive_files': [{'type': 'SensitiveName', 'name': name, 'path': path, 'readable_path': path,
+                                 'size': size} for path, name, size in sensitive[:sensitive_limit]],
+        }
+
+
+class _IndexWriter:
+    """Applies the listings of a rescan to the index from a thread of its own.
+
+    SQLite connections cannot be written from several threads at once, so
+    the workers only list directories and this writer turns each listing
+    into rows, WRITE_BATCH listings per transaction. A listing's
+    subdirectories are inserted as not-yet-listed rows straight away, so an
+    interrupted rescan still finds them next time.
+    """
+
+    def __init__(self, db, root, tree, listings, names_indexed):
+        self.db = db
+        self.root = root
+        self.tree = tree
+        self.listings = listings
+        self.names_indexed = names_indexed
+        self.ids = {}  # path -> dirs.id, filled as needed
+        self.removed = 0
+        self.error = None
+
+    def run(self):
+        try:
+            batch = []
+            while True:
+                listing = self.listings.get()
+                if listing is not None:
+                    batch.append(listing)
+                if batch and (listing is None or len(batch) >= WRITE_BATCH or self.listings.empty()):
+                    with self.db:
+                        for item in batch:
+                            self._apply(item)
+                    batch = []
+                if listing is None:
+                    return
+        except BaseException as e:
+            self.error = e
+            # Keep draining so that the walk is never blocked
+            while self.listings.get() is not None:
+                pass
+
+    def _dir_id(self, path, parent_id=None):
+        dir_id = self.ids.get(path)
+        if dir_id is None:
+            row = self.db.execute("SELECT id FROM dirs WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                name = os.path.basename(path)
+                dir_id = self.db.execute("INSERT INTO dirs(path, name, lower_name, parent) VALUES (?, ?, ?, ?)",
+                                         (path, name, name.lower(), parent_id)).lastrowid
+                if self.names_indexed:
+                    self.db.execute("INSERT INTO dir_names(rowid, name) VALUES (?, ?)", (dir_id, name))
+            else:
+                dir_id = row[0]
+            self.ids[path] = dir_id
+        return dir_id
+
+    def _remove_subtree(self, path):
+        low, high = subtree_range(path)
+        where = "(path = ? OR (path >= ? AND path < ?))"
+        db = self.db
+        if self.names_indexed:
+            db.execute("INSERT INTO file_names(file_names, rowid, name) SELECT 'delete', id, name FROM files "
+                       f"WHERE dir IN (SELECT id FROM dirs WHERE {where})", (path, low, high))
+            db.execute("INSERT INTO dir_names(dir_names, rowid, name) SELECT 'delete', id, name FROM dirs "
+                       f"WHERE {where}", (path, low, high))
+        db.execute(f"DELETE FROM files WHERE dir IN (SELECT id FROM dirs WHERE {where})", (path, low, high))
+        db.execute(f"DELETE FROM dir_categories WHERE dir IN (SELECT id FROM dirs WHERE {where})", (path, low, high))
+        self.removed += db.execute(f"DELETE FROM dirs WHERE {where}", (path, low, high)).rowcount
+        self.ids.pop(path, None)
+
+    def _apply(self, listing):
+        db = self.db
+        path = listing.path
+        if listing.mtime_ns is None:
+            self._remove_subtree(path)
+            return
+        dir_id = self._dir_id(path)
+        db.execute("UPDATE dirs SET mtime_ns = ?, scanned_ns = ?, file_count = ?, dir_count = ?, errors = ? "
+                   "WHERE id = ?", (listing.mtime_ns, listing.scanned_ns, len(listing.files), len(listing.subdirs),
+                                    listing.errors, dir_id))
+        if self.names_indexed:
+            db.execute("INSERT INTO file_names(file_names, rowid, name) SELECT 'delete', id, name FROM files "
+                       "WHERE dir = ?", (dir_id,))
+        db.execute("DELETE FROM files WHERE dir = ?", (dir_id,))
+        db.executemany("INSERT INTO files(dir, name, lower_name, size, mtime_ns, category, sensitive) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       [(dir_id,) + row for row in listing.files])
+        if self.names_indexed:
+            db.execute("INSERT INTO file_names(rowid, name) SELECT id, name FROM files WHERE dir = ?", (dir_id,))
+        totals = {}
+        for _, _, size, _, category, _ in listing.files:
+            count_size = totals.setdefault(category, [0, 0])
+            count_size[0] += 1
+            count_size[1] += size
+        db.execute("DELETE FROM dir_categories WHERE dir = ?", (dir_id,))
+        db.executemany("INSERT INTO dir_categories(dir, category, count, size) VALUES (?, ?, ?, ?)",
+                       [(dir_id, cat, count, size) for cat, (count, size) in totals.items()])
+        # Subdirectories that are gone, then placeholders for the new ones
+        stored = self.tree.get(path)
+        if stored is not None:
+            current = set(listing.subdirs)
+            for child in stored[2]:
+                if child not in current:
+                    self._remove_subtree(child)
+        for child in listing.subdirs:
+            self._dir_id(child, dir_id)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Arka Scan Query
+Search box query language: name text plus ext:, size, modified, path: and type: filters, compiled into one predicate
+"""
+
+import operator
+import os
+import re
+from datetime import datetime, timedelta
+
+# Units of size filters, 1024-based as in drive_info.json ("100MB", "1.5 GB")
+SIZE_UNITS = {'': 1, 'b': 1, 'k': 1 << 10, 'kb': 1 << 10, 'm': 1 << 20, 'mb': 1 << 20, 'g': 1 << 30, 'gb': 1 << 30,
+              't': 1 << 40, 'tb': 1 << 40}
+
+COMPARISONS = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge, '=': operator.eq}
+
+FILTER_KEYS = ('name', 'ext', 'size', 'modified', 'path', 'type')
+
+_TOKEN = re.compile(r'(?:[^\s"]+|"[^"]*")+')
+_FILTER = re.compile(r'^(?P<key>[a-z]+)(?P<op><=|>=|<|>|=|:)(?P<value>.*)$', re.I)
+_COMPARISON = re.compile(r'^(?P<op><=|>=|<|>|=)?(?P<value>.+)$')
+_SIZE = re.compile(r'^(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>[a-z]*)$', re.I)
+_ANCHORED = re.compile(r'^(?:[\\/]|[A-Za-z]:)')
+_SEPARATORS = re.compile(r'[\\/]+')
+
+
+class QueryError(ValueError):
+    """A search query that cannot be compiled"""
+
+
+def glob_regex(part):
+    """Regex source of one path component pattern: * is any run of characters and ? one character, within it"""
+    return re.escape(part).replace(r'\*', r'[^\\/]*').replace(r'\?', r'[^\\/]')
+
+
+class PathPattern:
+    """path: filter - folder names separated by \\ or /, each of which may contain * and ?.
+
+    The pattern matches a run of whole components anywhere in a path
+    ("Users\\*\\Downloads" matches C:\\Users\\bob\\Downloads\\a.pdf), or from
+    the start of it when it begins with a drive or a separator. Matching
+    ignores case.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.anchored = bool(_ANCHORED.match(pattern))
+        self.parts = [part for part in _SEPARATORS.split(pattern) if part]
+        if not self.parts:
+            raise QueryError("empty path: filter")
+        body = r'[\\/]+'.join(glob_regex(part) for part in self.parts)
+        start = r'^[\\/]*' if self.anchored else r'(?:^|[\\/])'
+        self.regex = re.compile(start + body + r'(?=$|[\\/])', re.I)
+        self.part_regexes = [re.compile(glob_regex(part) + '$', re.I) for part in self.parts]
+
+    def matches(self, path):
+        return self.regex.search(path) is not None
+
+    def can_descend(self, directory):
+        """False if nothing below directory can match: its components already differ from an anchored pattern"""
+        if not self.anchored:
+            return True
+        parts = self.part_regexes
+        for i, name in enumerate(part for part in _SEPARATORS.split(directory) if part):
+            if i >= len(parts):
+                return True
+            if not parts[i].match(name):
+                return False
+        return True
+
+    def longest_literal(self):
+        """Longest text without wildcards that every matching path contains"""
+        return max((chunk for part in self.parts for chunk in re.split(r'[*?]', part)), key=len)
+
+    def literal_directory(self):
+        """The folder an anchored pattern starts with, up to its first wildcard (None if there is none).
+
+        The last component is left out, as it may name a file.
+        """
+        if not self.anchored:
+            return None
+        literal = []
+        for part in self.parts[:-1]:
+            if '*' in part or '?' in part:
+                break
+            literal.append(part)
+        if not literal:
+            return None
+        if literal[0].endswith(':'):
+            return literal[0] + os.sep + os.sep.join(literal[1:])
+        return os.sep + os.sep.join(literal)
+
+
+def parse_size(text):
+    match = _SIZE.match(text.strip())
+    unit = match and SIZE_UNITS.get(match.group('unit').lower())
+    if unit is None:
+        raise QueryError(f"invalid size {text!r} (use e.g. 100MB)")
+    return int(float(match.group('number')) * unit)
+
+
+def parse_date(text):
+    """(start, end) in nanoseconds since the epoch of a local date (the whole day) or date and time"""
+    try:
+        moment = datetime.fromisoformat(text.strip())
+    except ValueError:
+        raise QueryError(f"invalid date {text!r} (use e.g. 2023-01-01)") from None
+    start = int(moment.timestamp() * 1e9)
+    if len(text.strip()) <= 10:
+        return start, int((moment + timedelta(days=1)).timestamp() * 1e9)
+    return start, start + 1
+
+
+class Query:
+    """A compiled search query.
+
+    Terms are separated by spaces and must all hold; double quotes keep
+    spaces in a term:
+
+        report              name contains "report" (name:report is the same)
+        report*             name starts with "report"
+        ext:pdf,docx        extension is one of these
+        size>100MB          size compared with <, <=, >, >= or = (B, KB, MB, GB, TB)
+        modified<2023-01-01 last modified before that day (or <=, >, >=, = a day)
+        path:Users\\*\\Downloads
+                            full path contains these folders (see PathPattern)
+        type:file           only files, or type:dir only folders
+
+    Matching ignores case. ext: and size filters only match files.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.names = []  # (lower-case text, prefix)
+        self.exts = ()  # lower-case extensions without the dot
+        self.sizes = []  # (comparison, bytes)
+        self.mtimes = []  # (comparison, nanoseconds)
+        self.path = None
+        self.kind = None  # 'file', 'dir' or None for both
+        for token in _TOKEN.findall(text or ''):
+            self._add_term(token.replace('"', ''))
+
+    def _add_term(self, token):
+        match = _FILTER.match(token)
+        key = match and match.group('key').lower()
+        if key not in FILTER_KEYS or (match.group('op') != ':' and key not in ('size', 'modified')):
+            self._add_name(token)
+            return
+        op, value = match.group('op'), match.group('value')
+        if op == ':' and key in ('size', 'modified'):
+            comparison = _COMPARISON.match(value)
+            if comparison is None:
+                raise QueryError(f"missing value in {token!r}")
+            op, value = comparison.group('op') or '=', comparison.group('value')
+        if not value:
+            raise QueryError(f"missing value in {token!r}")
+        if key == 'name':
+            self._add_name(value)
+        elif key == 'ext':
+            exts = tuple(e.lower().lstrip('*').lstrip('.') for e in re.split(r'[,;]', value))
+            self.exts = tuple(e for e in exts if e)
+            if not self.exts:
+                raise QueryError(f"missing extension in {token!r}")
+        elif key == 'size':
+            self.sizes.append((op, parse_size(value)))
+        elif key == 'modified':
+            start, end = parse_date(value)
+            # A day: before it, up to its end, after it or within it
+            bounds = {'<': [('<', start)], '<=': [('<', end)], '>': [('>=', end)], '>=': [('>=', start)],
+                      '=': [('>=', start), ('<', end)]}
+            self.mtimes.extend(bounds[op])
+        elif key == 'path':
+            self.path = PathPattern(value)
+        else:
+            kind = value.lower()
+            if kind not in ('file', 'dir', 'folder'):
+                raise QueryError(f"type: must be file or dir, not {value!r}")
+            self.kind = 'dir' if kind == 'folder' else kind
+
+    def _add_name(self, text):
+        prefix = len(text) > 1 and text.endswith('*')
+        text = text.rstrip('*') if prefix else text
+        if text:
+            self.names.append((text.lower(), prefix))
+
+    def is_empty(self):
+        return not (self.names or self.exts or self.sizes or self.mtimes or self.path or self.kind)
+
+    @property
+    def match_files(self):
+        return self.kind != 'dir'
+
+    @property
+    def match_dirs(self):
+        return self.kind != 'file' and not self.exts and not self.sizes
+
+    def file_predicate(self):
+        """test(lower_name, path, size, mtime_ns) of the files that match.
+
+        The tests run cheapest first - extension, size, date, name, then the
+        path pattern - and stop at the first that fails.
+        """
+        tests = []
+        if self.exts:
+            suffixes = tuple('.' + ext for ext in self.exts)
+            tests.append(lambda lower, path, size, mtime: lower.endswith(suffixes))
+        for op, value in self.sizes:
+            compare = COMPARISONS[op]
+            tests.append(lambda lower, path, size, mtime, compare=compare, value=value: compare(size, value))
+        tests.extend(self._common_tests())
+        return _all(tests)
+
+    def dir_predicate(self):
+        """test(lower_name, path, size, mtime_ns) of the folders that match, or None if no folder can"""
+        if not self.match_dirs:
+            return None
+        return _all(list(self._common_tests()))
+
+    def _common_tests(self):
+        for op, value in self.mtimes:
+            compare = COMPARISONS[op]
+            yield lambda lower, path, size, mtime, compare=compare, value=value: compare(mtime, value)
+        for text, prefix in self.names:
+            if prefix:
+                yield lambda lower, path, size, mtime, text=text: lower.startswith(text)
+            else:
+                yield lambda lower, path, size, mtime, text=text: text in lower
+        if self.path is not None:
+            matches = self.path.matches
+            yield lambda lower, path, size, mtime: matches(path)
+
+    def can_descend(self, directory):
+        """False if no file or folder below directory can match"""
+        return self.path is None or self.path.can_descend(directory)
+
+
+def _all(tests):
+    if not tests:
+        return lambda lower, path, size, mtime: True
+    if len(tests) == 1:
+        return tests[0]
+
+    def test(lower, path, size, mtime):
+        for t in tests:
+            if not t(lower, path, size, mtime):
+                return False
+        return True
+    return test
+
+
+def compile_query(text):
+    """Compile a search box query; raises QueryError if it is malformed"""
+    return Query(text)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Arka Scan Search
+File name search answered from the scan index, with a live walk of the drive when there is none
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from itertools import islice
+
+from scan_engine import WorkStealingWalker, list_directory, normalize_root
+from scan_index import ScanIndex, index_path_for
+from scan_query import QueryError, compile_query
+
+SEARCH_LIMIT = 5000  # results of one search unless --limit says otherwise
+WALK_AHEAD = 256  # folders a live walk lists before their matches are read; workers wait beyond it
+
+
+def find_index(root, index_dir=None):
+    """Path of the scan index covering root - its own or a parent folder's - or None if there is none"""
+    path = normalize_root(root)
+    while True:
+        candidate = index_path_for(path, index_dir)
+        if os.path.exists(candidate):
+            return candidate, path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None, None
+        path = parent
+
+
+def result_entry(path, name, is_dir, size):
+    """A results[] entry of the search output"""
+    return {
+        'name': name,
+        'path': path,
+        'readable_path': path,
+        'is_dir': is_dir,
+        'size': size,
+        'physical_location': None,
+    }
+
+
+def index_matches(index, root, query):
+    """Matches from an open scan index, closing it once they are consumed"""
+    with index:
+        for match in index.search(query, subtree=root):
+            yield result_entry(*match)
+
+
+def live_matches(root, query, threads=None):
+    """Matches found by walking root, for a drive that has not been indexed.
+
+    The walk runs in the background on threads workers (default_threads()
+    by default); closing the generator stops it. Folders that the query's
+    path pattern rules out are not entered. Matches are yielded depth
+    first in listing order, the order in which each worker walks its own
+    part of the tree, so a folder's matches are kept until those of the
+    folders before it have been yielded. The order is the same whatever
+    the number of threads, and pages line up from one call to the next.
+    Once WALK_AHEAD folders are kept, the workers wait for the reader, except
+    for the folder it is waiting for.
+    """
+    listed = {}  # folder: (matches in it, subfolders to walk), until yielded
+    done = threading.Condition()
+    wanted = [None]  # the folder whose matches are read next
+    finished = []
+    closed = []
+    errors = []
+    file_matches = query.file_predicate() if query.match_files else None
+    dir_matches = query.dir_predicate()
+    dir_mtimes = dir_matches is not None and bool(query.mtimes)
+    can_descend = query.can_descend
+
+    def visit(path, state):
+        matches = []
+        children = []
+        try:
+            files, subdirs, _ = list_directory(path)
+        except OSError:
+            files = subdirs = ()
+        for entry in subdirs:
+            if not can_descend(entry.path):
+                continue
+            children.append(entry.path)
+            if dir_matches is not None:
+                try:
+                    mtime = entry.stat(follow_symlinks=False).st_mtime_ns if dir_mtimes else 0
+                except OSError:
+                    continue
+                if dir_matches(entry.name.lower(), entry.path, 0, mtime):
+                    matches.append(result_entry(entry.path, entry.name, True, 0))
+        if file_matches is not None:
+            for entry, st in files:
+                if file_matches(entry.name.lower(), entry.path, st.st_size, st.st_mtime_ns):
+                    matches.append(result_entry(entry.path, entry.name, False, st.st_size))
+        with done:
+            while len(listed) >= WALK_AHEAD and path != wanted[0] and not closed:
+                done.wait()
+            listed[path] = (matches, children)
+            done.notify_all()
+        return children
+
+    walker = WorkStealingWalker(visit, threads)
+    root = normalize_root(root)
+
+    def walk():
+        try:
+            if can_descend(root):
+                walker.run([root])
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            with done:
+                finished.append(True)
+                done.notify_all()
+
+    thread = threading.Thread(target=walk, name="search-walk", daemon=True)
+    thread.start()
+    try:
+        folders = [root]
+        while folders:
+            path = folders.pop()
+            with done:
+                wanted[0] = path
+                done.notify_all()
+                while path not in listed and not finished:
+                    done.wait()
+                matches, children = listed.pop(path, ((), ()))
+                done.notify_all()
+            yield from matches
+            folders.extend(reversed(children))
+    finally:
+        walker.stop()
+        with done:
+            closed.append(True)
+            done.notify_all()
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def iter_matches(root, query, index_dir=None, threads=None):
+    """(source, matches) for query under root: 'index' or 'walk' and an iterator of results[] entries.
+
+    query is the search box text (see scan_query.Query); QueryError is
+    raised if it is malformed.
+
+    The scan index covering root is used if it holds a complete scan;
+    otherwise root is walked (see live_matches).
+    """
+    query = compile_query(query)
+    if query.is_empty():
+        return 'none', iter(())
+    index_path, indexed_root = find_index(root, index_dir)
+    if index_path is not None:
+        index = ScanIndex(indexed_root, index_path, readonly=True)
+        if index.has_scan():
+            return 'index', index_matches(index, root, query)
+        index.close()
+    return 'walk', live_matches(root, query, threads)
+
+
+def search_page(root, query, index_dir=None, limit=SEARCH_LIMIT, offset=0, threads=None):
+    """(source, results, more) for one page of matches: limit results after the first offset.
+
+    Only one match past the page is looked at, to tell whether there are
+    more; closing the iterator then stops the index query or the walk.
+    """
+    source, matches = iter_matches(root, query, index_dir, threads)
+    try:
+        page = list(islice(matches, offset, offset + limit + 1))
+    finally:
+        close = getattr(matches, 'close', None)
+        if close:
+            close()
+    return source, page[:limit], len(page) > limit
+
+
+def search(root, query, index_dir=None, limit=SEARCH_LIMIT, offset=0, threads=None):
+    """The search output for query under root: {'results': [...], 'source': 'index' or 'walk', 'more': bool}"""
+    source, results, more = search_page(root, query, index_dir, limit, offset, threads)
+    return {'results': results, 'source': source, 'more': more}
+
+
+def stream_search(root, query, out, index_dir=None, limit=SEARCH_LIMIT, offset=0, threads=None):
+    """Write one JSON line per match to out as it is found, then a summary line; returns the count.
+
+    The summary is {"done": true, "count": n, "more": bool, "source": ...}.
+    The search stops as soon as the page is full.
+    """
+    source, matches = iter_matches(root, query, index_dir, threads)
+    count = 0
+    more = False
+    try:
+        for entry in islice(matches, offset, offset + limit + 1):
+            if count == limit:
+                more = True
+                break
+            out.write(json.dumps(entry) + '\n')
+            out.flush()
+            count += 1
+    finally:
+        close = getattr(matches, 'close', None)
+        if close:
+            close()
+    out.write(json.dumps({'done': True, 'count': count, 'more': more, 'source': source}) + '\n')
+    out.flush()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Arka file name search')
+    parser.add_argument('--search', nargs=2, metavar=('ROOT', 'QUERY'), required=True,
+                        help='Folder to search and the query: name text ("text*" for a prefix) and filters such as '
+                        'ext:pdf size>100MB modified<2023-01-01 path:Users\\*\\Downloads type:file')
+    parser.add_argument('--limit', type=int, default=SEARCH_LIMIT, help='Most results to return')
+    parser.add_argument('--offset', type=int, default=0, help='Matches to skip before the first result')
+    parser.add_argument('--jsonl', action='store_true',
+                        help='Print each result as a JSON line as soon as it is found, then a summary line')
+    parser.add_argument('--index-dir', help='Where scan indexes are kept (default: per-user cache folder)')
+    parser.add_argument('--threads', type=int,
+                        help='Worker threads of a live walk (default: 2 per core, as for a scan; env '
+                        'ARKA_SCAN_THREADS)')
+    args = parser.parse_args()
+    if args.limit < 0 or args.offset < 0:
+        parser.error('--limit and --offset cannot be negative')
+
+    root, query = args.search
+    try:
+        if args.jsonl:
+            stream_search(root, query, sys.stdout, args.index_dir, args.limit, args.offset, args.threads)
+            return
+        json.dump(search(root, query, args.index_dir, args.limit, args.offset, args.threads), sys.stdout)
+        sys.stdout.write('\n')
+    except QueryError as e:
+        print(f"Invalid search: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
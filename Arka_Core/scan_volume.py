@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Arka Scan Volume
+Model, file system and media type of the drive a scan root is on, for the drives[] entries of drive_info.json
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+
+POWERSHELL_TIMEOUT = 20  # seconds; Get-PhysicalDisk can be slow the first time
+
+# Disk, partition and physical disk of a drive letter; BusType tells NVMe from other SSDs
+_WINDOWS_DISK = ("$d = Get-Partition -DriveLetter {letter} -ErrorAction Stop | Get-Disk; "
+                 "$p = Get-PhysicalDisk | Where-Object DeviceId -eq $d.Number; "
+                 "[pscustomobject]@{{model = $d.FriendlyName; bus = [string]$d.BusType; "
+                 "media = [string]$p.MediaType}} | ConvertTo-Json -Compress")
+
+_OCTAL = re.compile(r'\\([0-7]{3})')
+
+
+def volume_details(root):
+    """{'model', 'filesystem', 'media_type'} of the drive root is on; a value is None if it cannot be found.
+
+    media_type is 'HDD', 'SSD' or 'NVMe'.
+    """
+    details = {'model': None, 'filesystem': None, 'media_type': None}
+    try:
+        if os.name == 'nt':
+            details.update(_windows_details(root))
+        elif sys.platform.startswith('linux'):
+            details.update(_linux_details(root))
+    except (OSError, ValueError, subprocess.SubprocessError):
+        pass
+    return details
+
+
+def _media_type(bus, media):
+    if (bus or '').upper() == 'NVME':
+        return 'NVMe'
+    return media if media in ('HDD', 'SSD') else None
+
+
+def _windows_details(root):
+    import ctypes
+    drive = os.path.splitdrive(os.path.abspath(root))[0]
+    details = {}
+    name = ctypes.create_unicode_buffer(261)
+    if ctypes.windll.kernel32.GetVolumeInformationW(drive + '\\', None, 0, None, None, None, name, len(name)):
+        details['filesystem'] = name.value or None
+    letter = drive[:1]
+    if len(drive) == 2 and letter.isalpha():
+        result = subprocess.run(['powershell', '-NoProfile', '-NonInteractive', '-Command',
+                                 _WINDOWS_DISK.format(letter=letter)],
+                                capture_output=True, text=True, timeout=POWERSHELL_TIMEOUT,
+                                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        if result.returncode == 0 and result.stdout.strip():
+            disk = json.loads(result.stdout)
+            details['model'] = (disk.get('model') or '').strip() or None
+            details['media_type'] = _media_type(disk.get('bus'), disk.get('media'))
+    return details
+
+
+def _read(path):
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _mount_of(path):
+    """(device, file system) of the mount that path is on, from /proc/self/mounts"""
+    best = ('', None, None)
+    with open('/proc/self/mounts', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 3:
+                continue
+            # Spaces, tabs and backslashes are escaped as octal (\040)
+            device, mount, fstype = (_OCTAL.sub(lambda m: chr(int(m.group(1), 8)), field) for field in fields[:3])
+            prefix = mount.rstrip('/') + '/'
+            if (path == mount or path.startswith(prefix)) and len(mount) >= len(best[0]):
+                best = (mount, device, fstype)
+    return best[1], best[2]
+
+
+def _linux_disk(device):
+    """Block device name of the whole disk under a partition, LVM or dm-crypt device (None if not a disk)"""
+    if not device or not device.startswith('/dev/'):
+        return None
+    name = os.path.basename(os.path.realpath(device))
+    for _ in range(8):
+        block = os.path.realpath(os.path.join('/sys/class/block', name))
+        if not os.path.exists(block):
+            return None
+        if os.path.exists(os.path.join(block, 'partition')):
+            name = os.path.basename(os.path.dirname(block))
+            continue
+        slaves_dir = os.path.join(block, 'slaves')
+        slaves = sorted(os.listdir(slaves_dir)) if os.path.isdir(slaves_dir) else []
+        if not slaves:
+            return name
+        name = slaves[0]
+    return None
+
+
+def _linux_details(root):
+    device, fstype = _mount_of(os.path.realpath(root))
+    details = {'filesystem': fstype}
+    disk = _linux_disk(device)
+    if disk is None:
+        return details
+    sys_block = os.path.join('/sys/block', disk)
+    details['model'] = _read(os.path.join(sys_block, 'device', 'model')) or None
+    rotational = _read(os.path.join(sys_block, 'queue', 'rotational'))
+    media = {'1': 'HDD', '0': 'SSD'}.get(rotational)
+    details['media_type'] = _media_type('NVMe' if disk.startswith('nvme') else None, media)
+    return details
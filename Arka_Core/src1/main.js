@@ -175,44 +175,69 @@ app.whenReady().then(async () => {
   if (ok) createWindow();
 });
 
-// IPC handler for searching files on a drive
-ipcMain.handle('search-files', async (_evt, { root, query }) => {
+// IPC handler for searching files on a drive.
+// scan_search.py prints one JSON line per match as soon as it is found and a
+// {"done": true, ...} summary line last; matches are forwarded to the
+// renderer as 'search-results' events while the search runs.
+const SEARCH_PAGE_SIZE = 200;
+ipcMain.handle('search-files', async (_evt, { root, query, limit, offset }) => {
   try {
-    const pythonPath = getPythonScriptPath();
+    const pythonPath = getSearchScriptPath();
     const workingDir = getWorkingDirectory();
     if (!fs.existsSync(pythonPath)) {
       return { success: false, error: `Python script not found at: ${pythonPath}` };
     }
-    const args = [pythonPath, '--search', root, query || ''];
+    const pageSize = Number.isInteger(limit) && limit > 0 ? limit : SEARCH_PAGE_SIZE;
+    const skip = Number.isInteger(offset) && offset > 0 ? offset : 0;
+    const args = [pythonPath, '--search', root, query || '', '--jsonl', '--limit', String(pageSize), '--offset', String(skip)];
     console.log('[Arka] search-files spawn', { args, cwd: workingDir });
     const pythonExe = getPythonExecutablePath();
     const proc = spawn(pythonExe, args, {
       cwd: workingDir,
       env: { ...process.env, PYTHONIOENCODING: 'utf-8' }
     });
-    let stdout = '';
+    const results = [];
+    let summary = null;
+    let pending = '';
     let stderr = '';
-    proc.stdout.on('data', d => stdout += d.toString());
+    proc.stdout.setEncoding('utf8');
+    proc.stdout.on('data', chunk => {
+      const lines = (pending + chunk).split(/\r?\n/);
+      pending = lines.pop();
+      const batch = [];
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        try {
+          const record = JSON.parse(line);
+          if (record.done) {
+            summary = record;
+          } else {
+            results.push(record);
+            batch.push(record);
+          }
+        } catch (e) {
+          console.log('[Arka] search-files unparsed line', line);
+        }
+      }
+      if (batch.length && mainWindow) {
+        mainWindow.webContents.send('search-results', { root, query, offset: skip, results: batch });
+      }
+    });
     proc.stderr.on('data', d => stderr += d.toString());
     return await new Promise((resolve) => {
+      proc.on('error', e => resolve({ success: false, error: e.message }));
       proc.on('close', code => {
         try {
           // Write debug artifacts
-          fs.writeFileSync(path.join(workingDir, 'results.json'), stdout || '');
+          fs.writeFileSync(path.join(workingDir, 'results.json'), JSON.stringify({ results, ...(summary || {}) }));
           fs.writeFileSync(path.join(workingDir, 'search.log'), `code=${code}\n${stderr || ''}`);
         } catch (e) { /* ignore */ }
-        if (code !== 0) {
+        if (code !== 0 || !summary) {
           resolve({ success: false, error: stderr || 'Search failed' });
           return;
         }
-        try {
-          const parsed = JSON.parse((stdout || '{}').trim());
-          const results = parsed.results || [];
-          console.log('[Arka] search-files parsed', { count: results.length });
-          resolve({ success: true, results });
-        } catch (e) {
-          resolve({ success: false, error: 'Search JSON parse failed' });
-        }
+        console.log('[Arka] search-files done', { count: results.length, source: summary.source, more: summary.more });
+        resolve({ success: true, results, source: summary.source, more: !!summary.more, offset: skip });
       });
     });
   } catch (e) {
@@ -298,6 +323,24 @@ function getWipeScriptPath() {
   return path.join(process.resourcesPath, 'wipe_utils.py');
 }
 
+function getScanEngineScriptPath() {
+  const isDev = !app.isPackaged;
+  if (isDev) {
+    // Scans through the persistent index that scan_search.py answers from
+    return path.join(__dirname, '..', 'scan_engine.py');
+  }
+  return path.join(process.resourcesPath, 'scan_engine.py');
+}
+
+function getSearchScriptPath() {
+  const isDev = !app.isPackaged;
+  if (isDev) {
+    // Answers from the scan index, walking the drive only when it has none
+    return path.join(__dirname, '..', 'scan_search.py');
+  }
+  return path.join(process.resourcesPath, 'scan_search.py');
+}
+
 function getReportScriptPath() {
   const isDev = !app.isPackaged;
   if (isDev) {
@@ -335,7 +378,7 @@ function runPython(pythonExe, args, options = {}) {
 // Helper to spawn the Python scanner with args and stream progress
 function runScanner(pythonArgs = []) {
   return new Promise((resolve, reject) => {
-    const pythonPath = getPythonScriptPath();
+    const pythonPath = getScanEngineScriptPath();
     const workingDir = getWorkingDirectory();
 
     // Delete old JSON file to prevent stale data
@@ -428,7 +471,7 @@ function runScanner(pythonArgs = []) {
 // IPC handlers for drive scanning
 ipcMain.handle('scan-drives', async () => {
   // Backward-compatible: full system scan (all drives)
-  return runScanner([]);
+  return runScanner(['--all-drives']);
 });
 
 ipcMain.handle('list-drives', async () => {
@@ -513,7 +556,8 @@ ipcMain.handle('generate-Arka-report', async (_evt, { filePath, data }) => {
 
     const pythonExe = getPythonExecutablePath();
 
-    const args = [scriptPath, '--output', String(filePath)];
+    // --cache: repeated clicks on an unchanged scan reuse the previously rendered PDF
+    const args = [scriptPath, '--output', String(filePath), '--cache'];
     const coverCandidate = path.join(path.dirname(scriptPath), 'bg.png');
     if (fs.existsSync(coverCandidate)) {
       args.push('--cover', coverCandidate);
@@ -566,7 +610,11 @@ ipcMain.handle('generate-Arka-report', async (_evt, { filePath, data }) => {
     if (!result.ok) {
       return { success: false, error: result.stderr || `Report generation failed (${result.code})` };
     }
-    return { success: true, stdout: result.stdout };
+    // SHA-256 of the PDF, hashed by the generator as it was written, and its sidecar manifest
+    const sha256 = (result.stdout.match(/^SHA-256: ([0-9a-f]{64})\s*$/m) || [])[1] || null;
+    const manifestMatch = result.stdout.match(/^Manifest: (.+?)\s*$/m);
+    const manifest = manifestMatch ? path.resolve(workingDir, manifestMatch[1]) : null;
+    return { success: true, stdout: result.stdout, sha256, manifest };
   } catch (e) {
     return { success: false, error: e.message };
   }
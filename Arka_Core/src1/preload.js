@@ -20,7 +20,7 @@ contextBridge.exposeInMainWorld('electronAPI', {
   deleteFiles: (paths) => ipcRenderer.invoke('delete-files', paths),
   wipeDrive: (args) => ipcRenderer.invoke('wipe-drive', args),
   wipeFile: (payload) => ipcRenderer.invoke('wipe-file', payload),
-  searchFiles: (root, query) => ipcRenderer.invoke('search-files', { root, query }),
+  searchFiles: (root, query, options = {}) => ipcRenderer.invoke('search-files', { root, query, ...options }),
   locateFile: (filePath) => ipcRenderer.invoke('locate-file', filePath),
   generateArkaReport: (filePath, data) => ipcRenderer.invoke('generate-Arka-report', { filePath, data }),
   getDriveInfo: (driveId) => ipcRenderer.invoke('get-drive-info', driveId),
@@ -32,6 +32,11 @@ contextBridge.exposeInMainWorld('electronAPI', {
     ipcRenderer.on('scan-progress', listener);
     return () => ipcRenderer.removeListener('scan-progress', listener);
   },
+  onSearchResults: (callback) => {
+    const listener = (_event, payload) => callback(payload);
+    ipcRenderer.on('search-results', listener);
+    return () => ipcRenderer.removeListener('search-results', listener);
+  },
   onWipeProgress: (callback) => {
     const listener = (_event, payload) => callback(payload);
     ipcRenderer.on('wipe-progress', listener);
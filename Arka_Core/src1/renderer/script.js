@@ -849,7 +849,8 @@ function createDriveCard(drive) {
             <div class="search-container">
                 <input type="text" 
                        class="search-input" 
-                       placeholder="Search files and directories..." 
+                       placeholder="Search files and directories... (e.g. report ext:pdf size>1MB)" 
+                       title="Filters: ext:pdf,docx  size>100MB  modified<2023-01-01  path:Users\\*\\Downloads  type:file|dir  name* (prefix)" 
                        data-drive="${CSS.escape(drive.drive || '')}">
                 <button type="button" 
                         class="search-btn" 
@@ -1649,6 +1650,58 @@ async function executeWipe(driveId, level) {
 }
 
 // Search functionality (backend-powered)
+const SEARCH_PAGE_SIZE = 200; // results shown per search
+
+// One search hit in the results list
+function renderSearchItem(item) {
+    return `
+        <div class="search-file-item">
+            <div class="search-file-header">
+                <div class="search-file-info">
+                    <div class="search-file-name">
+                        <i data-lucide="${getFileIcon(item.name?.split('.').pop())}" class="search-file-icon"></i>
+                        <span class="search-file-title">${item.name || 'Unknown File'}</span>
+                        <span class="search-file-ext">${(item.name?.split('.').pop() || '').toUpperCase() || 'FILE'}</span>
+                    </div>
+                    <div class="search-file-path">
+                        <i data-lucide="folder" class="search-path-icon"></i>
+                        <span class="search-path-text">${item.readable_path || item.path || ''}</span>
+                    </div>
+                </div>
+                <div class="search-file-size">
+                    ${formatBytes(item.size || 0)}
+                </div>
+            </div>
+            
+            ${renderPhysicalLocation(item.physical_location) ? `
+                <div class="search-physical-location">
+                    ${renderPhysicalLocation(item.physical_location)}
+                </div>
+            ` : ''}
+            
+            <div class="search-file-actions">
+                ${item.is_dir ? `
+                    <div class="search-directory-badge">
+                        <i data-lucide="folder" class="directory-icon"></i>
+                        <span>Directory</span>
+                    </div>
+                ` : `
+                    <button class="search-preview-btn" data-path="${item.path}" data-name="${item.name}" title="Preview File">
+                        <i data-lucide="eye" class="preview-icon"></i>
+                        <span>Preview</span>
+                    </button>
+                    <label class="search-select-label" title="Select File">
+                        <input type="checkbox" class="file-select" data-path="${item.path}">
+                        <i data-lucide="plus" class="select-icon unselected-icon"></i>
+                        <i data-lucide="check" class="select-icon selected-icon" style="display: none;"></i>
+                        <span class="select-text">Select</span>
+                    </label>
+                `}
+            </div>
+        </div>
+    `;
+}
+
 async function performSearch(driveId) {
     // Resolve elements
     let searchInput = document.querySelector(`.search-input[data-drive="${driveId}"]`) ||
@@ -1683,12 +1736,38 @@ async function performSearch(driveId) {
         if (!root.endsWith('\\')) root += '\\';
         console.debug('[Arka] Searching', { driveId, normalizedRoot: root, query });
 
-        const res = await window.electronAPI.searchFiles(root, query);
+        // Show matches as the backend finds them; the final result replaces them
+        let streamed = 0;
+        const unsubscribe = window.electronAPI.onSearchResults?.((payload) => {
+            if (!payload || payload.root !== root || payload.query !== query) return;
+            if (searchInput.value.trim() !== query) return;
+            if (streamed === 0) {
+                searchResults.innerHTML = `
+                    <div class="search-results-header">
+                        <i data-lucide="search" class="search-header-icon"></i>
+                        <span class="search-results-count">Searching...</span>
+                    </div>
+                    <div class="search-file-list"></div>
+                `;
+            }
+            const list = searchResults.querySelector('.search-file-list');
+            const count = searchResults.querySelector('.search-results-count');
+            if (!list) return;
+            list.insertAdjacentHTML('beforeend', (payload.results || []).map(renderSearchItem).join(''));
+            streamed += (payload.results || []).length;
+            if (count) count.textContent = `Found ${streamed} item(s) so far...`;
+        });
+        let res;
+        try {
+            res = await window.electronAPI.searchFiles(root, query, { limit: SEARCH_PAGE_SIZE });
+        } finally {
+            if (unsubscribe) unsubscribe();
+        }
         if (!res || !res.success) {
             searchResults.innerHTML = `<div style="padding:10px;color:#ff8a8a;">${res?.error || 'Search failed'}</div>`;
             return;
         }
-        const rows = (res.results || []).slice(0, 200);
+        const rows = res.results || [];
         if (rows.length === 0) {
             searchResults.innerHTML = `<div style="padding:10px;opacity:0.7;">No files found matching "${query}"</div>`;
             return;
@@ -1696,55 +1775,10 @@ async function performSearch(driveId) {
         searchResults.innerHTML = `
             <div class="search-results-header">
                 <i data-lucide="search" class="search-header-icon"></i>
-                <span class="search-results-count">Found ${rows.length} item(s)</span>
+                <span class="search-results-count">${res.more ? `Showing the first ${rows.length} items` : `Found ${rows.length} item(s)`}</span>
             </div>
             <div class="search-file-list">
-                ${rows.map(item => `
-                    <div class="search-file-item">
-                        <div class="search-file-header">
-                            <div class="search-file-info">
-                                <div class="search-file-name">
-                                    <i data-lucide="${getFileIcon(item.name?.split('.').pop())}" class="search-file-icon"></i>
-                                    <span class="search-file-title">${item.name || 'Unknown File'}</span>
-                                    <span class="search-file-ext">${(item.name?.split('.').pop() || '').toUpperCase() || 'FILE'}</span>
-                                </div>
-                                <div class="search-file-path">
-                                    <i data-lucide="folder" class="search-path-icon"></i>
-                                    <span class="search-path-text">${item.readable_path || item.path || ''}</span>
-                                </div>
-                            </div>
-                            <div class="search-file-size">
-                                ${formatBytes(item.size || 0)}
-                            </div>
-                        </div>
-                        
-                        ${renderPhysicalLocation(item.physical_location) ? `
-                            <div class="search-physical-location">
-                                ${renderPhysicalLocation(item.physical_location)}
-                            </div>
-                        ` : ''}
-                        
-                        <div class="search-file-actions">
-                            ${item.is_dir ? `
-                                <div class="search-directory-badge">
-                                    <i data-lucide="folder" class="directory-icon"></i>
-                                    <span>Directory</span>
-                                </div>
-                            ` : `
-                                <button class="search-preview-btn" data-path="${item.path}" data-name="${item.name}" title="Preview File">
-                                    <i data-lucide="eye" class="preview-icon"></i>
-                                    <span>Preview</span>
-                                </button>
-                                <label class="search-select-label" title="Select File">
-                                    <input type="checkbox" class="file-select" data-path="${item.path}">
-                                    <i data-lucide="plus" class="select-icon unselected-icon"></i>
-                                    <i data-lucide="check" class="select-icon selected-icon" style="display: none;"></i>
-                                    <span class="select-text">Select</span>
-                                </label>
-                            `}
-                        </div>
-                    </div>
-                `).join('')}
+                ${rows.map(renderSearchItem).join('')}
             </div>
         `;
     } catch (e) {
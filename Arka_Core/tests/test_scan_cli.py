@@ -0,0 +1,78 @@
+"""Scan a folder with scan_engine.py, then search it with scan_search.py, as main.js does"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCAN_ENGINE = os.path.join(HERE, '..', 'scan_engine.py')
+SCAN_SEARCH = os.path.join(HERE, '..', 'scan_search.py')
+
+
+def run(script, *args, cwd):
+    return subprocess.run([sys.executable, script, *args], cwd=cwd, capture_output=True, text=True, check=True)
+
+
+class ScanThenSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, 'drive')
+        self.index_dir = os.path.join(self.tmp.name, 'index')
+        os.makedirs(os.path.join(self.root, 'Reports', 'old'))
+        for name, data in (('Reports/q1_report.pdf', b'x' * 10), ('Reports/old/report_2019.txt', b'y'),
+                           ('notes.txt', b'z')):
+            with open(os.path.join(self.root, name), 'wb') as f:
+                f.write(data)
+
+    def search(self, query, *args):
+        out = run(SCAN_SEARCH, '--search', self.root, query, '--index-dir', self.index_dir, '--jsonl', *args,
+                  cwd=self.tmp.name).stdout
+        *results, summary = [json.loads(line) for line in out.splitlines()]
+        return results, summary
+
+    def test_search_answers_from_the_index_the_scan_built(self):
+        run(SCAN_ENGINE, '--scan', self.root, '--index-dir', self.index_dir, '--output', 'drive_info.json',
+            cwd=self.tmp.name)
+        with open(os.path.join(self.tmp.name, 'drive_info.json'), encoding='utf-8') as f:
+            info = json.load(f)
+        drive = info['drives'][0]
+        self.assertEqual(drive['file_analysis']['total_files'], 3)
+        # The renderer and the report read these; they are filled in even when detection fails
+        for key in ('model', 'filesystem', 'media_type'):
+            self.assertIn(key, drive)
+        self.assertTrue(drive['filesystem'])
+
+        results, summary = self.search('report')
+        self.assertEqual(summary['source'], 'index')
+        self.assertEqual(summary['count'], 3)
+        self.assertEqual(sorted(r['name'] for r in results), ['Reports', 'q1_report.pdf', 'report_2019.txt'])
+
+        results, summary = self.search('report ext:pdf')
+        self.assertEqual([(r['name'], r['size']) for r in results], [('q1_report.pdf', 10)])
+
+    def test_index_ignores_case_as_the_walk_does(self):
+        with open(os.path.join(self.root, 'ÄRGER.txt'), 'wb'):
+            pass
+        walked, summary = self.search('ärger')
+        self.assertEqual(summary['source'], 'walk')
+        run(SCAN_ENGINE, '--scan', self.root, '--index-dir', self.index_dir, '--output', 'drive_info.json',
+            cwd=self.tmp.name)
+        indexed, summary = self.search('ärger')
+        self.assertEqual(summary['source'], 'index')
+        self.assertEqual([r['name'] for r in indexed], ['ÄRGER.txt'])
+        self.assertEqual(indexed, walked)
+
+    def test_search_walks_a_folder_that_was_not_scanned(self):
+        results, summary = self.search('report type:file')
+        self.assertEqual(summary['source'], 'walk')
+        self.assertEqual(sorted(r['path'] for r in results),
+                         [os.path.join(self.root, 'Reports', 'old', 'report_2019.txt'),
+                          os.path.join(self.root, 'Reports', 'q1_report.pdf')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Incremental rescans of the scan index against a fresh walk"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scan_engine import scan_tree  # noqa: E402
+from scan_index import ScanIndex  # noqa: E402
+
+HOUR = 3600
+
+
+class RescanTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, 'drive')
+        for folder in ('docs/old', 'media', 'keys'):
+            os.makedirs(os.path.join(self.root, folder))
+        self.write('docs/report.pdf', 100)
+        self.write('docs/old/notes.txt', 10)
+        self.write('media/song.mp3', 5000)
+        self.write('keys/passwords.txt', 1)
+        self.age()
+        self.index = ScanIndex(self.root, os.path.join(self.tmp.name, 'index.sqlite'))
+        self.addCleanup(self.index.close)
+
+    def write(self, name, size):
+        with open(os.path.join(self.root, name), 'wb') as f:
+            f.write(b'x' * size)
+
+    def age(self):
+        """Date every folder an hour back, so that a rescan trusts their mtimes"""
+        past = time.time() - HOUR
+        for folder, _, _ in os.walk(self.root):
+            os.utime(folder, (past, past))
+
+    def assertMatchesWalk(self):
+        self.assertEqual(self.index.file_analysis(), scan_tree(self.root, threads=2).to_dict())
+
+    def test_first_scan_lists_everything(self):
+        self.assertFalse(self.index.has_scan())
+        stats = self.index.rescan(threads=2)
+        self.assertTrue(self.index.has_scan())
+        self.assertEqual(stats.listed, 5)
+        self.assertMatchesWalk()
+
+    def test_unchanged_tree_lists_nothing(self):
+        self.index.rescan(threads=2)
+        stats = self.index.rescan(threads=2)
+        self.assertEqual((stats.checked, stats.listed, stats.removed), (5, 0, 0))
+        self.assertMatchesWalk()
+
+    def test_only_changed_folders_are_listed_again(self):
+        self.index.rescan(threads=2)
+        self.write('docs/old/draft.docx', 20)
+        os.remove(os.path.join(self.root, 'media', 'song.mp3'))
+        shutil.rmtree(os.path.join(self.root, 'keys'))
+        stats = self.index.rescan(threads=2)
+        # docs/old gained a file, media lost one, the root lost keys
+        self.assertEqual(stats.listed, 3)
+        self.assertEqual(stats.removed, 1)
+        self.assertMatchesWalk()
+        self.assertEqual(self.index.file_analysis()['sensitive_files'], [])
+
+    def test_full_rescan_lists_everything_again(self):
+        self.index.rescan(threads=2)
+        stats = self.index.rescan(threads=2, full=True)
+        self.assertEqual(stats.listed, 5)
+        self.assertMatchesWalk()
+
+
+if __name__ == '__main__':
+    unittest.main()
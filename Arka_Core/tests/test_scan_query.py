@@ -0,0 +1,108 @@
+"""Compilation and matching of search box queries (scan_query)"""
+
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scan_query import PathPattern, QueryError, compile_query  # noqa: E402
+
+KB = 1024
+SEP = os.sep
+
+
+def ns(text):
+    return int(datetime.fromisoformat(text).timestamp() * 1e9)
+
+
+def matches_file(query, path, size=0, mtime=0):
+    return compile_query(query).file_predicate()(os.path.basename(path).lower(), path, size, mtime)
+
+
+class CompileTest(unittest.TestCase):
+    def test_terms(self):
+        q = compile_query('Report* "tax 2023" ext:.PDF,*.docx size>1.5KB size:<=2mb type:file')
+        self.assertEqual(q.names, [('report', True), ('tax 2023', False)])
+        self.assertEqual(q.exts, ('pdf', 'docx'))
+        self.assertEqual(q.sizes, [('>', 1536), ('<=', 2 << 20)])
+        self.assertEqual(q.kind, 'file')
+        self.assertFalse(q.match_dirs)
+
+    def test_a_day_is_its_whole_local_day(self):
+        start, end = ns('2023-01-01'), ns('2023-01-02')
+        self.assertEqual(compile_query('modified=2023-01-01').mtimes, [('>=', start), ('<', end)])
+        self.assertEqual(compile_query('modified<=2023-01-01').mtimes, [('<', end)])
+        self.assertEqual(compile_query('modified>2023-01-01').mtimes, [('>=', end)])
+
+    def test_unknown_keys_are_name_text(self):
+        self.assertEqual(compile_query('foo:bar').names, [('foo:bar', False)])
+        self.assertEqual(compile_query('ext>pdf').names, [('ext>pdf', False)])
+
+    def test_empty(self):
+        for text in ('', '   ', None, '""'):
+            self.assertTrue(compile_query(text).is_empty(), repr(text))
+        self.assertFalse(compile_query('type:dir').is_empty())
+
+    def test_malformed(self):
+        for text in ('ext:', 'ext:,', 'size>lots', 'size:', 'modified<yesterday', 'type:link', 'path:/'):
+            with self.assertRaises(QueryError, msg=text):
+                compile_query(text)
+
+
+class MatchTest(unittest.TestCase):
+    def test_name_and_extension_ignore_case(self):
+        self.assertTrue(matches_file('report ext:pdf', 'Q1_REPORT.PDF'))
+        self.assertTrue(matches_file('ärger', 'ÄRGER.txt'))
+        self.assertFalse(matches_file('report ext:pdf', 'report.pdf.txt'))
+        self.assertTrue(matches_file('rep*', 'Report.txt'))
+        self.assertFalse(matches_file('rep*', 'my_report.txt'))
+
+    def test_every_term_must_hold(self):
+        self.assertTrue(matches_file('tax 2023', 'tax_2023.xls'))
+        self.assertFalse(matches_file('tax 2024', 'tax_2023.xls'))
+        self.assertFalse(matches_file('"tax 2023"', 'tax_2023.xls'))
+
+    def test_size_and_date(self):
+        self.assertTrue(matches_file('size>1KB', 'a', size=KB + 1))
+        self.assertFalse(matches_file('size>1KB', 'a', size=KB))
+        day = ns('2023-06-15T12:00:00')
+        self.assertTrue(matches_file('modified=2023-06-15', 'a', mtime=day))
+        self.assertFalse(matches_file('modified=2023-06-16', 'a', mtime=day))
+        self.assertTrue(matches_file('modified<2023-06-16', 'a', mtime=day))
+
+    def test_folders_only_match_folder_terms(self):
+        self.assertIsNone(compile_query('ext:pdf').dir_predicate())
+        self.assertIsNone(compile_query('size>1MB').dir_predicate())
+        self.assertIsNone(compile_query('type:file').dir_predicate())
+        self.assertTrue(compile_query('type:folder docs').dir_predicate()('docs', SEP + 'docs', 0, 0))
+
+
+class PathPatternTest(unittest.TestCase):
+    def test_unanchored_matches_whole_folders_anywhere(self):
+        p = PathPattern('Users\\*\\Downloads')
+        self.assertTrue(p.matches('C:\\Users\\bob\\Downloads\\a.pdf'))
+        self.assertTrue(p.matches('/home/x/users/bob/downloads'))
+        self.assertFalse(p.matches('C:\\Users\\bob\\MyDownloads\\a.pdf'))
+        self.assertTrue(p.can_descend('D:\\anything'))
+        self.assertIsNone(p.literal_directory())
+
+    def test_anchored_prunes_folders_that_cannot_match(self):
+        p = PathPattern('/usr/*/doc')
+        self.assertTrue(p.matches('/usr/share/doc/x'))
+        self.assertFalse(p.matches('/opt/usr/share/doc'))
+        self.assertTrue(p.can_descend('/usr'))
+        self.assertTrue(p.can_descend('/usr/local/doc/deeper'))
+        self.assertFalse(p.can_descend('/opt'))
+        self.assertEqual(p.literal_directory(), SEP + 'usr')
+
+    def test_drive_anchor(self):
+        p = PathPattern('C:\\Users\\bob\\*.pdf')
+        self.assertEqual(p.literal_directory(), 'C:' + SEP + 'Users' + SEP + 'bob')
+        self.assertFalse(p.can_descend('D:\\Users'))
+        self.assertEqual(p.longest_literal(), 'Users')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""scan_search: order and early results of a live walk, and paging through the walk and the index"""
+
+import itertools
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import scan_search  # noqa: E402
+from scan_engine import scan_roots  # noqa: E402
+from scan_query import compile_query  # noqa: E402
+
+FOLDERS = 30
+SUBFOLDERS = 4
+
+
+class LiveMatchesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        for i in range(FOLDERS):
+            for j in range(SUBFOLDERS):
+                folder = os.path.join(self.root, f'd{i:02}', f'e{j}')
+                os.makedirs(folder)
+                for name in (f'match_{i}_{j}.txt', f'other_{i}_{j}.bin'):
+                    with open(os.path.join(folder, name), 'wb') as f:
+                        f.write(b'x')
+        self.folders = 1 + FOLDERS * (1 + SUBFOLDERS)
+
+    def paths(self, query, threads):
+        return [entry['path'] for entry in scan_search.live_matches(self.root, compile_query(query), threads)]
+
+    def test_order_does_not_depend_on_the_thread_count(self):
+        one = self.paths('match', 1)
+        self.assertEqual(len(one), FOLDERS * SUBFOLDERS)
+        for threads in (2, 4, 8):
+            self.assertEqual(self.paths('match', threads), one)
+
+    def test_first_match_comes_before_the_walk_finishes(self):
+        calls = itertools.count()
+        list_directory = scan_search.list_directory
+
+        def counting(path):
+            next(calls)
+            return list_directory(path)
+
+        for threads in (1, 4):
+            calls = itertools.count()
+            with mock.patch.object(scan_search, 'list_directory', counting), \
+                    mock.patch.object(scan_search, 'WALK_AHEAD', 4):
+                matches = scan_search.live_matches(self.root, compile_query('match'), threads)
+                self.assertIsNotNone(next(matches))
+                time.sleep(0.2)  # time enough to list every folder if nothing held the workers back
+                listed = next(calls)
+                matches.close()
+            self.assertLess(listed, self.folders // 2, f"{threads} threads")
+
+    def test_pages_line_up(self):
+        no_index = os.path.join(self.root, 'no-index')  # never created, so every search walks
+        everything = scan_search.search_page(self.root, 'match', no_index, limit=1000, threads=4)[1]
+        pages = []
+        for offset in range(0, len(everything), 25):
+            source, page, more = scan_search.search_page(self.root, 'match', no_index, limit=25, offset=offset,
+                                                         threads=4)
+            self.assertEqual(source, 'walk')
+            self.assertEqual(more, offset + 25 < len(everything))
+            pages.extend(page)
+        self.assertEqual(pages, everything)
+
+    def test_index_pages_line_up(self):
+        index_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(index_dir.cleanup)
+        scan_roots([self.root], threads=4, use_index=True, index_dir=index_dir.name)
+        everything = scan_search.search_page(self.root, 'match', index_dir.name, limit=1000)[1]
+        self.assertEqual(len(everything), FOLDERS * SUBFOLDERS)
+        pages = []
+        for offset in range(0, len(everything), 25):
+            source, page, more = scan_search.search_page(self.root, 'match', index_dir.name, limit=25,
+                                                         offset=offset)
+            self.assertEqual(source, 'index')
+            pages.extend(page)
+        self.assertEqual(pages, everything)
+
+
+if __name__ == '__main__':
+    unittest.main()